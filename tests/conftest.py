@@ -0,0 +1,39 @@
+"""
+测试公共设置
+- tools/ 下的脚本文件名包含连字符，通过 load_tool("http-client") 动态导入
+- 导入任何脚本之前关闭所有落盘缓存 / 录制回放，测试不读写真实工作目录
+- stub_server(server) 在后台线程运行替身服务器，退出时关闭
+"""
+
+import importlib
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+os.environ.update({
+    "HTTP_CACHE": "0",
+    "LLM_CACHE": "0",
+    "HTTP_CASSETTE_MODE": "",
+    "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN") or "test-token",
+})
+
+
+def load_tool(name):
+    return importlib.import_module(name)
+
+
+@contextmanager
+def stub_server(server):
+    """后台运行 HTTP 替身服务器，产出 http://127.0.0.1:PORT"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,77 @@
+"""awesome-openclaw README 快照与跨天资源索引"""
+
+import base64
+
+import pytest
+
+from conftest import load_tool
+
+awesome_index = load_tool("awesome-index")
+
+
+def readme(sha, *links):
+    content = "# Awesome\n\n## Tools\n" + "".join(f"- [{t}]({u}) - desc\n" for t, u in links)
+    return {"sha": sha, "content": base64.b64encode(content.encode()).decode()}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {"snapshot_path": tmp_path / "readme.json", "index_path": tmp_path / "resources.json"}
+
+
+def test_sync_readme_reports_new_resources(paths):
+    awesome_index.sync_readme(readme("a", ("One", "https://github.com/o/one")), **paths)
+    categories, changes, new = awesome_index.sync_readme(
+        readme("b", ("One", "https://github.com/o/one"), ("Two", "https://github.com/o/two")), **paths)
+
+    assert changes["previous_sha"] == "a"
+    assert [r["title"] for r in new] == ["Two"]
+    assert awesome_index.ReadmeSnapshot(paths["snapshot_path"]).sha == "b"
+
+
+def test_sync_readme_keeps_sha_when_index_update_fails(paths, monkeypatch):
+    awesome_index.sync_readme(readme("a", ("One", "https://github.com/o/one")), **paths)
+    updated = readme("b", ("One", "https://github.com/o/one"), ("Two", "https://github.com/o/two"))
+
+    def broken_save(self):
+        raise OSError("disk full")
+    monkeypatch.setattr(awesome_index.ResourceIndex, "save", broken_save)
+    with pytest.raises(OSError):
+        awesome_index.sync_readme(updated, **paths)
+    assert awesome_index.ReadmeSnapshot(paths["snapshot_path"]).sha == "a"
+
+    # 下次运行重新计算同一批增删
+    monkeypatch.undo()
+    _, _, new = awesome_index.sync_readme(updated, **paths)
+    assert [r["title"] for r in new] == ["Two"]
+
+
+def test_sync_readme_without_persist_writes_nothing(paths):
+    awesome_index.sync_readme(readme("a", ("One", "https://github.com/o/one")), **paths, persist=False)
+
+    assert not paths["snapshot_path"].exists()
+    assert not paths["index_path"].exists()
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://www.GitHub.com/Owner/Repo.git/", "https://github.com/owner/repo"),
+    ("https://example.com/a?utm_source=x&utm_medium=y&ref=hn&source=tw#top", "https://example.com/a"),
+    ("https://example.com/a?REF=hn&b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?reference=1&refs=main&sourceId=9",
+     "https://example.com/a?reference=1&refs=main&sourceId=9"),
+])
+def test_normalize_url(url, expected):
+    assert awesome_index.normalize_url(url) == expected
+
+
+def test_same_day_rerun_returns_same_new_resources(paths):
+    awesome_index.sync_readme(readme("a", ("One", "https://github.com/o/one")), **paths)
+    # 基线当天重跑：仍然没有新增
+    assert awesome_index.sync_readme(readme("a", ("One", "https://github.com/o/one")), **paths)[2] == []
+    updated = readme("b", ("One", "https://github.com/o/one"), ("Two", "https://github.com/o/two"))
+    _, _, first = awesome_index.sync_readme(updated, **paths)
+    _, changes, second = awesome_index.sync_readme(updated, **paths)
+
+    assert changes["unchanged"]
+    assert [r["title"] for r in first] == ["Two"]
+    assert second == first
@@ -0,0 +1,92 @@
+"""社区数据源插件：fixture 离线回放、按源超时"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import TOOLS_DIR, load_tool
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "community"
+
+scraper = load_tool("community-scraper")
+awesome_index = load_tool("awesome-index")
+
+
+@pytest.fixture
+def no_persistence(monkeypatch):
+    """fixture 回放不能改写真实的 README 快照 / 资源索引"""
+    def forbidden(self):
+        raise AssertionError(f"{self.path} 不应在 fixture 回放时写入")
+    monkeypatch.setattr(awesome_index.ReadmeSnapshot, "save", forbidden)
+    monkeypatch.setattr(awesome_index.ResourceIndex, "save", forbidden)
+
+
+def test_report_from_fixtures(tmp_path, no_persistence):
+    report = scraper.generate_community_report(FIXTURES, output_dir=tmp_path)
+
+    assert list(report["sources"]) == ["awesome-openclaw", "clawhub", "hacker-news", "lobsters"]
+    assert all(st["status"] == "ok" for st in report["source_status"].values())
+    awesome = report["sources"]["awesome-openclaw"]
+    assert awesome["total_resources"] == 3
+    assert awesome["category_count"] == 2
+    assert report["sources"]["clawhub"]["stars"] == 1520
+    titles = [s["title"] for s in report["sources"]["hacker-news"]["ai_stories"]]
+    assert "OpenClaw 2.0 ships a plugin runtime" in titles
+    assert "Show HN: A faster SQLite backup tool" not in titles
+    lobsters = report["sources"]["lobsters"]["stories"]
+    # 按关键词或标签入选；没有外链的 story 用讨论页链接
+    assert [s["title"] for s in lobsters] == ["Prompt caching strategies for Claude agents", "Notes on vibe coding"]
+    assert lobsters[1]["url"] == "https://lobste.rs/s/def456"
+    assert [i["type"] for i in report["insights"]] == ["ecosystem", "trending"]
+    assert len(list(tmp_path.glob("community-scraper-*.md"))) == 1
+
+
+def test_slow_and_failing_sources_do_not_block_others():
+    hang = threading.Event()
+    clawhub = json.loads((FIXTURES / "clawhub.json").read_text())
+
+    def broken():
+        raise ValueError("bad payload")
+
+    sources = [
+        {"name": "clawhub", "fetch": lambda: clawhub, "parse": scraper.parse_clawhub_skills, "timeout": 5},
+        {"name": "hung", "fetch": hang.wait, "parse": lambda raw: raw, "timeout": 0.2},
+        {"name": "broken", "fetch": broken, "parse": lambda raw: raw, "timeout": 5},
+    ]
+    start = time.monotonic()
+    results, status = scraper.run_sources(sources)
+    hang.set()
+
+    assert time.monotonic() - start < 2
+    assert list(results) == ["clawhub"]
+    assert results["clawhub"]["forks"] == 210
+    assert status["hung"]["status"] == "timeout"
+    assert status["broken"]["status"] == "error"
+
+
+def test_hung_source_does_not_block_exit():
+    """不设置 GITHUB_TOKEN 也能导入；卡住的数据源超时后进程能立即退出"""
+    code = (
+        "import importlib, threading, sys\n"
+        f"sys.path.insert(0, {str(TOOLS_DIR)!r})\n"
+        "scraper = importlib.import_module('community-scraper')\n"
+        "source = {'name': 'hung', 'fetch': threading.Event().wait, 'parse': lambda raw: raw, 'timeout': 0.2}\n"
+        "print(scraper.run_sources([source])[1]['hung']['status'])\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "GITHUB_TOKEN"}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=10)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("timeout")
+
+
+def test_network_mode_requires_token(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper, "GITHUB_TOKEN", None)
+    with pytest.raises(EnvironmentError):
+        scraper.generate_community_report(output_dir=tmp_path)
@@ -0,0 +1,89 @@
+"""跨天近似去重：标记规则、数字保护、当天重跑、过期清理"""
+
+import pytest
+
+from conftest import load_tool
+
+fingerprint = load_tool("content-fingerprint")
+
+DAY1, DAY2 = "2026-10-01", "2026-10-02"
+BODY = ("The new plugin runtime isolates each skill in its own process, adds a capability "
+        "manifest, and streams tool output back to the agent loop without buffering.")
+
+
+def item(title, source="Hacker News", **fields):
+    return {"source": source, "title": title, **fields}
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = fingerprint.FingerprintIndex(tmp_path / "fp.json")
+    idx.record(idx.classify([item("OpenClaw 2.0 ships a plugin runtime", body=BODY, comments=40),
+                             item("Release v1.2.0", source="GitHub Release", body=BODY)], DAY1), DAY1)
+    return idx
+
+
+def status(index, entry, today=DAY2):
+    return index.classify([entry], today)[0].get("status")
+
+
+def test_normalize():
+    assert fingerprint.normalize("ＯｐｅｎＣｌａｗ：v2.0!!") == "openclaw v2 0"
+    assert fingerprint.normalize("插件运行时") == "插 件 运 行 时"
+
+
+def test_exact_and_reworded_titles_repeat(index):
+    assert status(index, item("OpenClaw 2.0 ships a plugin runtime", body=BODY, comments=45)) == "repeat"
+    assert status(index, item("OpenClaw 2.0 ships a new plugin runtime!", body=BODY, comments=40)) == "repeat"
+
+
+def test_unrelated_title_or_other_source_is_new(index):
+    assert status(index, item("SQLite adds a faster backup API", body=BODY)) == "new"
+    assert status(index, item("OpenClaw 2.0 ships a plugin runtime", source="Lobsters", body=BODY)) == "new"
+
+
+def test_numbers_must_match(index):
+    assert status(index, item("Release v1.3.0", source="GitHub Release", body=BODY)) == "new"
+    assert status(index, item("Release v1.2.0", source="GitHub Release", body=BODY)) == "repeat"
+
+
+def test_body_change_or_comment_growth_is_updated(index):
+    rewritten = "Maintainers reverted the runtime after a security report; a CVE is pending review."
+    assert status(index, item("OpenClaw 2.0 ships a plugin runtime", body=rewritten, comments=40)) == "updated"
+    assert status(index, item("OpenClaw 2.0 ships a plugin runtime", body=BODY, comments=80)) == "updated"
+    # 增长比例够但绝对数量太少，不算
+    assert status(index, item("OpenClaw 2.0 ships a plugin runtime", body=BODY, comments=49)) == "repeat"
+
+
+def test_body_appearing_later_is_updated(tmp_path):
+    idx = fingerprint.FingerprintIndex(tmp_path / "fp.json")
+    idx.record(idx.classify([item("Bare title only")], DAY1), DAY1)
+
+    assert status(idx, item("Bare title only", body=BODY)) == "updated"
+
+
+def test_untitled_items_are_not_labeled(index):
+    labeled = index.classify([{"source": "GitHub Stats", "stars": 10}], DAY2)
+    assert "status" not in labeled[0]
+
+
+def test_same_day_rerun_keeps_first_label(index):
+    changed = item("OpenClaw 2.0 ships a plugin runtime", body="totally different body text here", comments=40)
+    assert status(index, changed, today=DAY1) == "new"
+
+
+def test_persistence_and_prune(tmp_path, index):
+    reloaded = fingerprint.FingerprintIndex(tmp_path / "fp.json")
+    assert set(reloaded.entries) == set(index.entries)
+    assert status(reloaded, item("OpenClaw 2.0 ships a new plugin runtime!", body=BODY, comments=40)) == "repeat"
+
+    reloaded.touch([item("Release v1.2.0", source="GitHub Release")], "2026-10-20")
+    assert reloaded.prune("2026-11-05") == 1
+    assert [e["title"] for e in reloaded.entries.values()] == ["Release v1.2.0"]
+    # 清理后分桶重建，近似匹配仍然可用
+    assert reloaded.match("GitHub Release", "release v1 2 0", fingerprint.fingerprint(item("Release v1.2.0"))[1])
+
+
+def test_format_counts():
+    labeled = [{"status": "new"}, {"status": "repeat"}, {"status": "repeat"}, {}]
+    assert fingerprint.format_counts(labeled) == "🔁 跨天去重：新增 1 条，更新 0 条，重复 2 条"
@@ -0,0 +1,52 @@
+"""GraphQL 批量采集：对本地替身服务器运行 collect_repos / fetch_all_graphql"""
+
+import pytest
+
+from conftest import load_tool, stub_server
+
+github_graphql = load_tool("github-graphql")
+
+
+@pytest.fixture
+def graphql_stub(monkeypatch):
+    with stub_server(github_graphql.make_stub_server()) as base:
+        monkeypatch.setattr(github_graphql, "GRAPHQL_URL", f"{base}/graphql")
+        yield base
+
+
+def test_collect_repos_batches_all_repos(graphql_stub):
+    repos = {f"r{i}": f"owner/repo{i}" for i in range(5)}
+    collected, rate_limit = github_graphql.collect_repos(repos, batch_size=2)
+
+    assert set(collected) == set(repos)
+    assert rate_limit["remaining"] == 4999
+    repo = collected["r3"]
+    assert repo["name"] == "owner/repo3"
+    assert [r["tag"] for r in repo["releases"]] == ["v1.2.0", "v1.1.0", "v1.0.0"]
+    assert [t["number"] for t in repo["trending_topics"]] == [1, 2, 3]
+    assert repo["stars"]["open_issues"] >= 0
+    assert repo["releases"][0]["categories"]
+
+
+def test_collect_repos_skips_missing_repo(graphql_stub, capsys):
+    collected, _ = github_graphql.collect_repos({"ok": "owner/good", "gone": "owner/missing-repo"})
+
+    assert set(collected) == {"ok"}
+    assert "Could not resolve" in capsys.readouterr().out
+
+
+def test_fetch_all_graphql_falls_back_per_repo(graphql_stub, monkeypatch):
+    monitor = load_tool("github-monitor")
+    monkeypatch.setattr(monitor, "REPOS", {"main": "owner/good", "gone": "owner/missing-repo"})
+    plan = {"main": {"releases": None, "stars": None}, "gone": {"releases": None, "stars": None}}
+
+    results = monitor.fetch_all_graphql(plan)
+
+    assert results["main"]["releases"]
+    assert results["main"]["stars"]["stars"] > 0
+    assert results["gone"] == {"releases": None, "stars": None, "discussions": None}
+
+    # 失败仓库的列表字段在报告中为 []，下游可以直接迭代
+    report = monitor.build_repo_report("gone", results["gone"])
+    assert report["releases"] == [] and report["discussions"] == []
+    assert report["stars"] is None
@@ -0,0 +1,48 @@
+"""增量同步：分页中断时游标不能前移"""
+
+import pytest
+
+from conftest import load_tool
+
+history = load_tool("github-history")
+
+
+def release(release_id):
+    return {"id": release_id, "tag_name": f"v{release_id}", "name": f"v{release_id}",
+            "published_at": "2026-10-01T00:00:00Z", "body": "", "html_url": ""}
+
+
+def paginator(pages, fail_after=None):
+    """按倒序产出 release，读完 fail_after 条后抛出异常（模拟第 2 页请求失败）"""
+    def paginate(endpoint, params=None, limit=None, stop=None):
+        for i, item in enumerate(pages):
+            if fail_after is not None and i == fail_after:
+                raise RuntimeError("HTTP 502")
+            if stop and stop(item):
+                return
+            yield item
+    return paginate
+
+
+def test_sync_releases_advances_cursor_after_full_scan(tmp_path):
+    changed, store = history.sync_releases("owner/repo", paginator([release(3), release(2)]), tmp_path)
+
+    assert changed == 2
+    assert store.cursor == 3
+
+
+def test_sync_releases_keeps_cursor_on_partial_scan(tmp_path):
+    history.sync_releases("owner/repo", paginator([release(10)]), tmp_path)
+    pages = [release(13), release(12), release(11), release(10)]
+
+    with pytest.raises(RuntimeError):
+        history.sync_releases("owner/repo", paginator(pages, fail_after=1), tmp_path)
+    store = history.HistoryStore("owner/repo", "releases", tmp_path)
+    assert store.cursor == 10
+    assert "13" in store.items
+
+    # 下次完整扫描补上中断时漏掉的 11 / 12
+    changed, store = history.sync_releases("owner/repo", paginator(pages), tmp_path)
+    assert changed == 2
+    assert store.cursor == 13
+    assert {"10", "11", "12", "13"} <= set(store.items)
@@ -0,0 +1,37 @@
+"""HN item 抓取：易变字段刷新不能被共享响应缓存挡住"""
+
+from conftest import load_tool
+
+hn = load_tool("hn-fetcher")
+response_cache = load_tool("response-cache")
+
+
+def test_item_requests_bypass_response_cache(monkeypatch):
+    calls = []
+
+    def fake_get_json(url, use_cache=True, **kwargs):
+        calls.append((url, use_cache))
+        return {"id": int(url.rsplit("/", 1)[1].split(".")[0]), "score": 10}
+    monkeypatch.setattr(hn.http_client, "get_json", fake_get_json)
+
+    items, stats = hn.fetch_items([1, 2, 3])
+
+    assert [item["id"] for item in items] == [1, 2, 3]
+    assert stats["fetched"] == 3
+    assert {use_cache for _, use_cache in calls} == {False}
+
+
+def test_item_endpoint_not_in_response_cache_policy(tmp_path):
+    cache = response_cache.ResponseCache(tmp_path / "cache.db")
+
+    assert cache.ttl_for(f"{hn.HN_API}/item/123.json") == 0
+    assert cache.ttl_for(f"{hn.HN_API}/topstories.json") > 0
+
+
+def test_front_page_items_refresh_after_ttl(tmp_path):
+    cache = hn.ItemCache(tmp_path / "items.json")
+    cache.put({"id": 1, "title": "t", "score": 5, "descendants": 1}, now=1000)
+
+    assert not cache.needs_fetch(1, rank=0, now=1000 + hn.VOLATILE_TTL)
+    assert cache.needs_fetch(1, rank=0, now=1001 + hn.VOLATILE_TTL)
+    assert not cache.needs_fetch(1, rank=hn.FRONT_PAGE_SIZE, now=1001 + hn.VOLATILE_TTL)
@@ -0,0 +1,57 @@
+"""cassette run：每次运行使用隔离的临时工作目录"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+from conftest import load_tool
+
+cassette = load_tool("http-cassette")
+
+CHILD = """
+import json, os, pathlib, sys
+workspace = pathlib.Path(os.environ["OPENCLAW_WORKSPACE"])
+state = workspace / "cache" / "state.json"
+before = sorted(str(p.relative_to(workspace)) for p in workspace.rglob("*") if p.is_file())
+state.parent.mkdir(parents=True, exist_ok=True)
+state.write_text("written")
+with open(sys.argv[1], "a") as f:
+    f.write(json.dumps({"workspace": str(workspace), "before": before,
+                        "mode": os.environ["HTTP_CASSETTE_MODE"],
+                        "etag_dir": os.environ.get("GITHUB_ETAG_CACHE_DIR")}) + "\\n")
+"""
+
+
+def run(tmp_path, mode, **kwargs):
+    out = tmp_path / f"{mode}.jsonl"
+    timings = cassette.run_command([sys.executable, "-c", CHILD, str(out)], mode,
+                                   tmp_path / "c.json", **kwargs)
+    return timings, [json.loads(line) for line in out.read_text().splitlines()]
+
+
+def test_each_run_starts_from_the_same_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_ETAG_CACHE_DIR", str(tmp_path / "real-etag"))
+    seed = tmp_path / "seed"
+    (seed / "history").mkdir(parents=True)
+    (seed / "history" / "cursor.json").write_text("{}")
+
+    timings, record = run(tmp_path, "record", seed=seed)
+    _, replay = run(tmp_path, "replay", seed=seed, repeat=2)
+
+    assert len(timings) == 1
+    runs = record + replay
+    assert [r["mode"] for r in runs] == ["record", "replay", "replay"]
+    assert all(r["before"] == ["history/cursor.json"] for r in runs)
+    assert all(r["etag_dir"] is None for r in runs)
+    assert len({r["workspace"] for r in runs}) == 3
+    assert not (seed / "cache").exists()
+    assert not (tmp_path / "real-etag").exists()
+
+
+def test_keep_workspace(tmp_path):
+    _, runs = run(tmp_path, "replay", keep=True)
+
+    workspace = Path(runs[0]["workspace"])
+    assert (workspace / "cache" / "state.json").read_text() == "written"
+    shutil.rmtree(workspace)
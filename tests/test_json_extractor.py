@@ -0,0 +1,122 @@
+"""LLM 输出的容错 JSON 提取：定位、修复、截断、抢救、schema 校验"""
+
+import pytest
+
+from conftest import load_tool
+
+extractor = load_tool("json-extractor")
+
+SCHEMA = {
+    "action_items?": [{"title": str, "priority": str, "expected_days?": int}],
+    "notes?": [str],
+}
+
+
+def kinds(report):
+    return [r["kind"] for r in report]
+
+
+def test_prose_around_fenced_block():
+    content = '好的，分析如下：\n```json\n{"notes": ["a"]}\n```\n以上。'
+    data, report = extractor.extract(content, SCHEMA)
+
+    assert data == {"notes": ["a"]}
+    assert report == []
+
+
+def test_longest_of_several_blocks():
+    content = '```json\n{"notes": []}\n```\n修正版：\n```json\n{"notes": ["a", "b"]}\n```'
+    data, report = extractor.extract(content)
+
+    assert data == {"notes": ["a", "b"]}
+    assert kinds(report) == ["repair"]
+
+
+def test_bare_json_without_fence():
+    data, _ = extractor.extract('结果：[1, 2, 3] 完毕')
+    assert data == [1, 2, 3]
+
+
+def test_repairs_keep_string_contents():
+    content = """{
+  // 注释
+  "notes": ["see http://example.com//path", "True story", "line one
+line two",],
+  "flag": True,
+  "empty": None,
+}"""
+    data, report = extractor.extract(content)
+
+    assert data["notes"] == ["see http://example.com//path", "True story", "line one\nline two"]
+    assert data["flag"] is True and data["empty"] is None
+    details = {r["detail"] for r in report}
+    assert {"// 注释", "尾随逗号", "Python 字面量", "字符串内的原始换行"} <= details
+
+
+def test_truncated_inside_array_element_drops_partial_element():
+    content = '```json\n{"action_items": [{"title": "A", "priority": "high"}, {"title": "B", "prio'
+    data, report = extractor.extract(content, SCHEMA)
+
+    assert data == {"action_items": [{"title": "A", "priority": "high"}]}
+    assert "代码块未闭合（输出可能被截断）" in {r["detail"] for r in report}
+
+
+def test_truncated_inside_string_value():
+    data, _ = extractor.extract('{"notes": ["complete", "half fin')
+    assert data == {"notes": ["complete"]}
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a": "x"', {"a": "x"}),
+    ('{"a": "x", "b": 12 ', {"a": "x", "b": 12}),
+    ('{"a": "x", "b": 12', {"a": "x"}),
+    ('{"a": "x", "b"', {"a": "x"}),
+    ('{"a": {"b": "c"', {"a": {"b": "c"}}),
+])
+def test_truncated_right_after_complete_value_keeps_field(content, expected):
+    data, _ = extractor.extract(content)
+    assert data == expected
+
+
+def test_schema_coerces_and_drops():
+    content = ('{"action_items": ['
+               '{"title": "A", "priority": "high", "expected_days": "7天"},'
+               '{"priority": "low"},'
+               '{"title": 3, "priority": "medium", "expected_days": "很快"}]}')
+    data, report = extractor.extract(content, SCHEMA)
+
+    assert data["action_items"][0]["expected_days"] == 7
+    assert data["action_items"][1] == {"title": "3", "priority": "medium"}
+    assert len(data["action_items"]) == 2
+    assert {"coerce", "drop", "missing"} <= set(kinds(report))
+
+
+def test_single_value_becomes_array():
+    data, _ = extractor.extract('{"notes": "only one"}', SCHEMA)
+    assert data == {"notes": ["only one"]}
+
+
+def test_no_json_raises():
+    with pytest.raises(extractor.ExtractionError):
+        extractor.extract("抱歉，我无法完成这个请求。")
+
+
+def test_top_level_schema_mismatch_raises():
+    with pytest.raises(extractor.ExtractionError):
+        extractor.extract("[1, 2]", {"notes": [str]})
+
+
+def test_format_report_is_one_line():
+    _, report = extractor.extract('{"notes": ["a",],}')
+    assert "\n" not in extractor.format_report(report)
+    assert extractor.format_report(report).startswith("修复 $")
+
+
+def test_salvage_fields_and_array_elements():
+    content = '{"notes": ["a"], "action_items": [{"title": "A", "priority": "high"}, {oops}], "bad": [}'
+    data, report = extractor.extract(content, SCHEMA)
+
+    assert data["notes"] == ["a"]
+    assert data["action_items"] == [{"title": "A", "priority": "high"}]
+    assert not data.get("bad")
+    assert "salvage" in kinds(report)
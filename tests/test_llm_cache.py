@@ -0,0 +1,24 @@
+"""CompletionCache：过期判断与淘汰"""
+
+import os
+
+from conftest import load_tool
+
+llm = load_tool("llm-client")
+
+
+def test_evict_uses_created_ts_like_get(tmp_path):
+    now = [1000.0]
+    cache = llm.CompletionCache(tmp_path, ttl=60, clock=lambda: now[0])
+    cache.put("old", "c", {})
+    now[0] += 50
+    cache.put("fresh", "c", {})
+    # 文件修改时间（最近使用时间）与创建时间无关：old 的 mtime 是刚写入时，fresh 的 mtime 改成很久以前
+    os.utime(tmp_path / "fresh.json", (0, 0))
+
+    now[0] += 20
+    assert cache.get("old") is None
+    cache.evict()
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["fresh"]
+    assert cache.get("fresh")["content"] == "c"
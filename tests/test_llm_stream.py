@@ -0,0 +1,64 @@
+"""流式 LLM 调用：对 SSE 替身服务器测试完整接收、中途断流、异常事件和总超时"""
+
+from contextlib import ExitStack
+
+import pytest
+
+from conftest import load_tool, stub_server
+
+llm = load_tool("llm-client")
+
+ALL_KEYS = {"architecture_highlights", "security_trends", "action_items"}
+MESSAGES = [{"role": "user", "content": "分析"}]
+
+
+@pytest.fixture
+def sse_stub(monkeypatch):
+    """start(**make_stub_server 参数)：启动替身服务器并把 ARK_BASE_URL 指向它"""
+    with ExitStack() as stack:
+        def start(delay=0, **kwargs):
+            base = stack.enter_context(stub_server(llm.make_stub_server(delay=delay, **kwargs)))
+            monkeypatch.setattr(llm, "ARK_BASE_URL", base)
+        yield start
+
+
+def test_full_stream(sse_stub):
+    sse_stub()
+    analysis = llm.chat_json(MESSAGES, api_key="k", use_cache=False, stream=True)
+
+    assert set(analysis) == ALL_KEYS
+    assert len(analysis["action_items"]) == 2
+
+
+def test_break_after_salvages_completed_fields(sse_stub, capsys):
+    sse_stub(break_after=40)
+    analysis = llm.chat_json(MESSAGES, api_key="k", use_cache=False, stream=True)
+
+    assert analysis["architecture_highlights"][0]["title"] == "插件化数据源"
+    assert analysis["security_trends"]
+    # 截断在第二个行动项中间：只保留完整的元素
+    assert len(analysis.get("action_items", [])) < 2
+    assert "LLM 流中断" in capsys.readouterr().out
+
+
+def test_break_before_any_token_raises(sse_stub):
+    sse_stub(break_after=0)
+    with pytest.raises(ConnectionError):
+        llm.chat_json(MESSAGES, api_key="k", use_cache=False, stream=True)
+
+
+def test_malformed_event_is_skipped(sse_stub, capsys):
+    sse_stub(malformed=True)
+    analysis = llm.chat_json(MESSAGES, api_key="k", use_cache=False, stream=True)
+
+    assert set(analysis) == ALL_KEYS
+    assert "跳过无法解析的 SSE 事件" in capsys.readouterr().out
+
+
+def test_timeout_is_an_overall_deadline(sse_stub):
+    # 每段 0.05s、约 55 段：空闲超时不会触发，总超时到点后按流中断处理
+    sse_stub(delay=0.05)
+    content, assembler, error = llm.stream_chat_completion(MESSAGES, "k", timeout=0.6)
+
+    assert isinstance(error, TimeoutError)
+    assert 0 < len(content) < len(llm.STUB_COMPLETION)
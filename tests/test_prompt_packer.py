@@ -0,0 +1,14 @@
+"""prompt-packer：渲染格式与预算装箱"""
+
+from conftest import load_tool
+
+packer = load_tool("prompt-packer")
+
+
+def test_render_item_skips_internal_fields():
+    item = {"source": "Hacker News", "title": "Agents on a Pi", "score": 120,
+            "relevance": 3, "status": "updated"}
+
+    text = packer.render_item(item)
+
+    assert text == "\n### Hacker News\n- title: Agents on a Pi\n- score: 120\n"
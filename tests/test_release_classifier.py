@@ -0,0 +1,26 @@
+"""Release notes 分类：行号 / 行内容 / 编号提取"""
+
+from conftest import load_tool
+
+classifier = load_tool("release-classifier")
+
+
+def test_classify_text_lines_and_ids():
+    text = "## v1.2.0\n- Fix XSS in preview (CVE-2026-12345)\n- insecurity is not a keyword\n- BREAKING: drop node 18"
+    lines = classifier.classify_text(text)
+
+    assert [(l["line_no"], l["categories"]) for l in lines] == [(2, ["security", "cve"]), (4, ["breaking"])]
+    assert lines[0]["ids"] == ["CVE-2026-12345"]
+    assert lines[1]["text"] == "- BREAKING: drop node 18"
+
+
+def test_classify_text_when_lowercase_changes_length():
+    # "İ".lower() 是两个字符，小写文本的偏移和原文对不上
+    text = "İstanbul release\n- Security: fix RCE in İmport (GHSA-abcd-efgh-ijkl)\n- Faster startup"
+    lines = classifier.classify_text(text)
+
+    assert [l["line_no"] for l in lines] == [2, 3]
+    assert lines[0]["text"] == "- Security: fix RCE in İmport (GHSA-abcd-efgh-ijkl)"
+    assert lines[0]["categories"] == ["security", "cve"]
+    assert lines[0]["ids"] == ["GHSA-abcd-efgh-ijkl"]
+    assert lines[1]["text"] == "- Faster startup"
@@ -0,0 +1,65 @@
+"""Retry-After 解析：秒数与 HTTP-date 两种格式（RFC 9110）"""
+
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import load_tool, stub_server
+
+retry = load_tool("retry-policy")
+github = load_tool("github-api")
+
+NOW = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc).timestamp()
+
+
+def test_parse_retry_after_seconds():
+    assert retry.parse_retry_after({"Retry-After": " 120 "}) == 120
+
+
+def test_parse_retry_after_http_date():
+    value = format_datetime(datetime(2026, 10, 16, 12, 1, 30, tzinfo=timezone.utc), usegmt=True)
+    assert retry.parse_retry_after({"Retry-After": value}, now=NOW) == 90
+
+
+def test_parse_retry_after_past_date_and_garbage():
+    assert retry.parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, now=NOW) == 0
+    assert retry.parse_retry_after({"Retry-After": "soon"}) is None
+    assert retry.parse_retry_after({}) is None
+
+
+def test_scheduler_accepts_http_date_retry_after():
+    scheduler = github.RateLimitScheduler(clock=lambda: NOW, sleep=lambda s: None)
+    value = format_datetime(datetime(2026, 10, 16, 12, 0, 45, tzinfo=timezone.utc), usegmt=True)
+
+    delay = scheduler.update({"Retry-After": value}, 429)
+
+    assert delay == 45
+    assert scheduler.blocked_until == NOW + 45
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    """所有请求都返回 429，Retry-After 一小时"""
+
+    def do_GET(self):
+        self.send_response(429)
+        self.send_header("Retry-After", "3600")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_long_retry_after_raises_rate_limit_exceeded(monkeypatch):
+    scheduler = github.RateLimitScheduler(sleep=lambda s: None)
+    monkeypatch.setattr(github, "_scheduler", scheduler)
+
+    with stub_server(ThreadingHTTPServer(("127.0.0.1", 0), RateLimitedHandler)) as base:
+        with pytest.raises(github.RateLimitExceeded):
+            github._conditional_get(f"{base}/repos/owner/repo", use_cache=False)
+
+    # 被限流的响应不计入已用配额
+    assert scheduler.stats["quota_used"] == 0
+    assert scheduler.stats["rate_limited"] == 1
@@ -0,0 +1,90 @@
+"""tech-analyzer 主流程：跨天去重 + token 预算打包后的指纹记录和报告输出"""
+
+import pytest
+
+from conftest import load_tool
+
+analyzer = load_tool("tech-analyzer")
+fingerprint = load_tool("content-fingerprint")
+packer = load_tool("prompt-packer")
+
+ITEMS = [
+    {"source": "Hacker News", "title": "OpenClaw 2.0 ships a plugin runtime", "comments": 300, "score": 500},
+    {"source": "Hacker News", "title": "Running LLM agents on a Raspberry Pi", "comments": 2, "score": 10},
+]
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    """run(items, budget) → 调用 main()，返回 (LLM 收到的提示词列表, 指纹索引)"""
+    prompts = []
+    index_path = tmp_path / "fingerprints.json"
+    monkeypatch.setattr(analyzer, "OUTPUT_DIR", tmp_path / "tech-analyzer")
+    monkeypatch.setattr(analyzer, "load_env", lambda: None)
+    monkeypatch.setattr(analyzer, "load_daily_reports", lambda: {"github": {}})
+    monkeypatch.setattr(analyzer, "save_action_items", lambda analysis: None)
+    index_class = fingerprint.FingerprintIndex
+    monkeypatch.setattr(fingerprint, "FingerprintIndex", lambda: index_class(index_path))
+
+    def fake_chat_json(messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        return {"action_items": [{"title": "t", "priority": "high", "steps": ["s"]}]}
+    monkeypatch.setattr(analyzer.llm, "chat_json", fake_chat_json)
+
+    def run(items, budget=packer.PROMPT_TOKEN_BUDGET):
+        monkeypatch.setattr(analyzer, "extract_technical_content", lambda reports: items)
+        monkeypatch.setattr(packer, "PROMPT_TOKEN_BUDGET", budget)
+        analyzer.main()
+        return prompts, index_class(index_path)
+    return run
+
+
+def report_text(tmp_path):
+    return next((tmp_path / "tech-analyzer").glob("tech-analysis-*.md")).read_text()
+
+
+def test_only_packed_items_are_recorded(run):
+    budget = packer.estimate_tokens(packer.render_item(ITEMS[0]))
+    prompts, index = run(ITEMS, budget=budget)
+
+    assert ITEMS[0]["title"] in prompts[0]
+    assert ITEMS[1]["title"] not in prompts[0]
+    assert [e["title"] for e in index.entries.values()] == [ITEMS[0]["title"]]
+    # 被裁掉的条目下次仍是新内容
+    assert index.classify(ITEMS, today="2099-01-01")[1]["status"] == "new"
+
+
+def test_no_new_content_still_writes_report(run, tmp_path, monkeypatch):
+    prompts, index = run(ITEMS)
+    assert len(prompts) == 1
+
+    # 第二天：内容全部重复，不调用 LLM，但仍写出当天的报告文件
+    monkeypatch.setattr(fingerprint, "datetime", FakeDatetime)
+    prompts, _ = run(ITEMS)
+
+    assert len(prompts) == 1
+    text = report_text(tmp_path)
+    assert "跳过 LLM 分析" in text
+    assert ITEMS[0]["title"] in text
+
+
+REAL_DATETIME = fingerprint.datetime
+
+
+class FakeDatetime(REAL_DATETIME):
+    """明天"""
+    @classmethod
+    def now(cls, tz=None):
+        return REAL_DATETIME.now(tz) + fingerprint.timedelta(days=1)
+
+
+def test_extract_reads_primary_repo_and_tolerates_failed_fetch():
+    topic = {"title": "Plugin loader crash", "created_at": "2026-10-01", "comments": 3, "labels": ["bug"]}
+    reports = {"github_json": {"primary": "core", "repos": {
+        "core": {"name": "owner/core", "releases": None, "trending_topics": [topic], "stars": None},
+        "main": {"name": "owner/other", "releases": None, "trending_topics": None},
+    }}}
+
+    content = analyzer.extract_technical_content(reports)
+
+    assert [item["title"] for item in content] == ["Plugin loader crash"]
@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # 路径配置
-WORKSPACE_DIR = Path("/home/writer/.openclaw/workspace")
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
 TRACKER_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade" / "tracker"
 ACTION_FILE = TRACKER_DIR / "action-items.json"
 METRICS_FILE = TRACKER_DIR / "growth-metrics.json"
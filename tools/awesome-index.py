@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Awesome Index - awesome-openclaw README 解析与增量更新
+功能：
+1. 解析后的 分类 → 资源 索引与 README 的 blob SHA 一起持久化
+2. SHA 未变化时完全跳过 base64 解码和解析
+3. SHA 变化时按分类给出新增 / 移除的资源
+4. 跨天资源索引：按规范化 URL 记录首次 / 最后出现日期和分类变动，
+   只根据 README 的增删增量更新，按 URL O(1) 查询
+
+存储：cache/awesome-readme.json、history/awesome-resources.json
+"""
+
+import base64
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+README_SNAPSHOT = Path(os.environ.get("AWESOME_README_SNAPSHOT", WORKSPACE_DIR / "cache" / "awesome-readme.json"))
+RESOURCE_INDEX = Path(os.environ.get("AWESOME_RESOURCE_INDEX", WORKSPACE_DIR / "history" / "awesome-resources.json"))
+
+# 规范化时丢弃的跟踪参数：按名称精确匹配 + utm_ 前缀（reference= / sourceId= 等不是跟踪参数）
+TRACKING_PARAMS = {"ref", "source"}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def parse_readme(content):
+    """解析 README：'## ' 标题为分类，'- [title](url)' 为资源
+
+    Returns:
+        {category: [{"title", "url"}, ...]}
+    """
+    categories = {}
+    current_category = None
+
+    for line in content.split('\n'):
+        if line.startswith('## '):
+            current_category = line.replace('## ', '').strip()
+            categories[current_category] = []
+        elif line.startswith('- [') and current_category:
+            # 提取资源链接
+            title_start = line.find('[') + 1
+            title_end = line.find(']')
+            url_start = line.find('(') + 1
+            url_end = line.find(')')
+
+            if title_end > title_start and url_end > url_start:
+                categories[current_category].append({
+                    "title": line[title_start:title_end],
+                    "url": line[url_start:url_end]
+                })
+    return categories
+
+
+def diff_categories(old, new):
+    """按分类比较两次解析结果（按 URL 判断同一资源）
+
+    Returns:
+        {"added": {category: [...]}, "removed": {category: [...]}}（只包含有变化的分类）
+    """
+    added, removed = {}, {}
+    for category in list(new) + [c for c in old if c not in new]:
+        old_items = {r["url"]: r for r in old.get(category, [])}
+        new_items = {r["url"]: r for r in new.get(category, [])}
+        plus = [r for url, r in new_items.items() if url not in old_items]
+        minus = [r for url, r in old_items.items() if url not in new_items]
+        if plus:
+            added[category] = plus
+        if minus:
+            removed[category] = minus
+    return {"added": added, "removed": removed}
+
+
+class ReadmeSnapshot:
+    """上一次解析的 README（SHA + 分类索引）"""
+
+    def __init__(self, path=README_SNAPSHOT):
+        self.path = Path(path)
+        self.sha = None
+        self.categories = {}
+        self.parsed_at = None
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.sha = data.get("sha")
+        self.categories = data.get("categories", {})
+        self.parsed_at = data.get("parsed_at")
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                "sha": self.sha,
+                "parsed_at": self.parsed_at,
+                "categories": self.categories,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def update_from_contents(data, path=README_SNAPSHOT, save=True):
+    """根据 contents API 的响应更新索引
+
+    Args:
+        data: GET repos/{owner}/{repo}/readme 的响应（含 sha 和 base64 content）
+        save: False 时只计算增删，不保存快照（由调用方在下游更新成功后调用 snapshot.save()）
+    Returns:
+        (categories, changes, snapshot)，changes = {"sha", "previous_sha", "unchanged", "added", "removed"}
+    """
+    snapshot = ReadmeSnapshot(path)
+    sha = data.get('sha')
+    changes = {"sha": sha, "previous_sha": snapshot.sha, "unchanged": False, "added": {}, "removed": {}}
+
+    if sha and sha == snapshot.sha:
+        changes["unchanged"] = True
+        return snapshot.categories, changes, snapshot
+
+    content = base64.b64decode(data['content']).decode('utf-8')
+    categories = parse_readme(content)
+    # 首次解析没有基线，不报告新增
+    if snapshot.sha is not None:
+        changes.update(diff_categories(snapshot.categories, categories))
+
+    snapshot.sha = sha
+    snapshot.categories = categories
+    snapshot.parsed_at = datetime.now().isoformat()
+    if save:
+        snapshot.save()
+    return categories, changes, snapshot
+
+
+def sync_readme(data, snapshot_path=README_SNAPSHOT, index_path=RESOURCE_INDEX, persist=True):
+    """README 快照 + 跨天资源索引一起更新
+
+    先更新资源索引，成功后才保存新的 README SHA：索引更新失败时快照仍是旧 SHA，
+    下次运行会重新计算同一批增删，不会因为 SHA 已前移而永久丢失这些变化。
+
+    Args:
+        persist: False 时只计算结果，快照和索引都不落盘（fixture 离线运行）
+    Returns:
+        (categories, changes, new_resources)
+    """
+    categories, changes, snapshot = update_from_contents(data, snapshot_path, save=False)
+    new_resources = ResourceIndex(index_path).apply(categories, changes, save=persist)
+    if persist and not changes["unchanged"]:
+        snapshot.save()
+    return categories, changes, new_resources
+
+
+def count_changes(changes):
+    """(新增数, 移除数)"""
+    return (sum(len(v) for v in changes["added"].values()),
+            sum(len(v) for v in changes["removed"].values()))
+
+
+# ==================== 跨天资源索引 ====================
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url):
+    """规范化 URL，使同一资源的不同写法得到同一个 key
+
+    - http → https，host 小写并去掉 www.
+    - 去掉 fragment、跟踪参数（utm_* / ref / source）、末尾的 / 和 .git
+    - github.com 路径大小写不敏感，统一小写
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip().rstrip('/').lower()
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    if path.endswith('.git'):
+        path = path[:-4]
+    if host == 'github.com':
+        path = path.lower()
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query) if not _is_tracking_param(k)
+    ))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+class ResourceIndex:
+    """按规范化 URL 索引的资源历史
+
+    条目：{"url", "title", "category", "first_seen", "last_seen", "present", "moves": [...]}
+    仍在 README 中的资源（present=True）最后出现日期即索引的 synced_at，无需每天逐条更新。
+    首次建立索引时已存在的资源带 "baseline": True，不算新增。
+    """
+
+    def __init__(self, path=RESOURCE_INDEX):
+        self.path = Path(path)
+        self.entries = {}
+        self.synced_at = None
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.entries = data.get("entries", {})
+        self.synced_at = data.get("synced_at")
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"synced_at": self.synced_at, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def get(self, url):
+        """按 URL 查询（任意写法），返回条目副本，不存在时返回 None"""
+        entry = self.entries.get(normalize_url(url))
+        if entry is None:
+            return None
+        entry = dict(entry)
+        if entry["present"]:
+            entry["last_seen"] = self.synced_at
+        return entry
+
+    def new_on(self, day):
+        """某天首次出现且仍在 README 中的资源（不含基线资源）"""
+        return [{"title": entry["title"], "url": entry["url"], "category": entry["category"]}
+                for entry in self.entries.values()
+                if entry["first_seen"] == day and entry["present"] and not entry.get("baseline")]
+
+    def _add(self, resource, category, today, baseline=False):
+        entry = self.entries[normalize_url(resource["url"])] = {
+            "url": resource["url"],
+            "title": resource["title"],
+            "category": category,
+            "first_seen": today,
+            "last_seen": None,
+            "present": True,
+            "moves": [],
+        }
+        if baseline:
+            entry["baseline"] = True
+
+    def apply(self, categories, changes, today=None, save=True):
+        """用今天的 README 解析结果更新索引
+
+        Args:
+            categories: update_from_contents 返回的分类索引
+            changes: update_from_contents 返回的增删（README 未变化时为空）
+            save: False 时只更新内存中的索引，不写文件
+        Returns:
+            今天新出现的资源列表（首次建立索引时返回空列表）。按索引中的 first_seen 计算而不是
+            只看本次的增删：当天重跑时 README SHA 未变化、增删为空，结果仍与第一次运行相同
+        """
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        if self.synced_at is None:
+            # 首次建立索引：全部资源作为基线，不算新增
+            for category, resources in categories.items():
+                for resource in resources:
+                    if normalize_url(resource["url"]) not in self.entries:
+                        self._add(resource, category, today, baseline=True)
+            self.synced_at = today
+            if save:
+                self.save()
+            return []
+
+        previous_sync = self.synced_at
+        added_keys = set()
+        for category, resources in changes["added"].items():
+            for resource in resources:
+                key = normalize_url(resource["url"])
+                added_keys.add(key)
+                entry = self.entries.get(key)
+                if entry is None:
+                    self._add(resource, category, today)
+                    continue
+                if entry["category"] != category:
+                    entry["moves"].append({"date": today, "from": entry["category"], "to": category})
+                    entry["category"] = category
+                entry.update({"url": resource["url"], "title": resource["title"], "present": True})
+
+        for resources in changes["removed"].values():
+            for resource in resources:
+                key = normalize_url(resource["url"])
+                entry = self.entries.get(key)
+                # 同一资源在另一个分类中被加入，属于分类变动而不是移除
+                if entry is not None and key not in added_keys:
+                    entry["present"] = False
+                    entry["last_seen"] = previous_sync
+
+        self.synced_at = today
+        if save:
+            self.save()
+        return self.new_on(today)
@@ -13,106 +13,98 @@ Community Scraper - OpenClaw 社区内容抓取
 - 超时限制防止 hangs
 """
 
-import urllib.request
+import importlib
 import json
-import ssl
 import os
-import re
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
-# ==================== 安全机制 ====================
-
-def detect_injection(content: str) -> bool:
-    """检测潜在的提示词注入模式"""
-    patterns = [
-        r"ignore\s+previous\s+instructions",
-        r"disregard\s+all",
-        r"you\s+are\s+now",
-        r"bypass\s+safety",
-    ]
-    lower_content = content.lower()
-    for pattern in patterns:
-        if re.search(pattern, lower_content):
-            print(f"⚠️  检测到潜在的提示词注入模式")
-            return True
-    return False
+# 共享 HTTP 客户端 / GitHub 访问层（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+github = importlib.import_module("github-api")
+hn = importlib.import_module("hn-fetcher")
+keyword_matcher = importlib.import_module("keyword-matcher")
+awesome_index = importlib.import_module("awesome-index")
+injection = importlib.import_module("injection-scanner")
 
 # 配置
-# 从环境变量读取 GitHub Token
-import os
+# 从环境变量读取 GitHub Token（联网抓取时才需要，fixture 回放不需要）
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
-if not GITHUB_TOKEN:
-    raise EnvironmentError("GITHUB_TOKEN 环境变量未设置，请在 ~/.openclaw/.env 中配置")
-OUTPUT_DIR = Path("/home/writer/.openclaw/workspace/logs/community-scraper")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+OUTPUT_DIR = WORKSPACE_DIR / "logs" / "community-scraper"
+SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
+
+# HN 相关度关键词（关键词 → 权重），相关度分数 >= min_score 的 story 才保留
+HN_KEYWORDS_CONFIG = Path(os.environ.get("HN_KEYWORDS_CONFIG", SKILL_DIR / "config" / "hn-keywords.json"))
+DEFAULT_HN_KEYWORDS = {
+    "min_score": 1,
+    "keywords": {"openclaw": 5, "claude": 3, "llm*": 3, "agent*": 2, "gpt*": 2, "ai": 1},
+}
+
+def load_hn_matcher(path=HN_KEYWORDS_CONFIG):
+    """读取关键词配置并编译匹配器，返回 (matcher, min_score)"""
+    config = DEFAULT_HN_KEYWORDS
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    return keyword_matcher.KeywordMatcher(config["keywords"]), config.get("min_score", 1)
 
 def github_api(endpoint):
-    """GitHub API 请求"""
-    url = f"https://api.github.com/{endpoint}"
-    req = urllib.request.Request(url)
-    req.add_header('Authorization', f'token {GITHUB_TOKEN}')
-    req.add_header('Accept', 'application/vnd.github.v3+json')
-    
-    ctx = ssl.create_default_context()
+    """GitHub API 请求（ETag 条件请求缓存）"""
     try:
-        response = urllib.request.urlopen(req, context=ctx, timeout=15)
-        return json.load(response)
+        return github.github_api(endpoint, token=GITHUB_TOKEN)
     except Exception as e:
         print(f"❌ API 请求失败：{e}")
         return None
 
+# ==================== 数据源插件 ====================
+# 每个数据源拆成 fetch（网络请求，返回可 JSON 序列化的原始数据）和
+# parse（原始数据 → report["sources"][name]，无结果时返回 None），
+# 这样可以用本地 fixture 代替 fetch 离线测试 parse / insights。
+
 def fetch_awesome_openclaw():
-    """抓取 awesome-openclaw 资源列表"""
+    """抓取 awesome-openclaw README（contents API 原始响应）"""
     print("  📚 抓取 awesome-openclaw...")
-    
-    # 获取 README 内容
-    data = github_api("repos/SamurAIGPT/awesome-openclaw/readme")
+    return github_api("repos/SamurAIGPT/awesome-openclaw/readme")
+
+def parse_awesome_openclaw(data, persist=True):
+    """解析 awesome-openclaw 资源列表
+
+    Args:
+        persist: False 时不保存 README 快照和资源索引（fixture 回放）
+    """
     if not data:
         return None
     
-    # 解码 README
-    import base64
-    content = base64.b64decode(data['content']).decode('utf-8')
-    
-    # 解析资源分类
-    categories = {}
-    current_category = None
-    
-    for line in content.split('\n'):
-        if line.startswith('## '):
-            current_category = line.replace('## ', '').strip()
-            categories[current_category] = []
-        elif line.startswith('- [') and current_category:
-            # 提取资源链接
-            try:
-                title_start = line.find('[') + 1
-                title_end = line.find(']')
-                url_start = line.find('(') + 1
-                url_end = line.find(')')
-                
-                if title_end > title_start and url_end > url_start:
-                    title = line[title_start:title_end]
-                    url = line[url_start:url_end]
-                    categories[current_category].append({
-                        "title": title,
-                        "url": url
-                    })
-            except:
-                pass
+    # README blob SHA 未变化时直接复用上次的解析结果，变化时给出按分类的增删
+    # 跨天资源索引只把首次出现的资源作为新增；索引更新成功后才保存新的 SHA
+    categories, changes, new_resources = awesome_index.sync_readme(data, persist=persist)
+    added, removed = awesome_index.count_changes(changes)
+    if changes["unchanged"]:
+        print("    ♻️  README 未变化，跳过解析")
+    else:
+        print(f"    🔄 README 已更新：新增 {added} 个资源，移除 {removed} 个资源")
     
     return {
         "categories": categories,
         "total_resources": sum(len(v) for v in categories.values()),
-        "category_count": len(categories)
+        "category_count": len(categories),
+        "changes": changes,
+        "new_resources": new_resources
     }
 
 def fetch_clawhub_skills():
-    """抓取 ClawHub 技能统计"""
+    """抓取 ClawHub 技能统计（openclaw/skills 仓库原始响应）"""
     print("  🛠️  抓取 ClawHub 技能...")
-    
     # ClawHub 没有公开 API，通过 GitHub skills 仓库估算
-    data = github_api("repos/openclaw/skills")
+    return github_api("repos/openclaw/skills")
+
+def parse_clawhub_skills(data):
     if not data:
         return None
     
@@ -123,59 +115,167 @@ def fetch_clawhub_skills():
         "description": data.get('description', '')
     }
 
-def fetch_hacker_news_ai():
-    """抓取 Hacker News AI 相关讨论"""
+def fetch_hacker_news():
+    """抓取 Hacker News 热门 story（并发抓取，整次扫描共享截止时间）"""
     print("  📰 抓取 Hacker News...")
+    stories, stats = hn.fetch_top_stories()
+    print(f"    {hn.format_stats(stats)}")
+    return stories
+
+def parse_hacker_news(stories):
+    """按关键词相关度过滤 AI 相关讨论（单词边界匹配，保持排名顺序）"""
+    matcher, min_score = load_hn_matcher()
+    ai_stories = []
+    for story in stories or []:
+        injection.detect_injection(story.get('title', ''), "Hacker News")
+        relevance, matched = matcher.score(story.get('title', ''))
+        if relevance >= min_score:
+            ai_stories.append({
+                "title": story.get('title', ''),
+                "url": story.get('url', ''),
+                "score": story.get('score', 0),
+                "comments": story.get('descendants', 0),
+                "relevance": relevance,
+                "keywords": matched,
+                "hn_url": f"https://news.ycombinator.com/item?id={story.get('id')}"
+            })
     
-    # 重试机制函数
-    def fetch_with_retry(url, timeout=10, max_retries=3):
-        for attempt in range(max_retries):
-            try:
-                ctx = ssl.create_default_context()
-                response = urllib.request.urlopen(url, context=ctx, timeout=timeout)
-                return json.load(response)
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"    ⚠️  重试 {attempt + 1}/{max_retries}...")
-                    import time
-                    time.sleep(1)
-                else:
-                    raise e
+    if not ai_stories:
         return None
+    return {"ai_stories": ai_stories, "count": len(ai_stories)}
+
+def hacker_news_insights(data):
+    return [{
+        "type": "trending",
+        "title": f"Hacker News 发现 {data['count']} 个 AI 相关讨论",
+        "stories": data["ai_stories"][:5]
+    }]
+
+LOBSTERS_URL = "https://lobste.rs/hottest.json"
+LOBSTERS_TAGS = {"ai", "ml", "vibecoding"}
+
+def fetch_lobsters():
+    """抓取 Lobsters 热门列表"""
+    print("  🦞 抓取 Lobsters...")
+    return http_client.get_json(LOBSTERS_URL)
+
+def parse_lobsters(items):
+    """按标签或关键词相关度过滤 AI 相关讨论"""
+    matcher, min_score = load_hn_matcher()
+    stories = []
+    for item in items or []:
+        injection.detect_injection(item.get('title', ''), "Lobsters")
+        relevance, matched = matcher.score(item.get('title', ''))
+        tags = item.get('tags', [])
+        if relevance >= min_score or LOBSTERS_TAGS & set(tags):
+            stories.append({
+                "title": item.get('title', ''),
+                "url": item.get('url', '') or item.get('comments_url', ''),
+                "score": item.get('score', 0),
+                "comments": item.get('comment_count', 0),
+                "tags": tags,
+                "relevance": relevance,
+                "comments_url": item.get('comments_url', '')
+            })
     
-    # Hacker News API
-    try:
-        # 获取热门故事（带重试）
-        top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        top_ids = fetch_with_retry(top_stories_url, timeout=10)[:50]  # 前 50 个
-        
-        # 获取故事详情并过滤 AI 相关
-        ai_stories = []
-        for story_id in top_ids[:20]:  # 检查前 20 个
-            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            try:
-                story = fetch_with_retry(story_url, timeout=5)
-                
-                # 检查标题是否包含 AI 关键词
-                title = story.get('title', '').lower()
-                if any(kw in title for kw in ['ai', 'agent', 'openclaw', 'llm', 'gpt', 'claude']):
-                    ai_stories.append({
-                        "title": story.get('title', ''),
-                        "url": story.get('url', ''),
-                        "score": story.get('score', 0),
-                        "comments": story.get('descendants', 0),
-                        "hn_url": f"https://news.ycombinator.com/item?id={story_id}"
-                    })
-            except:
-                pass
-        
-        return ai_stories
-    except Exception as e:
-        print(f"    ⚠️  HN 抓取失败：{e}")
-        return []
+    if not stories:
+        return None
+    return {"stories": stories, "count": len(stories)}
 
-def generate_community_report():
-    """生成社区趋势报告"""
+# 数据源注册表：新增数据源只需在这里加一项
+#   name: report["sources"] 中的 key（也是 fixture 文件名）
+#   fetch / parse: 见上方说明；insights: data → 洞察列表（可选）
+#   timeout: 该数据源的总耗时上限（秒），超时不影响其他数据源
+#   stateful: parse 会更新本地索引；fixture 回放时以 persist=False 调用，不改动真实状态
+SOURCES = [
+    {"name": "awesome-openclaw", "fetch": fetch_awesome_openclaw, "parse": parse_awesome_openclaw,
+     "timeout": 30, "stateful": True},
+    {"name": "clawhub", "fetch": fetch_clawhub_skills, "parse": parse_clawhub_skills,
+     "timeout": 30},
+    {"name": "hacker-news", "fetch": fetch_hacker_news, "parse": parse_hacker_news,
+     "insights": hacker_news_insights, "timeout": hn.HN_DEADLINE + 10},
+    {"name": "lobsters", "fetch": fetch_lobsters, "parse": parse_lobsters,
+     "timeout": 20},
+]
+
+def run_source(source, fixtures_dir=None, save_fixtures_dir=None):
+    """执行单个数据源：fetch（或读取 fixture）→ parse"""
+    if fixtures_dir:
+        fixture = Path(fixtures_dir) / f"{source['name']}.json"
+        if not fixture.exists():
+            return None
+        with open(fixture, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    else:
+        raw = source["fetch"]()
+        if save_fixtures_dir and raw is not None:
+            Path(save_fixtures_dir).mkdir(parents=True, exist_ok=True)
+            with open(Path(save_fixtures_dir) / f"{source['name']}.json", 'w', encoding='utf-8') as f:
+                json.dump(raw, f, ensure_ascii=False)
+    if source.get("stateful"):
+        return source["parse"](raw, persist=not fixtures_dir)
+    return source["parse"](raw)
+
+def run_sources(sources, fixtures_dir=None, save_fixtures_dir=None):
+    """并发执行所有数据源，每个数据源按自己的 timeout 截止
+
+    总耗时约等于最慢（或最先超时）的数据源，而不是所有数据源之和；
+    每个数据源跑在独立的守护线程里，超时后直接放弃：卡住的线程既不阻塞其他结果，
+    也不会拖住进程退出（线程池的工作线程在退出时会被 join，无法真正放弃）。
+
+    Returns:
+        (results {name: data}, status {name: {"status", "elapsed"}})
+    """
+    results, status = {}, {}
+    if not sources:
+        return results, status
+    
+    start = time.monotonic()
+    finished = queue.Queue()
+
+    def worker(source):
+        try:
+            finished.put((source["name"], run_source(source, fixtures_dir, save_fixtures_dir), None))
+        except Exception as e:
+            finished.put((source["name"], None, e))
+
+    pending = {source["name"]: source for source in sources}
+    for source in sources:
+        threading.Thread(target=worker, args=(source,), name=f"source-{source['name']}",
+                         daemon=True).start()
+    while pending:
+        next_deadline = min(start + source["timeout"] for source in pending.values())
+        try:
+            name, data, error = finished.get(timeout=max(next_deadline - time.monotonic(), 0))
+        except queue.Empty:
+            name = None
+        elapsed = round(time.monotonic() - start, 2)
+        if name in pending:
+            del pending[name]
+            if error is not None:
+                print(f"    ⚠️  {name} 抓取失败：{error}")
+                status[name] = {"status": "error", "elapsed": elapsed}
+            else:
+                status[name] = {"status": "ok" if data else "empty", "elapsed": elapsed}
+                if data:
+                    results[name] = data
+        for source in list(pending.values()):
+            if time.monotonic() >= start + source["timeout"]:
+                del pending[source["name"]]
+                print(f"    ⏱️  {source['name']} 超过 {source['timeout']}s，已跳过")
+                status[source["name"]] = {"status": "timeout", "elapsed": elapsed}
+    return results, status
+
+def generate_community_report(fixtures_dir=None, save_fixtures_dir=None, output_dir=OUTPUT_DIR):
+    """生成社区趋势报告
+
+    Args:
+        fixtures_dir: 从该目录读取 <source>.json 代替网络请求（离线测试）
+        save_fixtures_dir: 把本次抓取的原始数据保存为 fixture
+        output_dir: 报告输出目录
+    """
+    if not fixtures_dir and not GITHUB_TOKEN:
+        raise EnvironmentError("GITHUB_TOKEN 环境变量未设置，请在 ~/.openclaw/.env 中配置")
     print("🔍 开始社区内容抓取...")
     
     report = {
@@ -183,29 +283,18 @@ def generate_community_report():
         "sources": {}
     }
     
-    # awesome-openclaw
-    awesome_data = fetch_awesome_openclaw()
-    if awesome_data:
-        report["sources"]["awesome-openclaw"] = awesome_data
-    
-    # ClawHub
-    clawhub_data = fetch_clawhub_skills()
-    if clawhub_data:
-        report["sources"]["clawhub"] = clawhub_data
-    
-    # Hacker News
-    hn_stories = fetch_hacker_news_ai()
-    if hn_stories:
-        report["sources"]["hacker-news"] = {
-            "ai_stories": hn_stories,
-            "count": len(hn_stories)
-        }
+    sources, status = run_sources(SOURCES, fixtures_dir, save_fixtures_dir)
+    # 保持注册表顺序
+    report["sources"] = {s["name"]: sources[s["name"]] for s in SOURCES if s["name"] in sources}
+    report["source_status"] = {s["name"]: status[s["name"]] for s in SOURCES if s["name"] in status}
     
     # 生成社区洞察
     print("  💡 生成社区洞察...")
     insights = []
+    awesome_data = sources.get("awesome-openclaw")
+    clawhub_data = sources.get("clawhub")
     
-    # 洞察 1: 生态系统规模
+    # 洞察 1: 生态系统规模（跨数据源）
     if awesome_data and clawhub_data:
         insights.append({
             "type": "ecosystem",
@@ -216,18 +305,18 @@ def generate_community_report():
             ]
         })
     
-    # 洞察 2: 社区热点
-    if hn_stories:
-        insights.append({
-            "type": "trending",
-            "title": f"Hacker News 发现 {len(hn_stories)} 个 AI 相关讨论",
-            "stories": hn_stories[:5]
-        })
+    # 各数据源自己的洞察（如社区热点）
+    for source in SOURCES:
+        if source.get("insights") and source["name"] in sources:
+            insights.extend(source["insights"](sources[source["name"]]))
     
     report["insights"] = insights
+    report["rate_limit"] = github.rate_limit_summary()
     
     # 保存报告
-    output_file = OUTPUT_DIR / f"community-scraper-{datetime.now().strftime('%Y%m%d')}.json"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"community-scraper-{datetime.now().strftime('%Y%m%d')}.json"
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(report, f, ensure_ascii=False, indent=2)
     
@@ -235,7 +324,7 @@ def generate_community_report():
     
     # 生成 Markdown 摘要
     md_summary = generate_markdown_summary(report)
-    md_file = OUTPUT_DIR / f"community-scraper-{datetime.now().strftime('%Y%m%d')}.md"
+    md_file = output_dir / f"community-scraper-{datetime.now().strftime('%Y%m%d')}.md"
     with open(md_file, 'w', encoding='utf-8') as f:
         f.write(md_summary)
     
@@ -262,6 +351,17 @@ def generate_markdown_summary(report):
         for cat, resources in list(awesome['categories'].items())[:5]:
             md.append(f"- **{cat}**: {len(resources)} 个资源")
         md.append("")
+        
+        changes = awesome.get('changes') or {}
+        if changes.get('added') or changes.get('removed'):
+            md.append("### 🆕 资源变化")
+            for cat, resources in changes.get('added', {}).items():
+                for r in resources:
+                    md.append(f"- ➕ **{cat}**: [{r['title']}]({r['url']})")
+            for cat, resources in changes.get('removed', {}).items():
+                for r in resources:
+                    md.append(f"- ➖ **{cat}**: {r['title']}")
+            md.append("")
     
     # ClawHub
     if "clawhub" in report["sources"]:
@@ -283,7 +383,17 @@ def generate_markdown_summary(report):
         
         for i, story in enumerate(hn['ai_stories'][:5], 1):
             md.append(f"{i}. [{story['title']}]({story['hn_url']})")
-            md.append(f"   - 👍 {story['score']} 分 | 💬 {story['comments']} 评论")
+            md.append(f"   - 👍 {story['score']} 分 | 💬 {story['comments']} 评论 | 🎯 相关度 {story.get('relevance', '-')}")
+        md.append("")
+    
+    # Lobsters
+    if "lobsters" in report["sources"]:
+        lobsters = report["sources"]["lobsters"]
+        md.append("## 🦞 Lobsters AI 讨论")
+        md.append("")
+        for i, story in enumerate(lobsters['stories'][:5], 1):
+            md.append(f"{i}. [{story['title']}]({story['comments_url']})")
+            md.append(f"   - 👍 {story['score']} 分 | 💬 {story['comments']} 评论 | 🏷️ {', '.join(story['tags'])}")
         md.append("")
     
     # 社区洞察
@@ -307,10 +417,26 @@ def generate_markdown_summary(report):
     return '\n'.join(md)
 
 if __name__ == "__main__":
-    report = generate_community_report()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="社区内容抓取")
+    parser.add_argument("--fixtures", type=str, help="从目录读取 <source>.json 代替网络请求")
+    parser.add_argument("--save-fixtures", type=str, help="把抓取的原始数据保存为 fixture")
+    parser.add_argument("--output-dir", type=str, default=str(OUTPUT_DIR), help="报告输出目录")
+    args = parser.parse_args()
+    
+    report = generate_community_report(args.fixtures, args.save_fixtures, args.output_dir)
     print("\n📊 社区抓取完成！")
     print(f"  - 发现 {len(report['insights'])} 条社区洞察")
     if "awesome-openclaw" in report["sources"]:
         print(f"  - awesome-openclaw: {report['sources']['awesome-openclaw']['total_resources']} 个资源")
     if "hacker-news" in report["sources"]:
         print(f"  - Hacker News: {report['sources']['hacker-news']['count']} 个 AI 讨论")
+    if "lobsters" in report["sources"]:
+        print(f"  - Lobsters: {report['sources']['lobsters']['count']} 个 AI 讨论")
+    for name, st in report["source_status"].items():
+        print(f"  - {name}: {st['status']} ({st['elapsed']}s)")
+    print(f"  - {http_client.format_stats()}")
+    print(f"  - {http_client.format_retry_stats()}")
+    print(f"  - {github.format_cache_stats()}")
+    print(f"  - {http_client.format_cache_stats()}")
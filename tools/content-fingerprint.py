@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Content Fingerprint - 技术内容的跨天近似去重
+功能：
+1. 规范化标题和正文（NFKC、小写、去标点），拉丁文按词、中日韩文字按字切分，
+   分别计算标题（一元 shingle）和正文（一元 + 二元 shingle）的 64 位 SimHash
+2. 持久化指纹索引：记录已经送入 LLM 分析的条目，按标题 SimHash 分段（LSH）建桶，
+   查询只比较至少有一段完全相同的候选
+3. 每个条目标记为 new / updated / repeat：
+   - new：没有匹配的历史条目（同一数据源下标题规范化后相同，
+     或标题 SimHash 距离不超过 TITLE_DISTANCE 且标题中的数字（版本号 / CVE 编号等）相同）
+   - updated：匹配到历史条目，但正文 SimHash 距离超过 BODY_DISTANCE（或正文从无到有），
+     或评论数明显增长（讨论仍在发酵）
+   - repeat：其余情况
+4. 没有标题的统计快照（GitHub Stats / ClawHub）不参与去重，也不加标记
+5. 同一天重跑时沿用当天第一次分析时的标记，提示词保持不变（LLM 缓存仍可命中）
+
+环境变量：
+    CONTENT_FINGERPRINT_INDEX        索引路径（默认 history/content-fingerprints.json）
+    CONTENT_FINGERPRINT_RETENTION    多少天未再出现的条目从索引中删除（默认 30）
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    fingerprint = importlib.import_module("content-fingerprint")
+    index = fingerprint.FingerprintIndex()
+    labeled = index.classify(items)          # 每个条目增加 "status"
+    fresh = [i for i in labeled if i.get("status") != "repeat"]
+    index.record(fresh)                      # LLM 分析成功后写入索引
+    python3 content-fingerprint.py --stats
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+FINGERPRINT_INDEX = Path(os.environ.get("CONTENT_FINGERPRINT_INDEX",
+                                        WORKSPACE_DIR / "history" / "content-fingerprints.json"))
+RETENTION_DAYS = int(os.environ.get("CONTENT_FINGERPRINT_RETENTION", "30"))
+
+# 标题很短，只用一元 shingle：改写几个词的距离约 7～11，无关标题通常在 20 以上
+TITLE_DISTANCE = 12
+BODY_DISTANCE = 12
+# 64 位 SimHash 分成 TITLE_DISTANCE + 1 段（每段 4～5 位）：距离不超过 TITLE_DISTANCE 的两个指纹
+# 必然至少有一段完全相同（抽屉原理），LSH 查询不会漏掉近似条目
+BANDS = TITLE_DISTANCE + 1
+BAND_EDGES = [64 * i // BANDS for i in range(BANDS + 1)]
+# 评论数增长超过该比例且至少增加 COMMENT_GROWTH_MIN 条时视为有实质变化
+COMMENT_GROWTH_RATIO = 0.5
+COMMENT_GROWTH_MIN = 10
+
+# 参与正文指纹的字段之外的字段（标识 / 日期 / 计数）
+NON_BODY_FIELDS = {"source", "title", "date", "status", "comments", "score", "relevance",
+                   "stars", "forks", "open_issues"}
+
+NUMBER_RE = re.compile(r"\d+")
+TOKEN_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]|[^\W_]+")
+
+
+def normalize(text):
+    """NFKC + 小写 + 去掉标点，连续空白合并为一个空格"""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return " ".join(TOKEN_RE.findall(text))
+
+
+def features(text, bigrams=True):
+    """一元（+ 二元）shingle → {shingle: 权重}"""
+    tokens = normalize(text).split()
+    result = {}
+    for i, token in enumerate(tokens):
+        result[token] = result.get(token, 0) + 1
+        if bigrams and i:
+            bigram = f"{tokens[i - 1]} {token}"
+            result[bigram] = result.get(bigram, 0) + 1
+    return result
+
+
+def simhash(weighted):
+    """64 位 SimHash（空输入返回 0）"""
+    totals = [0] * 64
+    for feature, weight in weighted.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            totals[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit in range(64) if totals[bit] > 0)
+
+
+def distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _body(item):
+    return " ".join(str(v) for k, v in item.items() if k not in NON_BODY_FIELDS and v)
+
+
+def fingerprint(item):
+    """(标题规范化结果, 标题 SimHash, 正文 SimHash)"""
+    title = item.get('title', '')
+    return normalize(title), simhash(features(title, bigrams=False)), simhash(features(_body(item)))
+
+
+def _numbers(normalized_title):
+    return NUMBER_RE.findall(normalized_title)
+
+
+def _bands(value):
+    return [(band, value >> BAND_EDGES[band] & ((1 << (BAND_EDGES[band + 1] - BAND_EDGES[band])) - 1))
+            for band in range(BANDS)]
+
+
+class FingerprintIndex:
+    """已分析条目的指纹索引
+
+    条目 key 为 "数据源|规范化标题"：
+    {"source", "title", "title_hash", "body_hash", "comments",
+     "first_seen", "last_seen", "analyzed_on", "status"}
+    """
+
+    def __init__(self, path=FINGERPRINT_INDEX, retention_days=RETENTION_DAYS):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.entries = {}
+        self._buckets = {}
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.entries = data.get("entries", {})
+        for key, entry in self.entries.items():
+            self._index(key, int(entry["title_hash"], 16))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _index(self, key, title_hash):
+        for band in _bands(title_hash):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def match(self, source, normalized_title, title_hash):
+        """查找同一条目：先按规范化标题精确匹配，再按标题 SimHash 近似匹配（同一数据源）"""
+        key = f"{source}|{normalized_title}"
+        if key in self.entries:
+            return key
+        best, best_distance = None, TITLE_DISTANCE + 1
+        candidates = set()
+        for band in _bands(title_hash):
+            candidates |= self._buckets.get(band, set())
+        numbers = _numbers(normalized_title)
+        for candidate in candidates:
+            entry = self.entries[candidate]
+            if entry["source"] != source or _numbers(normalize(entry["title"])) != numbers:
+                continue
+            d = distance(title_hash, int(entry["title_hash"], 16))
+            if d < best_distance:
+                best, best_distance = candidate, d
+        return best
+
+    def _status(self, entry, item, body_hash):
+        before_hash = int(entry["body_hash"], 16)
+        if body_hash and (not before_hash or distance(body_hash, before_hash) > BODY_DISTANCE):
+            return "updated"
+        before, now = entry.get("comments") or 0, item.get("comments") or 0
+        if now - before >= COMMENT_GROWTH_MIN and now > before * (1 + COMMENT_GROWTH_RATIO):
+            return "updated"
+        return "repeat"
+
+    def classify(self, items, today=None):
+        """返回条目副本列表，有标题的条目增加 "status"（new / updated / repeat）；不修改索引"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        labeled = []
+        for item in items:
+            item = dict(item)
+            if not item.get('title'):
+                labeled.append(item)
+                continue
+            normalized_title, title_hash, body_hash = fingerprint(item)
+            key = self.match(item['source'], normalized_title, title_hash)
+            if key is None:
+                item["status"] = "new"
+            elif self.entries[key].get("analyzed_on") == today:
+                # 当天重跑：沿用第一次分析时的标记
+                item["status"] = self.entries[key]["status"]
+            else:
+                item["status"] = self._status(self.entries[key], item, body_hash)
+            labeled.append(item)
+        return labeled
+
+    def record(self, items, today=None):
+        """把已送入分析的条目写入索引（按 classify 的标记），删除过期条目后保存"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        for item in items:
+            if not item.get('title'):
+                continue
+            normalized_title, title_hash, body_hash = fingerprint(item)
+            key = self.match(item['source'], normalized_title, title_hash)
+            if key is not None and self.entries[key].get("analyzed_on") == today:
+                continue
+            if key is None:
+                key = f"{item['source']}|{normalized_title}"
+                self.entries[key] = {"source": item['source'], "first_seen": today}
+                self._index(key, title_hash)
+            self.entries[key].update({
+                "title": item['title'],
+                "title_hash": self.entries[key].get("title_hash") or f"{title_hash:016x}",
+                "body_hash": f"{body_hash:016x}",
+                "comments": item.get('comments') or 0,
+                "last_seen": today,
+                "analyzed_on": today,
+                "status": item.get("status", "new"),
+            })
+        self.prune(today)
+        self.save()
+
+    def touch(self, items, today=None):
+        """重复条目只更新最后出现日期（不改变指纹，避免缓慢漂移后永远匹配不上）"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        for item in items:
+            if item.get('title'):
+                normalized_title, title_hash, _ = fingerprint(item)
+                key = self.match(item['source'], normalized_title, title_hash)
+                if key is not None:
+                    self.entries[key]["last_seen"] = today
+
+    def prune(self, today=None):
+        """删除超过保留天数未再出现的条目，返回删除数"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        cutoff = (datetime.fromisoformat(today) - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        stale = [key for key, entry in self.entries.items() if entry["last_seen"] < cutoff]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._buckets = {}
+            for key, entry in self.entries.items():
+                self._index(key, int(entry["title_hash"], 16))
+        return len(stale)
+
+
+def format_counts(labeled):
+    """统计各标记的条目数"""
+    counts = {"new": 0, "updated": 0, "repeat": 0}
+    for item in labeled:
+        if "status" in item:
+            counts[item["status"]] += 1
+    return f"🔁 跨天去重：新增 {counts['new']} 条，更新 {counts['updated']} 条，重复 {counts['repeat']} 条"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="技术内容跨天近似去重索引")
+    parser.add_argument("--stats", action="store_true", help="显示索引概况")
+    parser.add_argument("--classify", metavar="FILE", help="对技术内容 JSON 列表打标记（不写入索引）")
+    args = parser.parse_args()
+
+    index = FingerprintIndex()
+    if args.classify:
+        with open(args.classify, 'r', encoding='utf-8') as f:
+            labeled = index.classify(json.load(f))
+        print(format_counts(labeled))
+        for item in labeled:
+            print(f"  [{item.get('status', '-'):<7}] [{item.get('source')}] {str(item.get('title', ''))[:60]}")
+    else:
+        by_source = {}
+        for entry in index.entries.values():
+            by_source[entry["source"]] = by_source.get(entry["source"], 0) + 1
+        print(f"🔁 {index.path}：{len(index.entries)} 条（保留 {index.retention_days} 天）")
+        for source, count in sorted(by_source.items()):
+            print(f"  {source:<28} {count:>5}")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+GitHub API - github-monitor / community-scraper 共用的 GitHub REST 访问层
+功能：
+1. 带认证的 GitHub REST 请求（走共享 HTTP 连接池）
+2. ETag / Last-Modified 条件请求缓存：
+   - 每个 URL 的校验器和响应体持久化到磁盘
+   - 请求时自动携带 If-None-Match / If-Modified-Since
+   - 返回 304 时直接使用缓存的响应体（304 不计入 GitHub 速率限制）
+3. 速率限制调度（令牌桶）：
+   - 每个响应都读取 X-RateLimit-* / Retry-After
+   - 把剩余配额均匀分配到重置前的时间窗口内，排队限速
+   - 触发主/次级速率限制（403/429）时在正确的时间点重试
+   - 统计本次运行消耗的配额（写入报告 JSON）
+4. 新鲜期内（见 response-cache 的 TTL 策略）直接使用共享响应缓存，不占用配额也不排队；
+   过期后再走条件请求，304 时重新开始新鲜期
+5. 列表接口分页迭代器：跟随 Link rel="next" 惰性产出，
+   达到调用方的数量上限或截止条件时立即停止，不再请求后续页
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    github = importlib.import_module("github-api")
+    data = github.github_api("repos/openclaw/openclaw", token=GITHUB_TOKEN)
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+retry = importlib.import_module("retry-policy")
+
+API_BASE = "https://api.github.com"
+NEXT_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# === 缓存配置 ===
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+ETAG_CACHE_DIR = Path(os.environ.get("GITHUB_ETAG_CACHE_DIR", WORKSPACE_DIR / "cache" / "github-etag"))
+
+# === 速率限制配置 ===
+RATE_BURST = 50          # 令牌桶容量（允许的突发请求数）
+RATE_RESERVE = 10        # 为其他脚本/手动操作保留的配额
+RATE_MAX_WAIT = int(os.environ.get("GITHUB_RATE_MAX_WAIT", "300"))  # 单次最长等待（秒）
+RATE_MAX_RETRIES = 3     # 触发速率限制后的最大重试次数
+SECONDARY_LIMIT_WAIT = 60  # 次级速率限制且无 Retry-After 时的等待（GitHub 建议至少 1 分钟）
+
+# 5xx / 网络错误交给统一重试引擎；429 由上面的速率限制调度器按配额重置时间处理
+RETRY_POLICY = retry.RetryPolicy(retry_statuses=retry.RETRY_STATUSES - {429})
+
+
+class ValidatorCache:
+    """按 URL 持久化 ETag / Last-Modified 及对应响应体
+
+    每个 URL 一个 JSON 文件（文件名为 URL 的 sha256），
+    写入时先写临时文件再原子替换，可在并发抓取线程间安全共用。
+    """
+
+    def __init__(self, cache_dir=ETAG_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _path(self, url):
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url):
+        """读取缓存条目，不存在或损坏时返回 None"""
+        path = self._path(url)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url, etag, last_modified, body, link=None):
+        """保存校验器和响应体（两个校验器都没有时不缓存）"""
+        if not etag and not last_modified:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "link": link,
+            "saved_at": datetime.now().isoformat()
+        }
+        path = self._path(url)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._count("stored")
+
+    def conditional_headers(self, entry):
+        """根据缓存条目生成条件请求头"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers['If-None-Match'] = entry["etag"]
+            if entry.get("last_modified"):
+                headers['If-Modified-Since'] = entry["last_modified"]
+        return headers
+
+
+_validator_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_validator_cache():
+    """获取进程内共享的 ValidatorCache"""
+    global _validator_cache
+    with _cache_lock:
+        if _validator_cache is None:
+            _validator_cache = ValidatorCache()
+        return _validator_cache
+
+
+class RateLimitExceeded(Exception):
+    """配额耗尽且等待时间超过 RATE_MAX_WAIT"""
+
+
+class RateLimitScheduler:
+    """由 X-RateLimit-* 响应头驱动的令牌桶调度器（线程安全）
+
+    - 令牌补充速率 = (剩余配额 - 保留量) / 距重置的秒数，
+      保证在重置前不会把配额用光
+    - 桶容量 RATE_BURST，小规模运行基本不会被限速
+    - 配额耗尽 / Retry-After 期间的请求排队等待
+    """
+
+    def __init__(self, burst=RATE_BURST, reserve=RATE_RESERVE, max_wait=RATE_MAX_WAIT,
+                 clock=time.time, sleep=time.sleep):
+        self.burst = burst
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.blocked_until = 0.0
+        self.tokens = float(burst)
+        self.updated = clock()
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "quota_used": 0,
+            "not_modified": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "waited_seconds": 0.0,
+        }
+
+    def _rate(self, now):
+        """当前令牌补充速率（次/秒），配额未知时返回 None（不限速）"""
+        if self.remaining is None or self.reset_at is None:
+            return None
+        if now >= self.reset_at:
+            # 已过重置时间，等下一个响应刷新配额
+            self.remaining = None
+            return None
+        usable = max(self.remaining - self.reserve, 0)
+        return usable / max(self.reset_at - now, 1.0)
+
+    def acquire(self):
+        """申请一次请求配额，必要时阻塞等待"""
+        with self._lock:
+            now = self.clock()
+            wait = max(self.blocked_until - now, 0.0)
+            rate = self._rate(now)
+            if rate is not None:
+                if rate == 0:
+                    wait = max(wait, self.reset_at - now)
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+                    self.tokens -= 1
+                    if self.tokens < 0:
+                        wait = max(wait, -self.tokens / rate)
+                # 乐观扣减，等响应头回来再校正
+                self.remaining -= 1
+            self.updated = now
+
+            if wait > self.max_wait:
+                self.stats["rate_limited"] += 1
+                reset = datetime.fromtimestamp(self.reset_at).strftime('%H:%M:%S') if self.reset_at else "?"
+                raise RateLimitExceeded(f"GitHub 配额不足，需等待 {wait:.0f}s（重置时间 {reset}）")
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += wait
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def update(self, headers, status, body=b''):
+        """根据响应头更新配额；触发速率限制时返回建议的重试等待秒数，否则返回 None"""
+        now = self.clock()
+        with self._lock:
+            remaining = headers.get('X-RateLimit-Remaining')
+            remaining = int(remaining) if remaining is not None else None
+            reset = headers.get('X-RateLimit-Reset')
+            if headers.get('X-RateLimit-Limit'):
+                self.limit = int(headers['X-RateLimit-Limit'])
+            if remaining is not None and reset is not None:
+                reset = float(reset)
+                if self.reset_at != reset or self.remaining is None:
+                    self.reset_at = reset
+                    self.remaining = remaining
+                else:
+                    # 并发响应可能乱序到达，同一窗口内取较小值
+                    self.remaining = min(self.remaining, remaining)
+
+            delay = self._limit_delay(headers, status, body, remaining, now)
+            if delay is not None:
+                # 被限流的响应没有拿到数据，不计入已用配额
+                self.stats["rate_limited"] += 1
+                self.blocked_until = max(self.blocked_until, now + delay)
+            elif status == 304:
+                self.stats["not_modified"] += 1
+            else:
+                self.stats["quota_used"] += 1
+            return delay
+
+    def _limit_delay(self, headers, status, body, remaining, now):
+        """限流响应的重试等待秒数；不是限流（含普通 403 权限错误）时返回 None"""
+        if status not in (403, 429):
+            return None
+        retry_after = retry.parse_retry_after(headers, now=now)
+        if retry_after is not None:
+            return retry_after
+        if remaining == 0 and self.reset_at:
+            return max(self.reset_at - now, 0) + 1
+        if b'rate limit' in (body or b'').lower():
+            return SECONDARY_LIMIT_WAIT
+        return None
+
+    def note_retry(self):
+        with self._lock:
+            self.stats["retries"] += 1
+
+    def summary(self):
+        """本次运行的配额使用情况（写入报告 JSON）"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": datetime.fromtimestamp(self.reset_at).isoformat() if self.reset_at else None,
+                **{k: round(v, 1) if isinstance(v, float) else v for k, v in self.stats.items()}
+            }
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """获取进程内共享的 RateLimitScheduler"""
+    global _scheduler
+    with _cache_lock:
+        if _scheduler is None:
+            _scheduler = RateLimitScheduler()
+        return _scheduler
+
+
+def build_url(endpoint, params=None):
+    """拼接 API URL 和查询参数"""
+    url = f"{API_BASE}/{endpoint}"
+    if params:
+        url += f"?{urlencode(params)}"
+    return url
+
+
+def _conditional_get(url, token=None, use_cache=True):
+    """带响应缓存、条件请求缓存和速率限制调度的 GET
+
+    Returns:
+        (解析后的 JSON, Link 响应头)；缓存命中 / 304 时两者都来自缓存
+    """
+    # 共享响应缓存在速率限制调度之前检查：新鲜的条目不申请配额
+    shared = http_client.get_response_cache() if use_cache else None
+    cached = shared.get('GET', url) if shared else None
+    if cached is not None:
+        _, header_items, body = cached
+        link = next((v for k, v in header_items if k.lower() == 'link'), None)
+        return json.loads(body.decode('utf-8')), link
+
+    headers = {'Accept': 'application/vnd.github.v3+json'}
+    if token:
+        headers['Authorization'] = f'token {token}'
+
+    cache = get_validator_cache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    headers.update(cache.conditional_headers(entry) if cache else {})
+
+    scheduler = get_scheduler()
+    for attempt in range(RATE_MAX_RETRIES + 1):
+        scheduler.acquire()
+        response = http_client.request('GET', url, headers=headers, raise_for_status=False,
+                                       retry_policy=RETRY_POLICY, use_cache=False)
+        delay = scheduler.update(response.headers, response.status, response.body)
+        if delay is None or attempt == RATE_MAX_RETRIES or delay > RATE_MAX_WAIT:
+            break
+        scheduler.note_retry()
+        print(f"⏳ 触发 GitHub 速率限制（{response.status}），{delay:.0f}s 后重试：{url}")
+
+    if delay is not None:
+        # 重试次数用完或需要等待的时间超过 RATE_MAX_WAIT：与 acquire() 一致抛出 RateLimitExceeded
+        raise RateLimitExceeded(f"GitHub 速率限制（{response.status}），需等待 {delay:.0f}s：{url}")
+
+    if response.status == 304 and entry is not None:
+        cache._count("hits")
+        if shared:
+            # 内容未变：用条件请求缓存的响应体重新填充共享缓存（开始新的新鲜期）
+            link_header = [('Link', entry["link"])] if entry.get("link") else []
+            shared.put('GET', url, 200, link_header, json.dumps(entry["body"]).encode('utf-8'))
+        return entry["body"], entry.get("link")
+
+    response.raise_for_status()
+    body = response.json()
+    link = response.headers.get('Link')
+    if cache:
+        cache._count("misses")
+        cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body, link)
+    if shared:
+        shared.put('GET', url, response.status, response.headers.items(), response.body)
+    return body, link
+
+
+def github_api(endpoint, params=None, token=None, use_cache=True):
+    """GitHub API 请求（带认证，ETag / Last-Modified 条件请求，速率限制调度）
+
+    Returns:
+        解析后的 JSON；304 时返回缓存的响应体
+    Raises:
+        RateLimitExceeded / http_client.HTTPError 等（由调用方决定如何降级）
+    """
+    body, _ = _conditional_get(build_url(endpoint, params), token, use_cache)
+    return body
+
+
+def github_paginate(endpoint, params=None, token=None, limit=None, stop=None):
+    """分页遍历 GitHub 列表接口（惰性生成器）
+
+    跟随 Link: rel="next" 逐页请求，每页都走条件请求缓存和速率限制调度。
+    调用方 break / 达到 limit / stop(item) 为真时立即结束，不会请求后续页。
+
+    Args:
+        endpoint: 列表接口，如 "repos/openclaw/openclaw/issues"
+        params: 查询参数（per_page 默认 100）
+        limit: 最多产出的条目数
+        stop: 截止条件 stop(item) -> bool，为真时停止（该条目不产出）
+    """
+    params = dict(params or {})
+    params.setdefault("per_page", 100)
+    url = build_url(endpoint, params)
+    count = 0
+
+    while url:
+        items, link = _conditional_get(url, token)
+        for item in items or []:
+            if stop and stop(item):
+                return
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        match = NEXT_LINK_RE.search(link or '')
+        url = match.group(1) if match else None
+
+
+def older_than(field, cutoff):
+    """生成日期截止条件：item[field] 早于 cutoff（ISO 字符串比较）时停止"""
+    return lambda item: (item.get(field) or '') < cutoff
+
+
+def rate_limit_summary():
+    """本次运行的 GitHub 配额使用情况"""
+    return get_scheduler().summary()
+
+
+def format_cache_stats():
+    """格式化条件请求缓存统计"""
+    stats = get_validator_cache().stats
+    return f"♻️  条件请求：304 命中 {stats['hits']} 次，完整下载 {stats['misses']} 次"
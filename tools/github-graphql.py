@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+GitHub GraphQL - 批量采集后端
+功能：
+1. 一次 GraphQL 查询采集多个仓库的 Releases / 热门 Issues / Discussions / Star·Fork 统计
+2. 仓库较多时按批分页（每批 GRAPHQL_BATCH_SIZE 个仓库一次查询）
+3. 输出结构与 github-monitor 的 report["repos"] 字段一致（tech-analyzer 无需改动）
+4. 内置本地替身服务器，便于离线测试
+
+用法：
+    # 离线替身服务器
+    python3 github-graphql.py --stub 8765
+    GITHUB_GRAPHQL_URL=http://127.0.0.1:8765/graphql \\
+    GITHUB_MONITOR_BACKEND=graphql python3 github-monitor.py
+"""
+
+import importlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+classifier = importlib.import_module("release-classifier")
+
+GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+GRAPHQL_BATCH_SIZE = 20
+
+REPO_FRAGMENT = """
+    %(alias)s: repository(owner: $o%(i)d, name: $n%(i)d) {
+      nameWithOwner
+      stargazerCount
+      forkCount
+      updatedAt
+      openIssues: issues(states: OPEN) { totalCount }
+      openPulls: pullRequests(states: OPEN) { totalCount }
+      releases(first: $releaseLimit, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { tagName name publishedAt description url }
+      }
+      hotIssues: issues(first: $topicLimit, filterBy: {since: $since},
+                        orderBy: {field: COMMENTS, direction: DESC}) {
+        nodes {
+          title number createdAt url
+          comments { totalCount }
+          labels(first: 10) { nodes { name } }
+        }
+      }
+      discussions(first: $discussionLimit, orderBy: {field: UPDATED_AT, direction: DESC}) {
+        nodes { title number createdAt url comments { totalCount } }
+      }
+    }"""
+
+
+def build_query(count):
+    """生成覆盖 count 个仓库的查询（仓库用别名 r0..rN 区分）"""
+    var_defs = ["$since: DateTime!", "$releaseLimit: Int!", "$topicLimit: Int!", "$discussionLimit: Int!"]
+    fragments = []
+    for i in range(count):
+        var_defs.append(f"$o{i}: String!")
+        var_defs.append(f"$n{i}: String!")
+        fragments.append(REPO_FRAGMENT % {"alias": f"r{i}", "i": i})
+    return (
+        f"query({', '.join(var_defs)}) {{\n"
+        "  rateLimit { cost remaining resetAt }"
+        + "".join(fragments)
+        + "\n}"
+    )
+
+
+def graphql_request(query, variables, token=None):
+    """发送 GraphQL 请求，返回 data（整体失败时抛异常）"""
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers['Authorization'] = f'bearer {token}'
+    result = http_client.request_json('POST', GRAPHQL_URL, headers=headers,
+                                      data={"query": query, "variables": variables})
+    if result.get("errors") and not result.get("data"):
+        raise RuntimeError(f"GraphQL 错误：{result['errors'][0].get('message', result['errors'])}")
+    for err in result.get("errors", []):
+        print(f"⚠️  GraphQL 部分失败：{err.get('message', err)}")
+    return result.get("data") or {}
+
+
+def to_report_repo(repo, node):
+    """将 GraphQL repository 节点转换为 report["repos"][key] 结构"""
+    if not node:
+        return {"name": repo, "releases": [], "trending_topics": [], "discussions": [], "stars": None}
+
+    releases = [{
+        "tag": rel.get('tagName') or '',
+        "name": rel.get('name') or '',
+        "published_at": (rel.get('publishedAt') or '')[:10],
+        "body": (rel.get('description') or '')[:500],  # 与 REST 保持一致，截取前 500 字
+        "url": rel.get('url') or '',
+        "categories": classifier.classify_notes(rel.get('description') or '')
+    } for rel in node["releases"]["nodes"]]
+
+    topics = [{
+        "title": issue.get('title', ''),
+        "number": issue.get('number', ''),
+        "comments": issue["comments"]["totalCount"],
+        "created_at": (issue.get('createdAt') or '')[:10],
+        "url": issue.get('url', ''),
+        "labels": [l.get('name', '') for l in issue["labels"]["nodes"]]
+    } for issue in node["hotIssues"]["nodes"]]
+
+    discussions = [{
+        "title": d.get('title', ''),
+        "number": d.get('number', ''),
+        "comments": d["comments"]["totalCount"],
+        "created_at": (d.get('createdAt') or '')[:10],
+        "url": d.get('url', '')
+    } for d in (node.get("discussions") or {}).get("nodes", [])]
+
+    return {
+        "name": repo,
+        "releases": releases,
+        "trending_topics": topics,
+        "discussions": discussions,
+        "stars": {
+            "stars": node.get('stargazerCount', 0),
+            "forks": node.get('forkCount', 0),
+            # REST 的 open_issues_count 包含 PR，这里保持同样口径
+            "open_issues": node["openIssues"]["totalCount"] + node["openPulls"]["totalCount"],
+            "updated_at": (node.get('updatedAt') or '')[:10]
+        }
+    }
+
+
+def collect_repos(repos, token=None, since_days=7, release_limit=5, topic_limit=10,
+                  discussion_limit=5, batch_size=GRAPHQL_BATCH_SIZE):
+    """批量采集多个仓库
+
+    Args:
+        repos: {key: "owner/name"}
+    Returns:
+        ({key: report_repo_dict}, rate_limit)，rate_limit 为最后一批返回的 rateLimit；
+        响应中缺失的仓库（不存在 / 无权限）不出现在结果中
+    """
+    since = (datetime.now() - timedelta(days=since_days)).strftime('%Y-%m-%dT00:00:00Z')
+    items = list(repos.items())
+    collected = {}
+    rate_limit = None
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        variables = {
+            "since": since,
+            "releaseLimit": release_limit,
+            "topicLimit": topic_limit,
+            "discussionLimit": discussion_limit,
+        }
+        for i, (_, repo) in enumerate(batch):
+            owner, _, name = repo.partition('/')
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        data = graphql_request(build_query(len(batch)), variables, token=token)
+        rate_limit = data.get("rateLimit") or rate_limit
+        for i, (key, repo) in enumerate(batch):
+            node = data.get(f"r{i}")
+            if node is None:
+                # 仓库不存在 / 无权限：该别名为 null（错误已在 graphql_request 中打印），由调用方按仓库降级
+                continue
+            collected[key] = to_report_repo(repo, node)
+
+    return collected, rate_limit
+
+
+# ==================== 本地替身服务器 ====================
+
+def stub_repository(owner, name, since):
+    """为替身服务器生成确定性的仓库数据"""
+    seed = sum(ord(c) for c in f"{owner}/{name}")
+    base = f"https://github.com/{owner}/{name}"
+    return {
+        "nameWithOwner": f"{owner}/{name}",
+        "stargazerCount": 1000 + seed,
+        "forkCount": 100 + seed % 97,
+        "updatedAt": since,
+        "openIssues": {"totalCount": seed % 50},
+        "openPulls": {"totalCount": seed % 7},
+        "releases": {"nodes": [{
+            "tagName": f"v1.{n}.0",
+            "name": f"Release 1.{n}.0",
+            "publishedAt": since,
+            "description": f"- fix: security hardening for sandbox ({n})\n- perf: faster startup",
+            "url": f"{base}/releases/tag/v1.{n}.0"
+        } for n in (2, 1, 0)]},
+        "hotIssues": {"nodes": [{
+            "title": f"Stub issue {n}",
+            "number": n,
+            "createdAt": since,
+            "url": f"{base}/issues/{n}",
+            "comments": {"totalCount": 10 - n},
+            "labels": {"nodes": [{"name": "enhancement"}]}
+        } for n in range(1, 4)]},
+        "discussions": {"nodes": [{
+            "title": "Stub discussion",
+            "number": 1,
+            "createdAt": since,
+            "url": f"{base}/discussions/1",
+            "comments": {"totalCount": 4}
+        }]}
+    }
+
+
+def make_stub_server(port=0):
+    """创建 GraphQL 替身服务器（只识别本模块生成的查询结构，调用方负责 serve_forever）
+
+    仓库名以 "missing" 开头时返回 null 并附带 NOT_FOUND 错误，模拟不存在 / 无权限的仓库。
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            variables = request.get("variables", {})
+            data = {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": variables.get("since")}}
+            errors = []
+            for i in sorted(int(m) for m in re.findall(r"\$o(\d+):", request.get("query", ""))):
+                owner, name = variables[f"o{i}"], variables[f"n{i}"]
+                if name.startswith("missing"):
+                    data[f"r{i}"] = None
+                    errors.append({"type": "NOT_FOUND", "path": [f"r{i}"],
+                                   "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                    continue
+                data[f"r{i}"] = stub_repository(owner, name, variables["since"])
+            result = {"data": data}
+            if errors:
+                result["errors"] = errors
+            body = json.dumps(result).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+
+
+def run_stub_server(port):
+    """启动 GraphQL 替身服务器（阻塞直到 Ctrl-C）"""
+    server = make_stub_server(port)
+    print(f"🧪 GraphQL 替身服务器：http://127.0.0.1:{server.server_port}/graphql")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub GraphQL 批量采集")
+    parser.add_argument("--stub", type=int, metavar="PORT", help="启动本地替身服务器")
+    parser.add_argument("repos", nargs="*", help="要采集的仓库 (owner/name)")
+    args = parser.parse_args()
+
+    if args.stub is not None:
+        run_stub_server(args.stub)
+    elif args.repos:
+        result, rate = collect_repos({r: r for r in args.repos}, token=os.environ.get("GITHUB_TOKEN"))
+        print(json.dumps({"repos": result, "rate_limit": rate}, ensure_ascii=False, indent=2))
+    else:
+        parser.print_help()
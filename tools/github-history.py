@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+GitHub History - Releases / Issues 增量同步与本地历史
+功能：
+1. 每个仓库持久化游标：最后见到的 release id、issues 的最大 updated_at
+2. 增量模式只请求比游标更新的数据，并合并进本地历史
+3. 周报 / 月报可直接从本地历史读取任意时间段的数据，无需重新抓取
+
+存储：history/github/<owner>__<name>/{releases,issues}.json
+（releases 与 issues 分开存放，同一仓库的两个同步任务可以并发执行）
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+HISTORY_DIR = Path(os.environ.get("GITHUB_HISTORY_DIR", WORKSPACE_DIR / "history" / "github"))
+
+RELEASE_PAGE_SIZE = 30   # 保持固定，使请求 URL 不变，可命中 ETag 缓存
+INITIAL_RELEASE_LIMIT = 30
+ISSUE_PAGE_SIZE = 100
+INITIAL_ISSUE_WINDOW_DAYS = 7
+
+
+def repo_dir(repo, history_dir=None):
+    return Path(history_dir or HISTORY_DIR) / repo.replace('/', '__')
+
+
+class HistoryStore:
+    """单个仓库单类数据（releases / issues）的本地历史和同步游标"""
+
+    def __init__(self, repo, kind, history_dir=None):
+        self.repo = repo
+        self.kind = kind
+        self.path = repo_dir(repo, history_dir) / f"{kind}.json"
+        self.cursor = None
+        self.items = {}
+        self.synced_at = None
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.cursor = data.get("cursor")
+        self.items = data.get("items", {})
+        self.synced_at = data.get("synced_at")
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "repo": self.repo,
+            "kind": self.kind,
+            "cursor": self.cursor,
+            "synced_at": self.synced_at,
+            "items": self.items,
+        }
+        tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def merge(self, items, key):
+        """合并新数据（按 key 覆盖），返回新增 / 更新的条目数"""
+        changed = 0
+        for item in items:
+            k = str(item[key])
+            if self.items.get(k) != item:
+                self.items[k] = item
+                changed += 1
+        self.synced_at = datetime.now().isoformat()
+        return changed
+
+
+def normalize_release(rel):
+    return {
+        "id": rel.get('id', 0),
+        "tag": rel.get('tag_name', ''),
+        "name": rel.get('name') or '',
+        "published_at": rel.get('published_at') or '',
+        "body": rel.get('body') or '',  # 保留完整 release notes
+        "url": rel.get('html_url', '')
+    }
+
+
+def normalize_issue(issue):
+    return {
+        "number": issue.get('number', 0),
+        "title": issue.get('title', ''),
+        "state": issue.get('state', ''),
+        "comments": issue.get('comments', 0),
+        "created_at": issue.get('created_at') or '',
+        "updated_at": issue.get('updated_at') or '',
+        "url": issue.get('html_url', ''),
+        "labels": [l.get('name', '') for l in issue.get('labels', [])]
+    }
+
+
+def sync_releases(repo, paginate, history_dir=None):
+    """增量同步 Releases
+
+    GitHub releases 接口没有 since 参数，列表按创建时间倒序：
+    逐页读取直到遇到 id 不大于游标的条目为止（首次同步最多读 INITIAL_RELEASE_LIMIT 个）。
+    第一页大小固定，内容不变时命中 ETag 返回 304。
+
+    Args:
+        paginate: github_paginate(endpoint, params, limit=None, stop=None) 形式的分页函数，
+                  请求失败时必须抛出异常（不能静默结束），否则无法区分完整扫描和部分扫描
+    Returns:
+        (新增条目数, HistoryStore)
+    Raises:
+        分页过程中的异常：已取到的条目照常保存，但游标不前移
+    """
+    store = HistoryStore(repo, "releases", history_dir)
+    last_id = store.cursor or 0
+    new = []
+    try:
+        for rel in paginate(
+            f"repos/{repo}/releases", {"per_page": RELEASE_PAGE_SIZE},
+            limit=None if last_id else INITIAL_RELEASE_LIMIT,
+            stop=lambda rel: rel.get('id', 0) <= last_id
+        ):
+            new.append(normalize_release(rel))
+    except Exception:
+        # 部分扫描：列表按时间倒序，中断处之后（更早）的 release 还没读到，
+        # 游标前移会永久漏掉它们；保持旧游标，下次从第一页重新扫描到旧游标为止
+        store.merge(new, "id")
+        store.save()
+        raise
+    changed = store.merge(new, "id")
+    if new:
+        store.cursor = max([last_id] + [rel["id"] for rel in new])
+    store.save()
+    return changed, store
+
+
+def sync_issues(repo, paginate, history_dir=None):
+    """增量同步 Issues（since = 上次同步到的最大 updated_at，按更新时间升序翻完所有页）
+
+    Returns:
+        (新增 / 更新条目数, HistoryStore)
+    Raises:
+        分页过程中的异常：按更新时间升序读取，已取到的条目连同游标一起保存（游标之前的都已读到）
+    """
+    store = HistoryStore(repo, "issues", history_dir)
+    since = store.cursor or (
+        datetime.now() - timedelta(days=INITIAL_ISSUE_WINDOW_DAYS)
+    ).strftime('%Y-%m-%dT00:00:00Z')
+    issues = []
+    try:
+        for issue in paginate(f"repos/{repo}/issues", {
+            "state": "all",
+            "since": since,
+            "per_page": ISSUE_PAGE_SIZE,
+            "sort": "updated",
+            "direction": "asc"
+        }):
+            # 跳过 PR（PR 也是 issue）
+            if 'pull_request' not in issue:
+                issues.append(normalize_issue(issue))
+    finally:
+        changed = store.merge(issues, "number")
+        updated = [i["updated_at"] for i in issues if i["updated_at"]]
+        if updated:
+            store.cursor = max([store.cursor or ''] + updated)
+        store.save()
+    return changed, store
+
+
+def latest_releases(store, limit=5):
+    """从历史中取最新的 limit 个 release（按发布时间倒序）"""
+    releases = sorted(store.items.values(), key=lambda r: (r["published_at"], r["id"]), reverse=True)
+    return releases[:limit]
+
+
+def hot_issues(store, days=7, limit=10):
+    """从历史中取最近 days 天内有更新、评论最多的 issues"""
+    cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    recent = [i for i in store.items.values() if i["updated_at"][:10] >= cutoff]
+    recent.sort(key=lambda i: i["comments"], reverse=True)
+    return recent[:limit]
+
+
+# ==================== 周报 / 月报读取接口 ====================
+
+def list_repos(history_dir=None):
+    """列出有本地历史的仓库"""
+    root = Path(history_dir or HISTORY_DIR)
+    if not root.exists():
+        return []
+    return sorted(p.name.replace('__', '/') for p in root.iterdir() if p.is_dir())
+
+
+def activity_in_range(start_date, end_date, history_dir=None):
+    """汇总日期范围内（含首尾，YYYY-MM-DD）的 GitHub 活动
+
+    Returns:
+        {repo: {"releases": [...], "issues": [...]}}，只包含有活动的仓库
+    """
+    activity = {}
+    for repo in list_repos(history_dir):
+        releases = [
+            r for r in HistoryStore(repo, "releases", history_dir).items.values()
+            if start_date <= r["published_at"][:10] <= end_date
+        ]
+        issues = [
+            i for i in HistoryStore(repo, "issues", history_dir).items.values()
+            if start_date <= i["updated_at"][:10] <= end_date
+        ]
+        if releases or issues:
+            releases.sort(key=lambda r: r["published_at"], reverse=True)
+            issues.sort(key=lambda i: i["comments"], reverse=True)
+            activity[repo] = {"releases": releases, "issues": issues}
+    return activity
+
+
+def format_activity(activity, max_issues=10):
+    """把 activity_in_range 的结果格式化为 LLM 提示词片段"""
+    lines = []
+    for repo, data in activity.items():
+        lines.append(f"### {repo}")
+        for rel in data["releases"]:
+            name = f": {rel['name']}" if rel['name'] else ""
+            lines.append(f"- Release {rel['tag']} ({rel['published_at'][:10]}){name}")
+        for issue in data["issues"][:max_issues]:
+            lines.append(f"- Issue #{issue['number']} {issue['title']} ({issue['comments']} 评论)")
+    return '\n'.join(lines)
@@ -13,36 +13,29 @@ GitHub Monitor - OpenClaw GitHub 动态监控
 - 超时限制防止 hangs
 """
 
-import urllib.request
+import importlib
 import json
-import ssl
 import os
-import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# 共享 HTTP 客户端 / GitHub 访问层（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+github = importlib.import_module("github-api")
+github_graphql = importlib.import_module("github-graphql")
+history = importlib.import_module("github-history")
+classifier = importlib.import_module("release-classifier")
+timeseries = importlib.import_module("github-timeseries")
+injection = importlib.import_module("injection-scanner")
+
 # ==================== 安全机制 ====================
 
-def detect_injection(content: str) -> bool:
-    """检测潜在的提示词注入模式"""
-    patterns = [
-        r"ignore\s+previous\s+instructions",
-        r"disregard\s+all",
-        r"you\s+are\s+now",
-        r"bypass\s+safety",
-        r"execute\s+this\s+command",
-        r"system\s+prompt",
-    ]
-    lower_content = content.lower()
-    for pattern in patterns:
-        if re.search(pattern, lower_content):
-            print(f"⚠️  检测到潜在的提示词注入模式")
-            return True
-    return False
-
-def safe_process_text(text: str) -> str:
-    """安全处理文本内容"""
-    if detect_injection(text):
+def safe_process_text(text: str, source: str = None) -> str:
+    """安全处理文本内容（共享注入扫描器，命中时打印模式和偏移）"""
+    if injection.detect_injection(text or '', source):
         # 记录警告但继续处理（仅作为数据）
         pass
     return text
@@ -53,32 +46,60 @@ GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 if not GITHUB_TOKEN:
     raise EnvironmentError("GITHUB_TOKEN 环境变量未设置")
 
-REPOS = {
-    "main": "openclaw/openclaw",
-    "awesome": "SamurAIGPT/awesome-openclaw",
-    "skills": "openclaw/skills",
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
+OUTPUT_DIR = WORKSPACE_DIR / "logs" / "github-monitor"
+REPO_REPORT_DIR = OUTPUT_DIR / "repos"
+
+# 监控的仓库清单（key → 仓库 + 抓取档位），可通过环境变量指向其他配置文件
+REPOS_CONFIG = Path(os.environ.get("GITHUB_MONITOR_CONFIG", SKILL_DIR / "config" / "repos.json"))
+
+# 配置文件缺失时的默认清单
+DEFAULT_REPOS_CONFIG = {
+    "primary": "main",
+    "repos": {
+        "main": {"repo": "openclaw/openclaw", "profile": "full"},
+        "awesome": {"repo": "SamurAIGPT/awesome-openclaw", "profile": "stars"},
+        "skills": {"repo": "openclaw/skills", "profile": "stars"},
+    },
 }
-OUTPUT_DIR = Path("/home/writer/.openclaw/workspace/logs/github-monitor")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# 抓取档位：档位名 → 需要抓取的 report 字段（配置文件中的 profiles 可覆盖 / 追加）
+DEFAULT_PROFILES = {
+    "full": ["releases", "trending_topics", "stars"],
+    "releases": ["releases", "stars"],
+    "issues": ["trending_topics", "stars"],
+    "stars": ["stars"],
+}
+
+# 并发抓取线程数（设为 1 即退化为顺序抓取）
+FETCH_WORKERS = int(os.environ.get("GITHUB_MONITOR_WORKERS", "8"))
+
+# 采集后端：rest（默认，每仓库多次 REST 调用）/ graphql（所有仓库批量一次查询）
+FETCH_BACKEND = os.environ.get("GITHUB_MONITOR_BACKEND", "rest")
+
+# 增量同步：只请求游标之后的新 Releases / Issues，并合并进本地历史
+INCREMENTAL_SYNC = os.environ.get("GITHUB_MONITOR_INCREMENTAL", "0") == "1"
 
 def github_api(endpoint, params=None):
-    """GitHub API 请求（带认证）"""
-    url = f"https://api.github.com/{endpoint}"
-    req = urllib.request.Request(url)
-    req.add_header('Authorization', f'token {GITHUB_TOKEN}')
-    req.add_header('Accept', 'application/vnd.github.v3+json')
-    if params:
-        query = '&'.join([f"{k}={v}" for k, v in params.items()])
-        url += f"?{query}"
-    
-    ctx = ssl.create_default_context()
+    """GitHub API 请求（带认证，ETag 条件请求缓存）"""
     try:
-        response = urllib.request.urlopen(req, context=ctx, timeout=15)
-        return json.load(response)
+        return github.github_api(endpoint, params, token=GITHUB_TOKEN)
     except Exception as e:
         print(f"❌ API 请求失败：{e}")
         return None
 
+def github_paginate(endpoint, params=None, limit=None, stop=None):
+    """分页遍历 GitHub 列表接口（惰性生成器，失败时提前结束）"""
+    try:
+        yield from github.github_paginate(endpoint, params, token=GITHUB_TOKEN, limit=limit, stop=stop)
+    except Exception as e:
+        print(f"❌ API 请求失败：{e}")
+
+def github_paginate_strict(endpoint, params=None, limit=None, stop=None):
+    """分页遍历，失败时抛出异常（增量同步据此判断是否完整扫描，决定游标能否前移）"""
+    return github.github_paginate(endpoint, params, token=GITHUB_TOKEN, limit=limit, stop=stop)
+
 def fetch_releases(repo, limit=5):
     """获取 Releases"""
     data = github_api(f"repos/{repo}/releases", {"per_page": limit})
@@ -92,26 +113,25 @@ def fetch_releases(repo, limit=5):
             "name": rel.get('name', ''),
             "published_at": rel.get('published_at', '')[:10],
             "body": rel.get('body', '')[:500],  # 截取前 500 字
-            "url": rel.get('html_url', '')
+            "url": rel.get('html_url', ''),
+            "categories": classifier.classify_notes(rel.get('body', ''))  # 基于完整 notes 分类
         })
     return releases
 
-def fetch_trending_topics(repo):
+def fetch_trending_topics(repo, limit=10):
     """获取热门 Issues/Discussions"""
-    # 获取最近 7 天的热门 issues
-    since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    data = github_api(f"repos/{repo}/issues", {
+    # 获取最近 7 天的热门 issues（按评论数排序，凑满 limit 个非 PR 即停止翻页）
+    since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%dT00:00:00Z')
+    issues = github_paginate(f"repos/{repo}/issues", {
         "state": "all",
         "since": since,
-        "per_page": 10,
+        "per_page": 30,
         "sort": "comments",
         "direction": "desc"
     })
-    if not data:
-        return []
     
     topics = []
-    for issue in data[:10]:
+    for issue in issues:
         # 跳过 PR（PR 也是 issue）
         if 'pull_request' in issue:
             continue
@@ -124,6 +144,8 @@ def fetch_trending_topics(repo):
             "url": issue.get('html_url', ''),
             "labels": [l.get('name', '') for l in issue.get('labels', [])]
         })
+        if len(topics) >= limit:
+            break
     return topics
 
 def fetch_stars_trend(repo):
@@ -139,21 +161,211 @@ def fetch_stars_trend(repo):
         "updated_at": data.get('updated_at', '')[:10]
     }
 
-def analyze_security_fixes(releases):
-    """分析安全修复"""
-    security_mentions = []
+def fetch_releases_incremental(repo, limit=5):
+    """增量同步 Releases，返回本地历史中最新的 limit 个"""
+    try:
+        changed, store = history.sync_releases(repo, github_paginate_strict)
+        print(f"    🔄 {repo}: 新增 {changed} 个 Release（历史共 {len(store.items)} 个）")
+    except Exception as e:
+        # 同步中断：游标保持不变，下次重新扫描；本次使用本地历史
+        print(f"❌ {repo} Release 同步中断，使用本地历史：{e}")
+        store = history.HistoryStore(repo, "releases")
+    return [{
+        "tag": rel["tag"],
+        "name": rel["name"],
+        "published_at": rel["published_at"][:10],
+        "body": rel["body"][:500],  # 截取前 500 字
+        "url": rel["url"],
+        "categories": classifier.classify_notes(rel["body"])
+    } for rel in history.latest_releases(store, limit)]
+
+def fetch_trending_topics_incremental(repo):
+    """增量同步 Issues，从本地历史中取最近 7 天评论最多的话题"""
+    try:
+        changed, store = history.sync_issues(repo, github_paginate_strict)
+        print(f"    🔄 {repo}: 新增/更新 {changed} 个 Issue（历史共 {len(store.items)} 个）")
+    except Exception as e:
+        print(f"❌ {repo} Issue 同步中断，使用本地历史：{e}")
+        store = history.HistoryStore(repo, "issues")
+    return [{
+        "title": issue["title"],
+        "number": issue["number"],
+        "comments": issue["comments"],
+        "created_at": issue["created_at"][:10],
+        "url": issue["url"],
+        "labels": issue["labels"]
+    } for issue in history.hot_issues(store, days=7, limit=10)]
+
+def collect_release_lines(releases, categories, limit=10):
+    """从 releases 的分类结果中收集指定类别的行（同一行只收一次）"""
+    mentions = []
     for rel in releases:
-        body = rel.get('body', '').lower()
-        if 'security' in body or 'vulnerability' in body or 'fix' in body:
-            # 提取安全相关的修复
-            lines = rel.get('body', '').split('\n')
-            for line in lines:
-                if 'security' in line.lower() or 'fix' in line.lower():
-                    security_mentions.append({
-                        "release": rel['tag'],
-                        "content": line.strip()[:200]
-                    })
-    return security_mentions[:10]  # 最多 10 条
+        # GraphQL / 旧报告中的 release 可能没有分类结果，退回到截断后的 body
+        by_category = rel.get('categories')
+        if by_category is None:
+            by_category = classifier.classify_notes(rel.get('body', ''))
+        seen = set()
+        for category in categories:
+            for line in by_category.get(category, []):
+                if line not in seen:
+                    seen.add(line)
+                    mentions.append({"release": rel['tag'], "content": line})
+    return mentions[:limit]
+
+def analyze_security_fixes(releases):
+    """分析安全修复（安全关键词 + CVE/GHSA 编号）"""
+    return collect_release_lines(releases, ("cve", "security"))
+
+def analyze_breaking_changes(releases):
+    """分析破坏性变更与废弃通知"""
+    return collect_release_lines(releases, ("breaking", "deprecation"))
+
+# report 字段 → 抓取函数
+FETCHERS = {
+    "releases": fetch_releases_incremental if INCREMENTAL_SYNC else fetch_releases,
+    "trending_topics": fetch_trending_topics_incremental if INCREMENTAL_SYNC else fetch_trending_topics,
+    "stars": fetch_stars_trend,
+}
+
+def load_repo_config(path=REPOS_CONFIG):
+    """读取仓库清单配置
+
+    配置格式：
+        {"primary": "main",
+         "profiles": {"档位名": ["releases", "stars", ...]},
+         "repos": {"key": {"repo": "owner/name", "profile": "档位名"} 或 "owner/name"}}
+
+    Returns:
+        (REPOS {key: "owner/name"}, FETCH_PLAN {key: {field: fn}}, primary key)
+    """
+    config = DEFAULT_REPOS_CONFIG
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+    profiles = {**DEFAULT_PROFILES, **config.get("profiles", {})}
+    repos = {}
+    plan = {}
+    for key, entry in config.get("repos", {}).items():
+        if isinstance(entry, str):
+            entry = {"repo": entry}
+        profile = entry.get("profile", "stars")
+        if profile not in profiles:
+            raise ValueError(f"仓库 {key} 使用了未定义的抓取档位：{profile}")
+        unknown = [field for field in profiles[profile] if field not in FETCHERS]
+        if unknown:
+            raise ValueError(f"抓取档位 {profile} 包含未知字段：{', '.join(unknown)}")
+        repos[key] = entry["repo"]
+        plan[key] = {field: FETCHERS[field] for field in profiles[profile]}
+    return repos, plan, config.get("primary", "main")
+
+REPOS, FETCH_PLAN, PRIMARY_REPO = load_repo_config()
+
+def fetch_all(plan, max_workers=FETCH_WORKERS):
+    """并发抓取 plan 中所有仓库的全部数据
+
+    所有请求同时发出（受线程池大小限制），总耗时取决于最慢的单个请求，
+    而不是所有请求耗时之和。
+
+    Returns:
+        {repo_key: {field: result}}，结构与 plan 一致
+    """
+    jobs = [(key, field, fn) for key, fields in plan.items() for field, fn in fields.items()]
+    results = {key: {} for key in plan}
+    if not jobs:
+        return results
+
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fn, REPOS[key]): (key, field)
+            for key, field, fn in jobs
+        }
+        for future, (key, field) in futures.items():
+            try:
+                results[key][field] = future.result()
+            except Exception as e:
+                # 单个仓库失败不影响其他仓库
+                print(f"❌ {REPOS[key]} {field} 抓取失败：{e}")
+                results[key][field] = None
+    return results
+
+def fetch_all_graphql(plan):
+    """GraphQL 批量抓取 plan 中的所有仓库，失败时返回 None（由调用方降级到 REST）
+
+    Returns:
+        与 fetch_all 相同的结构，另外每个仓库附带 "discussions"
+    """
+    try:
+        collected, rate_limit = github_graphql.collect_repos(
+            {key: REPOS[key] for key in plan}, token=GITHUB_TOKEN
+        )
+    except Exception as e:
+        print(f"❌ GraphQL 请求失败：{e}")
+        return None
+
+    if rate_limit:
+        print(f"  📉 GraphQL 配额：本次消耗 {rate_limit.get('cost')}，剩余 {rate_limit.get('remaining')}")
+    results = {}
+    for key, fields in plan.items():
+        repo_data = collected.get(key)
+        if repo_data is None:
+            # 与 REST 路径一致：单个仓库失败时各字段为 None，不影响其他仓库
+            print(f"❌ {REPOS[key]} GraphQL 响应中缺失（仓库不存在或无权限）")
+            repo_data = {}
+        results[key] = {field: repo_data.get(field) for field in list(fields) + ["discussions"]}
+    return results
+
+# 列表字段：抓取失败（None）时在报告中统一为 []，下游可以直接迭代
+LIST_FIELDS = ("releases", "trending_topics", "discussions")
+
+def build_repo_report(key, fields):
+    """单个仓库的报告：抓取结果 + Release 分类 + 7 天 Star 趋势"""
+    repo_report = {"name": REPOS[key], **fields}
+    for field in LIST_FIELDS:
+        if field in fields:
+            repo_report[field] = fields[field] or []
+    if "releases" in fields:
+        releases = repo_report["releases"]
+        repo_report["security_fixes"] = analyze_security_fixes(releases)
+        repo_report["breaking_changes"] = analyze_breaking_changes(releases)
+        for rel in releases:
+            safe_process_text(rel.get("body"), f"{REPOS[key]} {rel.get('tag', '')}")
+    for topic in repo_report.get("trending_topics", []):
+        safe_process_text(topic.get("title"), f"{REPOS[key]}#{topic.get('number', '')}")
+    if fields.get("stars"):
+        repo_report["stars_trend_7d"] = timeseries.TimeSeries(REPOS[key]).growth_rate(
+            "stars", datetime.now() - timedelta(days=7), datetime.now()
+        )
+    return repo_report
+
+def summarize_ecosystem(repos):
+    """汇总所有仓库的概览（按 7 天 Star 增量排序）"""
+    rows = []
+    for key, data in repos.items():
+        stars = data.get("stars") or {}
+        trend = data.get("stars_trend_7d") or {}
+        releases = data.get("releases") or []
+        rows.append({
+            "key": key,
+            "name": data["name"],
+            "stars": stars.get("stars"),
+            "stars_delta_7d": trend.get("delta"),
+            "latest_release": releases[0]["tag"] if releases else None,
+            "latest_release_date": releases[0]["published_at"] if releases else None,
+            "security_fixes": len(data.get("security_fixes") or []),
+            "breaking_changes": len(data.get("breaking_changes") or []),
+        })
+    rows.sort(key=lambda r: (r["stars_delta_7d"] or 0, r["stars"] or 0), reverse=True)
+    return rows
+
+def save_repo_reports(repos, date_stamp):
+    """每个仓库单独保存一份报告：repos/<owner>__<name>-YYYYMMDD.json"""
+    REPO_REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    for data in repos.values():
+        path = REPO_REPORT_DIR / f"{data['name'].replace('/', '__')}-{date_stamp}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
 def generate_report():
     """生成监控报告"""
@@ -161,34 +373,34 @@ def generate_report():
     
     report = {
         "generated_at": datetime.now().isoformat(),
+        "primary": PRIMARY_REPO,
         "repos": {}
     }
     
-    # 监控主仓库
-    print(f"  📦 抓取 {REPOS['main']}...")
-    main_releases = fetch_releases(REPOS['main'])
-    main_topics = fetch_trending_topics(REPOS['main'])
-    main_stars = fetch_stars_trend(REPOS['main'])
+    print(f"  📦 抓取 {len(FETCH_PLAN)} 个仓库（{FETCH_BACKEND}，并发 {FETCH_WORKERS}）...")
+    fetched = None
+    if FETCH_BACKEND == "graphql":
+        fetched = fetch_all_graphql(FETCH_PLAN)
+        if fetched is None:
+            print("  ⚠️  GraphQL 失败，降级为 REST 抓取")
+    if fetched is None:
+        fetched = fetch_all(FETCH_PLAN)
     
-    report["repos"]["main"] = {
-        "name": REPOS['main'],
-        "releases": main_releases,
-        "trending_topics": main_topics,
-        "stars": main_stars,
-        "security_fixes": analyze_security_fixes(main_releases)
-    }
+    # Star / Fork / Issue 计数追加到时间序列
+    for key, fields in fetched.items():
+        if fields.get("stars"):
+            timeseries.record_snapshot(REPOS[key], fields["stars"])
     
-    # 监控 awesome-openclaw
-    print(f"  📦 抓取 {REPOS['awesome']}...")
-    awesome_stars = fetch_stars_trend(REPOS['awesome'])
-    report["repos"]["awesome"] = {
-        "name": REPOS['awesome'],
-        "stars": awesome_stars
-    }
+    for key, fields in fetched.items():
+        report["repos"][key] = build_repo_report(key, fields)
+    report["ecosystem"] = summarize_ecosystem(report["repos"])
     
-    # 生成技术洞察
+    # 生成技术洞察（主仓库）
     print("  💡 生成技术洞察...")
     insights = []
+    main = report["repos"].get(PRIMARY_REPO, {})
+    main_releases = main.get("releases") or []
+    main_topics = main.get("trending_topics") or []
     
     # 洞察 1: 最新版本关键更新
     if main_releases:
@@ -201,7 +413,7 @@ def generate_report():
         })
     
     # 洞察 2: 安全加固趋势
-    security_fixes = report["repos"]["main"]["security_fixes"]
+    security_fixes = main.get("security_fixes")
     if security_fixes:
         insights.append({
             "type": "security",
@@ -220,17 +432,21 @@ def generate_report():
             })
     
     report["insights"] = insights
+    report["rate_limit"] = github.rate_limit_summary()
     
-    # 保存报告
-    output_file = OUTPUT_DIR / f"github-monitor-{datetime.now().strftime('%Y%m%d')}.json"
+    # 保存报告（汇总 + 每个仓库一份）
+    date_stamp = datetime.now().strftime('%Y%m%d')
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = OUTPUT_DIR / f"github-monitor-{date_stamp}.json"
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(report, f, ensure_ascii=False, indent=2)
+    save_repo_reports(report["repos"], date_stamp)
     
-    print(f"✅ 报告已保存：{output_file}")
+    print(f"✅ 报告已保存：{output_file}（另有 {len(report['repos'])} 个仓库报告在 {REPO_REPORT_DIR}）")
     
     # 生成 Markdown 摘要
     md_summary = generate_markdown_summary(report)
-    md_file = OUTPUT_DIR / f"github-monitor-{datetime.now().strftime('%Y%m%d')}.md"
+    md_file = OUTPUT_DIR / f"github-monitor-{date_stamp}.md"
     with open(md_file, 'w', encoding='utf-8') as f:
         f.write(md_summary)
     
@@ -245,18 +461,21 @@ def generate_markdown_summary(report):
     md.append("")
     
     # 主仓库统计
-    main = report["repos"]["main"]
-    md.append("## 📦 openclaw/openclaw")
+    main = report["repos"].get(PRIMARY_REPO, {"name": REPOS.get(PRIMARY_REPO, PRIMARY_REPO)})
+    md.append(f"## 📦 {main['name']}")
     md.append("")
     
-    if main["stars"]:
+    if main.get("stars"):
         md.append(f"- ⭐ Stars: {main['stars']['stars']}")
         md.append(f"- 🍴 Forks: {main['stars']['forks']}")
         md.append(f"- 🐛 Open Issues: {main['stars']['open_issues']}")
+        trend = main.get("stars_trend_7d")
+        if trend:
+            md.append(f"- 📈 近 7 天 Stars: {trend['delta']:+d}（日均 {trend['per_day']:+.1f}）")
         md.append("")
     
     # 最新版本
-    if main["releases"]:
+    if main.get("releases"):
         latest = main["releases"][0]
         md.append("### 🚀 最新版本")
         md.append(f"**{latest['tag']}** ({latest['published_at']})")
@@ -265,19 +484,42 @@ def generate_markdown_summary(report):
         md.append("")
     
     # 安全修复
-    if main["security_fixes"]:
+    if main.get("security_fixes"):
         md.append("### 🔒 安全修复")
         for fix in main["security_fixes"][:5]:
             md.append(f"- **{fix['release']}**: {fix['content']}")
         md.append("")
     
+    # 破坏性变更
+    if main.get("breaking_changes"):
+        md.append("### ⚠️ 破坏性变更 / 废弃")
+        for change in main["breaking_changes"][:5]:
+            md.append(f"- **{change['release']}**: {change['content']}")
+        md.append("")
+    
     # 社区热门
-    if main["trending_topics"]:
+    if main.get("trending_topics"):
         md.append("### 💬 社区热门话题")
         for topic in main["trending_topics"][:5]:
             md.append(f"- [{topic['title']}]({topic['url']}) ({topic['comments']} 评论)")
         md.append("")
     
+    # 生态概览（主仓库以外的其他仓库）
+    others = [row for row in report.get("ecosystem", []) if row["key"] != PRIMARY_REPO]
+    if others:
+        md.append(f"## 🌐 生态概览 ({len(others)} 个仓库)")
+        md.append("")
+        md.append("| 仓库 | ⭐ Stars | 7 天增量 | 最新版本 | 安全修复 | 破坏性变更 |")
+        md.append("|------|---------|---------|---------|---------|-----------|")
+        for row in others[:30]:
+            delta = f"{row['stars_delta_7d']:+d}" if row['stars_delta_7d'] is not None else "-"
+            release = f"{row['latest_release']} ({row['latest_release_date']})" if row['latest_release'] else "-"
+            md.append(f"| {row['name']} | {row['stars'] if row['stars'] is not None else '-'} | {delta} | "
+                      f"{release} | {row['security_fixes']} | {row['breaking_changes']} |")
+        if len(others) > 30:
+            md.append(f"\n*其余 {len(others) - 30} 个仓库见 JSON 报告*")
+        md.append("")
+    
     # 技术洞察
     if report["insights"]:
         md.append("## 💡 技术洞察")
@@ -305,5 +547,11 @@ if __name__ == "__main__":
     report = generate_report()
     print("\n📊 监控完成！")
     print(f"  - 发现 {len(report['insights'])} 条技术洞察")
-    print(f"  - 抓取 {len(report['repos']['main']['releases'])} 个 Releases")
-    print(f"  - 抓取 {len(report['repos']['main']['trending_topics'])} 个热门话题")
+    print(f"  - 监控 {len(report['repos'])} 个仓库")
+    main = report['repos'].get(PRIMARY_REPO, {})
+    print(f"  - 抓取 {len(main.get('releases') or [])} 个 Releases")
+    print(f"  - 抓取 {len(main.get('trending_topics') or [])} 个热门话题")
+    print(f"  - {http_client.format_stats()}")
+    print(f"  - {http_client.format_retry_stats()}")
+    print(f"  - {github.format_cache_stats()}")
+    print(f"  - {http_client.format_cache_stats()}")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+GitHub Timeseries - Star / Fork / Open Issues 时间序列存储
+功能：
+1. 每个仓库一个只追加的定长二进制文件（每条记录 32 字节：时间戳 + 3 个计数）
+2. 按时间戳二分查找，区间查询只读取命中的记录（O(log n) + 区间大小）
+3. 提供差值、增长率、移动平均查询，周报 / 月报无需再扫描 logs 目录
+
+存储：history/github/<owner>__<name>/stats.bin（与 github-history 同目录）
+
+用法：
+    python3 github-timeseries.py openclaw/openclaw --days 30
+"""
+
+import importlib
+import struct
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+history = importlib.import_module("github-history")
+
+# 记录格式：小端 int64 × 4 = (unix 时间戳, stars, forks, open_issues)
+RECORD = struct.Struct("<qqqq")
+FIELDS = ("stars", "forks", "open_issues")
+STATS_FILE = "stats.bin"
+
+
+def to_timestamp(value):
+    """datetime / 'YYYY-MM-DD[THH:MM:SS]' / 时间戳 → unix 时间戳（秒）"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.rstrip('Z'))
+    return int(value.timestamp())
+
+
+class TimeSeries:
+    """单个仓库的计数时间序列（只追加，时间戳单调递增）"""
+
+    def __init__(self, repo, history_dir=None):
+        self.repo = repo
+        self.path = history.repo_dir(repo, history_dir) / STATS_FILE
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        try:
+            return self.path.stat().st_size // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, stats, timestamp=None):
+        """追加一条快照；时间戳不晚于最后一条时忽略，返回是否写入
+
+        Args:
+            stats: {"stars": ..., "forks": ..., "open_issues": ...}（fetch_stars_trend 的返回值）
+        """
+        ts = to_timestamp(timestamp or datetime.now())
+        record = RECORD.pack(ts, *(int(stats.get(field) or 0) for field in FIELDS))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                size = f.tell()
+                if size % RECORD.size:
+                    # 上次写入被中断，丢弃不完整的尾部记录
+                    size -= size % RECORD.size
+                    f.truncate(size)
+                if size:
+                    with open(self.path, 'rb') as r:
+                        r.seek(size - RECORD.size)
+                        if RECORD.unpack(r.read(RECORD.size))[0] >= ts:
+                            return False
+                f.write(record)
+        return True
+
+    def _read_at(self, f, index):
+        f.seek(index * RECORD.size)
+        return RECORD.unpack(f.read(RECORD.size))
+
+    def _bisect(self, f, n, ts):
+        """返回第一条时间戳 > ts 的记录下标（bisect_right）"""
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._read_at(f, mid)[0] <= ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _as_dict(self, record):
+        ts, *values = record
+        return {"timestamp": ts, **dict(zip(FIELDS, values))}
+
+    def at(self, when):
+        """返回 when 时刻（含）之前的最后一条快照，没有则返回 None"""
+        n = len(self)
+        if not n:
+            return None
+        with open(self.path, 'rb') as f:
+            index = self._bisect(f, n, to_timestamp(when))
+            return self._as_dict(self._read_at(f, index - 1)) if index else None
+
+    def between(self, start, end):
+        """返回 [start, end] 区间内的全部快照（按时间升序）"""
+        n = len(self)
+        if not n:
+            return []
+        with open(self.path, 'rb') as f:
+            lo = self._bisect(f, n, to_timestamp(start) - 1)
+            hi = self._bisect(f, n, to_timestamp(end))
+            if lo >= hi:
+                return []
+            f.seek(lo * RECORD.size)
+            data = f.read((hi - lo) * RECORD.size)
+        return [self._as_dict(record) for record in RECORD.iter_unpack(data)]
+
+    def delta(self, field, start, end):
+        """区间内 field 的变化量（end 时刻值 - start 时刻值），数据不足时返回 None"""
+        first, last = self._bounds(start, end)
+        if first is None:
+            return None
+        return last[field] - first[field]
+
+    def growth_rate(self, field, start, end):
+        """区间增长率（百分比）及折算的日均增量
+
+        Returns:
+            {"from": 起始值, "to": 结束值, "delta": 差值, "percent": 增长百分比, "per_day": 日均增量}
+        """
+        first, last = self._bounds(start, end)
+        if first is None:
+            return None
+        delta = last[field] - first[field]
+        days = max((last["timestamp"] - first["timestamp"]) / 86400, 1)
+        return {
+            "from": first[field],
+            "to": last[field],
+            "delta": delta,
+            "percent": round(delta / first[field] * 100, 2) if first[field] else None,
+            "per_day": round(delta / days, 2),
+        }
+
+    def moving_average(self, field, end, window_days=7):
+        """截至 end 的 window_days 天窗口内 field 的平均值"""
+        end_ts = to_timestamp(end)
+        records = self.between(end_ts - window_days * 86400, end_ts)
+        if not records:
+            return None
+        return round(sum(r[field] for r in records) / len(records), 2)
+
+    def _bounds(self, start, end):
+        """区间两端的快照：start 取区间内第一条（区间前有数据时取之前最后一条），end 取 end 之前最后一条"""
+        last = self.at(end)
+        if last is None:
+            return None, None
+        first = self.at(start)
+        if first is None:
+            records = self.between(start, end)
+            first = records[0] if records else None
+        if first is None or first["timestamp"] >= last["timestamp"]:
+            return None, None
+        return first, last
+
+
+def record_snapshot(repo, stats, timestamp=None, history_dir=None):
+    """github-monitor 调用：记录一次 fetch_stars_trend 的结果"""
+    if not stats:
+        return False
+    return TimeSeries(repo, history_dir).append(stats, timestamp)
+
+
+# ==================== 周报 / 月报读取接口 ====================
+
+def trends_in_range(start_date, end_date, history_dir=None, window_days=7):
+    """汇总日期范围内（含首尾，YYYY-MM-DD）每个仓库的计数趋势
+
+    Returns:
+        {repo: {field: {"from", "to", "delta", "percent", "per_day", "moving_avg"}}}
+    """
+    end = datetime.fromisoformat(end_date) + timedelta(days=1) - timedelta(seconds=1)
+    trends = {}
+    for repo in history.list_repos(history_dir):
+        series = TimeSeries(repo, history_dir)
+        if not len(series):
+            continue
+        repo_trend = {}
+        for field in FIELDS:
+            growth = series.growth_rate(field, start_date, end)
+            if growth is None:
+                continue
+            growth["moving_avg"] = series.moving_average(field, end, window_days)
+            repo_trend[field] = growth
+        if repo_trend:
+            trends[repo] = repo_trend
+    return trends
+
+
+def format_trends(trends):
+    """把 trends_in_range 的结果格式化为 LLM 提示词片段"""
+    labels = {"stars": "⭐ Stars", "forks": "🍴 Forks", "open_issues": "🐛 Open Issues"}
+    lines = []
+    for repo, fields in trends.items():
+        lines.append(f"### {repo}")
+        for field, t in fields.items():
+            percent = f"{t['percent']:+.2f}%" if t['percent'] is not None else "n/a"
+            lines.append(f"- {labels[field]}: {t['from']} → {t['to']} "
+                         f"({t['delta']:+d}, {percent}, 日均 {t['per_day']:+.1f}, 7 日均值 {t['moving_avg']})")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub 计数时间序列查询")
+    parser.add_argument("repo", help="仓库 (owner/name)")
+    parser.add_argument("--days", type=int, default=30, help="查询最近多少天")
+    args = parser.parse_args()
+
+    end = datetime.now()
+    start = end - timedelta(days=args.days)
+    series = TimeSeries(args.repo)
+    print(f"📈 {args.repo}: 共 {len(series)} 条快照")
+    for field in FIELDS:
+        print(f"  {field}: {series.growth_rate(field, start, end)}")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+HN Fetcher - Hacker News 并发抓取
+功能：
+1. 线程池并发抓取 story 详情（并发数可配置）
+2. 整次扫描共享一个截止时间：到点后不再发起新请求，已拿到的结果照常返回
+3. 结果按 topstories 排名顺序返回（与完成顺序无关）
+4. 本地 item 缓存：标题 / URL 等不变字段永久保存，只有仍在首页的 story
+   才会重新抓取分数和评论数；按最近访问时间淘汰（LRU + 最大保留天数）
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    hn = importlib.import_module("hn-fetcher")
+    stories = hn.fetch_top_stories(limit=100)
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+retry = importlib.import_module("retry-policy")
+
+HN_API = "https://hacker-news.firebaseio.com/v0"
+
+# 并发数、整次扫描的截止时间（秒）、默认扫描的 story 数
+HN_WORKERS = int(os.environ.get("HN_FETCH_WORKERS", "16"))
+HN_DEADLINE = float(os.environ.get("HN_FETCH_DEADLINE", "20"))
+HN_SCAN_LIMIT = int(os.environ.get("HN_SCAN_LIMIT", "100"))
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+HN_CACHE_PATH = Path(os.environ.get("HN_ITEM_CACHE", WORKSPACE_DIR / "cache" / "hn-items.json"))
+
+# 不变字段永久缓存；易变字段只对首页 story 按 TTL 刷新
+IMMUTABLE_FIELDS = ("id", "type", "title", "url", "by", "time")
+VOLATILE_FIELDS = ("score", "descendants")
+FRONT_PAGE_SIZE = 30
+VOLATILE_TTL = int(os.environ.get("HN_VOLATILE_TTL", "3600"))
+# 淘汰策略：超过 CACHE_MAX_AGE 未出现在扫描中的条目删除；总数超过 CACHE_MAX_ENTRIES 时按 LRU 删除
+CACHE_MAX_ENTRIES = int(os.environ.get("HN_CACHE_MAX_ENTRIES", "5000"))
+CACHE_MAX_AGE = 30 * 86400
+
+# item 请求的重试策略（退避上限较短，整体受扫描截止时间约束）
+RETRY_POLICY = retry.RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=2)
+# 单个请求的超时上限（与 http-client 的 HN item 策略一致）
+ITEM_TIMEOUT = 5
+
+
+class DeadlineExceeded(Exception):
+    """扫描截止时间已到"""
+
+
+def fetch_with_retry(url, deadline=None, use_cache=True):
+    """GET JSON（统一重试引擎）；超时和重试等待都不会越过 deadline（time.monotonic() 时刻）
+
+    use_cache=False 时绕过共享响应缓存（item 的分数 / 评论数由 ItemCache 按 VOLATILE_TTL 刷新，
+    响应缓存再挡一层会让刷新请求拿到最多一小时前的旧值）
+    """
+    timeout = ITEM_TIMEOUT
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(url)
+        timeout = min(timeout, remaining)
+    return http_client.get_json(url, timeout=timeout, retry_policy=RETRY_POLICY, deadline=deadline,
+                                use_cache=use_cache)
+
+
+def fetch_top_ids(deadline=None):
+    """获取 topstories 排名（最多 500 个 id）"""
+    return fetch_with_retry(f"{HN_API}/topstories.json", deadline) or []
+
+
+def fetch_items(ids, max_workers=HN_WORKERS, deadline=None):
+    """并发抓取 item 详情
+
+    Args:
+        ids: 按排名排列的 item id
+        deadline: time.monotonic() 截止时刻；到点后未完成的 item 记为超时
+    Returns:
+        (items, stats)：items 与 ids 一一对应（失败 / 超时为 None），
+        stats = {"fetched", "failed", "timed_out", "elapsed"}
+    """
+    start = time.monotonic()
+    items = [None] * len(ids)
+    stats = {"fetched": 0, "failed": 0, "timed_out": 0, "elapsed": 0.0}
+    if not ids:
+        return items, stats
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))))
+    futures = {
+        pool.submit(fetch_with_retry, f"{HN_API}/item/{item_id}.json", deadline, False): rank
+        for rank, item_id in enumerate(ids)
+    }
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    done, not_done = wait(futures, timeout=timeout)
+    # 截止时间已到：取消排队中的任务，不等待正在进行的请求
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        try:
+            items[futures[future]] = future.result()
+            stats["fetched"] += 1
+        except DeadlineExceeded:
+            stats["timed_out"] += 1
+        except Exception:
+            stats["failed"] += 1
+    stats["timed_out"] += len(not_done)
+    stats["elapsed"] = round(time.monotonic() - start, 2)
+    return items, stats
+
+
+class ItemCache:
+    """按 story id 持久化的 item 缓存（单个 JSON 文件，原子写入）
+
+    条目：不变字段 + 易变字段 + refreshed_at（易变字段抓取时间）+ last_seen（最近一次出现在扫描中）
+    """
+
+    def __init__(self, path=HN_CACHE_PATH):
+        self.path = Path(path)
+        self.items = {}
+        self.stats = {"hits": 0, "refreshed": 0, "misses": 0, "evicted": 0}
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.items = json.load(f).get("items", {})
+        except (OSError, json.JSONDecodeError):
+            self.items = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"items": self.items}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def needs_fetch(self, item_id, rank, now=None):
+        """判断是否需要请求：未缓存，或仍在首页且易变字段已过期"""
+        entry = self.items.get(str(item_id))
+        if entry is None:
+            return True
+        now = now or time.time()
+        return rank < FRONT_PAGE_SIZE and now - entry.get("refreshed_at", 0) > VOLATILE_TTL
+
+    def get(self, item_id, now=None):
+        """读取条目并更新最近访问时间（返回不含缓存元数据的 item）"""
+        entry = self.items.get(str(item_id))
+        if entry is None:
+            return None
+        entry["last_seen"] = now or time.time()
+        return {k: v for k, v in entry.items() if k not in ("refreshed_at", "last_seen")}
+
+    def put(self, item, now=None):
+        """写入新抓取的 item：已缓存的条目只更新易变字段"""
+        now = now or time.time()
+        key = str(item["id"])
+        entry = self.items.get(key)
+        if entry is None:
+            entry = self.items[key] = {f: item[f] for f in IMMUTABLE_FIELDS if f in item}
+            self.stats["misses"] += 1
+        else:
+            self.stats["refreshed"] += 1
+        for field in VOLATILE_FIELDS:
+            entry[field] = item.get(field, 0)
+        entry["refreshed_at"] = now
+        entry["last_seen"] = now
+
+    def evict(self, now=None):
+        """删除长期未出现的条目，再按 LRU 限制总数"""
+        now = now or time.time()
+        before = len(self.items)
+        self.items = {
+            k: v for k, v in self.items.items() if now - v.get("last_seen", 0) <= CACHE_MAX_AGE
+        }
+        if len(self.items) > CACHE_MAX_ENTRIES:
+            keep = sorted(self.items.items(), key=lambda kv: kv[1].get("last_seen", 0), reverse=True)
+            self.items = dict(keep[:CACHE_MAX_ENTRIES])
+        self.stats["evicted"] += before - len(self.items)
+
+
+def fetch_top_stories(limit=HN_SCAN_LIMIT, max_workers=HN_WORKERS, deadline_secs=HN_DEADLINE,
+                      use_cache=True):
+    """抓取排名前 limit 的 story（按排名顺序，跳过失败 / 超时的条目）
+
+    启用缓存时只请求未缓存的 story 和需要刷新分数的首页 story。
+
+    Returns:
+        (stories, stats)，stats 额外包含 "cached"（直接取自缓存的条目数）
+    """
+    deadline = time.monotonic() + deadline_secs
+    ids = fetch_top_ids(deadline)[:limit]
+    if not use_cache:
+        items, stats = fetch_items(ids, max_workers=max_workers, deadline=deadline)
+        stats["cached"] = 0
+        return [item for item in items if item], stats
+
+    cache = ItemCache()
+    now = time.time()
+    to_fetch = [item_id for rank, item_id in enumerate(ids) if cache.needs_fetch(item_id, rank, now)]
+    items, stats = fetch_items(to_fetch, max_workers=max_workers, deadline=deadline)
+    for item in items:
+        if item and item.get("id") is not None:
+            cache.put(item, now)
+
+    stories = []
+    for item_id in ids:
+        item = cache.get(item_id, now)
+        if item:
+            stories.append(item)
+    stats["cached"] = len(ids) - len(to_fetch)
+    cache.stats["hits"] += stats["cached"]
+    cache.evict(now)
+    cache.save()
+    return stories, stats
+
+
+def format_stats(stats):
+    """格式化抓取统计"""
+    return (f"📰 HN: 抓取 {stats['fetched']} 个，缓存命中 {stats.get('cached', 0)} 个，"
+            f"失败 {stats['failed']} 个，超时 {stats['timed_out']} 个，耗时 {stats['elapsed']}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hacker News 并发抓取")
+    parser.add_argument("--limit", type=int, default=HN_SCAN_LIMIT, help="扫描前多少个 story")
+    parser.add_argument("--workers", type=int, default=HN_WORKERS, help="并发数")
+    parser.add_argument("--deadline", type=float, default=HN_DEADLINE, help="整次扫描的截止时间（秒）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用本地 item 缓存")
+    args = parser.parse_args()
+
+    stories, stats = fetch_top_stories(args.limit, args.workers, args.deadline, use_cache=not args.no_cache)
+    for rank, story in enumerate(stories, 1):
+        print(f"{rank:>4}. {story.get('title', '')}")
+    print(format_stats(stats))
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+HTTP Cassette - 网络请求录制 / 回放
+功能：
+1. 录制模式：把 http-client 发出的每个请求和响应追加保存到 cassette 文件
+   （GitHub / HN / Lobsters / Notion / Ark 全部经过 http-client，流水线各脚本共用一个文件）
+2. 回放模式：按请求从 cassette 返回录制的响应，不建立任何网络连接
+3. 回放时可注入延迟：固定秒数，或按录制时的实际耗时（可缩放）
+4. run 子命令：在录制 / 回放环境下执行整条流水线并计时，用于离线可复现的端到端基准测试
+
+环境变量（子进程继承，learning-*.sh 无需改动）：
+    HTTP_CASSETTE_MODE   record / replay（不设置时关闭）
+    HTTP_CASSETTE        cassette 文件路径
+    HTTP_CASSETTE_LATENCY  回放延迟：秒数，或 "recorded"（录制耗时）；默认 0
+    HTTP_CASSETTE_LATENCY_SCALE  延迟缩放系数（默认 1）
+
+请求匹配：同一脚本的 (method, URL, 请求体) → 同一脚本的 (method, URL) → 任意脚本的 (method, URL)；
+同一个 key 的多次请求按录制顺序依次返回，用完后重复最后一个。
+
+隔离：发出哪些请求取决于本地状态（ETag 缓存、HN item 缓存、同步游标、LLM 缓存、指纹索引、
+awesome 快照、日志、tracker 等），run 子命令每次运行都在新建的临时工作目录（OPENCLAW_WORKSPACE）
+中执行，录制和回放都从同一个初始状态开始，也不会改动真实工作目录：
+    默认只复制真实工作目录中的配置（skills/learning-upgrade/config），其余状态为空
+    --seed DIR 从一份工作目录快照开始（录制和回放传同一个 DIR）
+
+用法：
+    python3 http-cassette.py run --record daily.json -- bash learning-daily.sh
+    python3 http-cassette.py run --replay daily.json --latency recorded --repeat 3 -- bash learning-daily.sh
+    python3 http-cassette.py run --replay daily.json --seed snapshot/ --keep -- bash learning-daily.sh
+    python3 http-cassette.py info daily.json
+"""
+
+import atexit
+import base64
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+CASSETTE_MODE = os.environ.get("HTTP_CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.environ.get("HTTP_CASSETTE", "")
+CASSETTE_LATENCY = os.environ.get("HTTP_CASSETTE_LATENCY", "0")
+CASSETTE_LATENCY_SCALE = float(os.environ.get("HTTP_CASSETTE_LATENCY_SCALE", "1"))
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+CONFIG_SUBDIR = Path("skills") / "learning-upgrade" / "config"
+# 单独指定状态文件位置的环境变量：隔离运行时去掉，让这些文件落在临时工作目录中
+STATE_PATH_ENV = ("GITHUB_ETAG_CACHE_DIR", "GITHUB_HISTORY_DIR", "HTTP_CACHE_PATH", "HN_ITEM_CACHE",
+                  "LLM_CACHE_DIR", "AWESOME_README_SNAPSHOT", "AWESOME_RESOURCE_INDEX",
+                  "CONTENT_FINGERPRINT_INDEX")
+
+# 不写入 cassette 的响应头（与回放无关，或每次都变化）
+SKIPPED_HEADERS = frozenset({"set-cookie", "date", "connection", "keep-alive", "transfer-encoding"})
+
+
+class CassetteMiss(Exception):
+    """回放时 cassette 中没有匹配的请求（不可重试）"""
+
+
+def _script_name():
+    return Path(sys.argv[0]).name if sys.argv and sys.argv[0] else ""
+
+
+def _body_hash(body):
+    return hashlib.sha256(body or b'').hexdigest()[:16]
+
+
+def _encode_body(data):
+    try:
+        return data.decode('utf-8'), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(data).decode('ascii'), "base64"
+
+
+def _decode_body(text, encoding):
+    return base64.b64decode(text) if encoding == "base64" else text.encode('utf-8')
+
+
+class Cassette:
+    """一个 cassette 文件（JSON：{"version", "interactions": [...]}）
+
+    Args:
+        mode: "record" 或 "replay"
+        latency: 回放延迟秒数，或 "recorded"
+        latency_scale: 延迟缩放系数
+    """
+
+    def __init__(self, path, mode, latency=0, latency_scale=1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"未知的 cassette 模式：{mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.interactions = []
+        self._lock = threading.Lock()
+        self._cursors = {}
+        self._index = {}
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+        self.load()
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def load(self):
+        if not self.path.exists():
+            if self.replaying:
+                raise FileNotFoundError(f"cassette 不存在：{self.path}")
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.interactions = json.load(f).get("interactions", [])
+        if self.replaying:
+            self._build_index()
+
+    def _build_index(self):
+        """三级匹配 key → 按录制顺序的 interaction 列表"""
+        for interaction in self.interactions:
+            request = interaction["request"]
+            method, url = request["method"], request["url"]
+            for key in ((interaction["script"], method, url, request["body_sha"]),
+                        (interaction["script"], method, url),
+                        (method, url)):
+                self._index.setdefault(key, []).append(interaction)
+
+    def save(self):
+        """追加录制的请求后原子写回（同一流水线的多个脚本依次追加到同一文件）"""
+        if self.replaying or not self.stats["recorded"]:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "interactions": self.interactions}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def record(self, method, url, body, status, reason, headers, data, elapsed):
+        """记录一次请求（只记录 method / URL / 请求体，不记录含凭据的请求头）"""
+        request_body, request_encoding = _encode_body(body or b'')
+        response_body, response_encoding = _encode_body(data)
+        interaction = {
+            "script": _script_name(),
+            "request": {
+                "method": method, "url": url, "body_sha": _body_hash(body),
+                "body": request_body, "encoding": request_encoding,
+            },
+            "response": {
+                "status": status, "reason": reason,
+                "headers": [[k, v] for k, v in headers if k.lower() not in SKIPPED_HEADERS],
+                "body": response_body, "encoding": response_encoding,
+            },
+            "elapsed": round(elapsed, 4),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["recorded"] += 1
+
+    def replay(self, method, url, body):
+        """返回录制的响应 (status, reason, headers, body)，按配置注入延迟
+
+        Raises:
+            CassetteMiss: 没有匹配的请求
+        """
+        script = _script_name()
+        with self._lock:
+            for key in ((script, method, url, _body_hash(body)), (script, method, url), (method, url)):
+                candidates = self._index.get(key)
+                if candidates:
+                    cursor = self._cursors.get(key, 0)
+                    self._cursors[key] = cursor + 1
+                    interaction = candidates[min(cursor, len(candidates) - 1)]
+                    self.stats["replayed"] += 1
+                    break
+            else:
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"cassette 中没有 {method} {url}")
+
+        delay = interaction["elapsed"] if self.latency == "recorded" else float(self.latency)
+        if delay > 0:
+            time.sleep(delay * self.latency_scale)
+        response = interaction["response"]
+        return (response["status"], response["reason"], response["headers"],
+                _decode_body(response["body"], response["encoding"]))
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """获取进程内共享的 Cassette（未启用时返回 None）"""
+    global _cassette
+    if not CASSETTE_MODE:
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            if not CASSETTE_PATH:
+                raise ValueError("HTTP_CASSETTE_MODE 已设置，但未指定 HTTP_CASSETTE 文件路径")
+            _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_LATENCY, CASSETTE_LATENCY_SCALE)
+            atexit.register(_cassette.save)
+        return _cassette
+
+
+def format_stats():
+    """格式化录制 / 回放统计"""
+    cassette = get_cassette()
+    if cassette is None:
+        return "📼 Cassette：未启用"
+    if cassette.replaying:
+        return f"📼 Cassette 回放：{cassette.stats['replayed']} 次，未匹配 {cassette.stats['missed']} 次"
+    return f"📼 Cassette 录制：{cassette.stats['recorded']} 次"
+
+
+# ==================== 命令行 ====================
+
+def show_info(path):
+    """按脚本和 host 汇总 cassette 内容"""
+    with open(path, 'r', encoding='utf-8') as f:
+        interactions = json.load(f).get("interactions", [])
+    summary = {}
+    for interaction in interactions:
+        key = (interaction["script"], urlsplit(interaction["request"]["url"]).hostname)
+        count, elapsed = summary.get(key, (0, 0.0))
+        summary[key] = (count + 1, elapsed + interaction["elapsed"])
+    print(f"📼 {path}：{len(interactions)} 个请求")
+    for (script, host), (count, elapsed) in sorted(summary.items()):
+        print(f"  {script:<22} {host:<32} {count:>5} 次  录制耗时 {elapsed:>7.2f}s")
+
+
+def prepare_workspace(seed=None):
+    """创建一次运行用的临时工作目录
+
+    Args:
+        seed: 工作目录快照，完整复制为初始状态；不传时只复制真实工作目录中的配置
+    """
+    workspace = Path(tempfile.mkdtemp(prefix="cassette-workspace-"))
+    if seed:
+        shutil.copytree(seed, workspace, symlinks=True, dirs_exist_ok=True)
+    elif (WORKSPACE_DIR / CONFIG_SUBDIR).is_dir():
+        shutil.copytree(WORKSPACE_DIR / CONFIG_SUBDIR, workspace / CONFIG_SUBDIR)
+    return workspace
+
+
+def run_command(command, mode, path, latency="0", latency_scale=1.0, repeat=1, seed=None, keep=False):
+    """在录制 / 回放环境下执行命令并计时
+
+    每次运行都使用新的临时工作目录（见模块说明），录制和回放的初始状态相同，
+    多次运行之间互不影响；keep=False 时运行结束后删除。
+
+    Returns:
+        每次运行的耗时列表（任意一次失败时提前结束）
+    """
+    import subprocess
+
+    env = dict(os.environ, HTTP_CASSETTE_MODE=mode, HTTP_CASSETTE=str(Path(path).resolve()),
+               HTTP_CASSETTE_LATENCY=str(latency), HTTP_CASSETTE_LATENCY_SCALE=str(latency_scale))
+    for name in STATE_PATH_ENV:
+        env.pop(name, None)
+    timings = []
+    for i in range(repeat):
+        workspace = prepare_workspace(seed)
+        env["OPENCLAW_WORKSPACE"] = str(workspace)
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(command, env=env)
+        finally:
+            timings.append(time.perf_counter() - start)
+            if keep:
+                print(f"📁 第 {i + 1} 次的工作目录：{workspace}")
+            else:
+                shutil.rmtree(workspace, ignore_errors=True)
+        print(f"⏱️  第 {i + 1} 次：{timings[-1]:.2f}s（退出码 {result.returncode}）")
+        if result.returncode != 0:
+            break
+    return timings
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="网络请求录制 / 回放")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info_parser = sub.add_parser("info", help="查看 cassette 内容")
+    info_parser.add_argument("path")
+
+    run_parser = sub.add_parser("run", help="在录制 / 回放模式下执行命令并计时")
+    group = run_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--record", metavar="PATH", help="录制到 cassette")
+    group.add_argument("--replay", metavar="PATH", help="从 cassette 回放")
+    run_parser.add_argument("--latency", default="0", help='回放延迟：秒数或 "recorded"')
+    run_parser.add_argument("--latency-scale", type=float, default=1.0, help="延迟缩放系数")
+    run_parser.add_argument("--repeat", type=int, default=1, help="运行次数")
+    run_parser.add_argument("--seed", metavar="DIR", help="从工作目录快照开始（默认只复制配置）")
+    run_parser.add_argument("--keep", action="store_true", help="保留每次运行的临时工作目录")
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="要执行的命令（放在 -- 之后）")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        show_info(args.path)
+    else:
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not cmd:
+            parser.error("缺少要执行的命令")
+        mode, path = ("record", args.record) if args.record else ("replay", args.replay)
+        timings = run_command(cmd, mode, path, args.latency, args.latency_scale, args.repeat,
+                              args.seed, args.keep)
+        if timings:
+            print(f"📊 {len(timings)} 次：最快 {min(timings):.2f}s，平均 {sum(timings) / len(timings):.2f}s")
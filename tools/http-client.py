@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - 共享连接池 HTTP 客户端
+功能：
+1. 按 host 复用 keep-alive 连接（线程安全，可供并发抓取共用）
+2. 全进程复用同一个 SSL context
+3. 超时策略集中配置（按 host / 路径前缀）
+4. 统计请求数、连接复用次数、TLS 握手次数
+5. 所有请求经过 retry-policy 统一重试（指数退避 + 抖动 + 全局重试预算）
+6. GET 请求经过 response-cache 共享响应缓存（按端点 TTL，新鲜期内不发请求）
+7. 支持 http-cassette 录制 / 回放（HTTP_CASSETTE_MODE），回放时不建立任何连接
+8. stream_lines() 逐行读取流式响应（SSE），超时为读取间隔的空闲超时
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    http_client = importlib.import_module("http-client")
+    data = http_client.get_json(url, headers={...})
+    print(http_client.get_stats())
+"""
+
+import http.client
+import importlib
+import json
+import ssl
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+retry = importlib.import_module("retry-policy")
+response_cache = importlib.import_module("response-cache")
+http_cassette = importlib.import_module("http-cassette")
+
+# === 超时策略（秒）===
+# (host, 路径前缀, 超时)，按顺序匹配，第一条命中生效
+TIMEOUT_POLICY = [
+    ("api.github.com", "", 15),
+    ("gateway.maton.ai", "", 30),
+    ("ark.cn-beijing.volces.com", "", 180),
+    ("hacker-news.firebaseio.com", "/v0/item/", 5),
+    ("hacker-news.firebaseio.com", "", 10),
+    ("lobste.rs", "", 10),
+]
+DEFAULT_TIMEOUT = 30
+
+# 每个 host 最多保留的空闲连接数
+MAX_IDLE_PER_HOST = 8
+MAX_REDIRECTS = 5
+
+# 复用的空闲连接可能已被服务端关闭，遇到这些错误时换新连接重发一次
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPError(Exception):
+    """非 2xx/3xx 响应（与 urllib.error.HTTPError 行为一致：默认抛出）"""
+
+    def __init__(self, url, status, reason, headers, body):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+def _build_headers(items):
+    """[(name, value), ...] → http.client.HTTPMessage"""
+    headers = http.client.HTTPMessage()
+    for name, value in items:
+        headers[name] = value
+    return headers
+
+
+class Response:
+    """已完整读取的 HTTP 响应"""
+
+    def __init__(self, url, status, reason, headers, body, from_cache=False):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers  # http.client.HTTPMessage，get() 大小写不敏感
+        self.body = body
+        self.from_cache = from_cache
+
+    @classmethod
+    def from_cached(cls, url, cached):
+        """由 response-cache 的 (status, headers, body) 重建响应"""
+        status, header_items, body = cached
+        return cls(url, status, http.client.responses.get(status, ''), _build_headers(header_items), body,
+                   from_cache=True)
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8'))
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HTTPError(self.url, self.status, self.reason, self.headers, self.body)
+
+
+class HTTPClient:
+    """按 host 维护 keep-alive 连接池的 HTTP 客户端"""
+
+    def __init__(self, timeout_policy=None, default_timeout=DEFAULT_TIMEOUT,
+                 max_idle_per_host=MAX_IDLE_PER_HOST):
+        self.timeout_policy = TIMEOUT_POLICY if timeout_policy is None else timeout_policy
+        self.default_timeout = default_timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.ssl_context = ssl.create_default_context()
+        self._idle = {}  # (scheme, host, port) -> [connection, ...]
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "tls_handshakes": 0,
+            "errors": 0,
+            "cache_hits": 0,
+        }
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def timeout_for(self, host, path):
+        """按策略表查找超时"""
+        for policy_host, prefix, seconds in self.timeout_policy:
+            if host == policy_host and path.startswith(prefix):
+                return seconds
+        return self.default_timeout
+
+    def _new_connection(self, scheme, host, port, timeout):
+        """新建连接并立即完成 TCP/TLS 握手（便于准确计数）"""
+        proxy = None
+        if not urllib.request.proxy_bypass(host):
+            proxy = urllib.request.getproxies().get(scheme)
+
+        if proxy:
+            proxy_parts = urlsplit(proxy if '://' in proxy else f"http://{proxy}")
+            connect_host, connect_port = proxy_parts.hostname, proxy_parts.port or 80
+        else:
+            connect_host, connect_port = host, port
+
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(
+                connect_host, connect_port, timeout=timeout, context=self.ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(connect_host, connect_port, timeout=timeout)
+        if proxy:
+            conn.set_tunnel(host, port)
+
+        conn.connect()
+        self._count("connections_opened")
+        if scheme == 'https':
+            self._count("tls_handshakes")
+        return conn
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            self._count("connections_reused")
+            return conn, True
+        return self._new_connection(*key, timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _open(self, method, url, headers, body, timeout):
+        """发送请求并读取状态行和响应头，返回 (连接池 key, 连接, http.client.HTTPResponse)"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += f"?{parts.query}"
+        if timeout is None:
+            timeout = self.timeout_for(host, parts.path or '/')
+
+        key = (scheme, host, port)
+        conn, reused = self._acquire(key, timeout)
+        try:
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # 空闲连接已失效，换新连接重发
+                conn.close()
+                conn = self._new_connection(*key, timeout)
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+        except Exception:
+            conn.close()
+            self._count("errors")
+            raise
+        return key, conn, resp
+
+    def _finish(self, key, conn, resp):
+        """响应体读完后归还连接"""
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    def _send(self, method, url, headers, body, timeout):
+        """发送单个请求（不处理重定向），返回 Response"""
+        cassette = http_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            status, reason, header_items, data = cassette.replay(method, url, body)
+            return Response(url, status, reason, _build_headers(header_items), data)
+
+        start = time.monotonic()
+        key, conn, resp = self._open(method, url, headers, body, timeout)
+        try:
+            data = resp.read()
+        except Exception:
+            conn.close()
+            self._count("errors")
+            raise
+
+        self._finish(key, conn, resp)
+        if cassette is not None:
+            cassette.record(method, url, body, resp.status, resp.reason, resp.headers.items(), data,
+                            time.monotonic() - start)
+        return Response(url, resp.status, resp.reason, resp.headers, data)
+
+    def _follow(self, method, url, headers, body, timeout):
+        """发送请求并跟随 GET / HEAD 重定向"""
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers, body, timeout)
+            location = response.headers.get('Location')
+            if response.status in (301, 302, 303, 307, 308) and location and method in ('GET', 'HEAD'):
+                url = urljoin(url, location)
+                continue
+            break
+        return response
+
+    def request(self, method, url, headers=None, body=None, timeout=None, raise_for_status=True,
+                retry_policy=None, deadline=None, use_cache=True):
+        """发送请求并返回 Response
+
+        Args:
+            method: HTTP 方法
+            url: 完整 URL
+            headers: 请求头 dict
+            body: bytes 请求体
+            timeout: 覆盖策略表中的超时（秒）
+            raise_for_status: 状态码 >= 400 时抛出 HTTPError
+            retry_policy: 重试策略（默认 retry.DEFAULT_POLICY，传 retry.NO_RETRY 关闭重试）
+            deadline: time.monotonic() 截止时刻，重试等待不会越过它
+            use_cache: GET 请求是否使用共享响应缓存（端点 TTL 见 response-cache）
+        """
+        cache = get_response_cache() if use_cache and method == 'GET' else None
+        if cache is not None:
+            cached = cache.get(method, url)
+            if cached is not None:
+                self._count("cache_hits")
+                return Response.from_cached(url, cached)
+
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', 'learning-upgrade/3.0')
+        self._count("requests")
+
+        response = retry.call(
+            lambda: self._follow(method, url, headers, body, timeout),
+            urlsplit(url).hostname, method, policy=retry_policy, deadline=deadline
+        )
+        if cache is not None:
+            cache.put(method, url, response.status, response.headers.items(), response.body)
+
+        if raise_for_status and response.status >= 400:
+            self._count("errors")
+            response.raise_for_status()
+        return response
+
+    def request_json(self, method, url, headers=None, data=None, timeout=None, retry_policy=None):
+        """发送 JSON 请求（data 为可序列化对象）并解析 JSON 响应"""
+        body = json.dumps(data).encode('utf-8') if data else None
+        return self.request(method, url, headers=headers, body=body, timeout=timeout,
+                            retry_policy=retry_policy).json()
+
+    def get_json(self, url, headers=None, timeout=None, retry_policy=None, deadline=None, use_cache=True):
+        """GET 并解析 JSON 响应"""
+        return self.request('GET', url, headers=headers, timeout=timeout,
+                            retry_policy=retry_policy, deadline=deadline, use_cache=use_cache).json()
+
+    def stream_lines(self, method, url, headers=None, body=None, timeout=None):
+        """发送请求并逐行产出响应体（bytes，含换行符），用于 SSE 等流式响应
+
+        - timeout 是两次读取之间的空闲超时，而不是整个响应的总耗时
+        - 不重试、不跟随重定向、不经过响应缓存
+        - 状态码 >= 400 时读完响应体并抛出 HTTPError
+        - 录制 / 回放 cassette 时整段响应体作为一次请求记录
+        """
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', 'learning-upgrade/3.0')
+        self._count("requests")
+
+        cassette = http_cassette.get_cassette()
+        if cassette is not None and cassette.replaying:
+            status, reason, header_items, data = cassette.replay(method, url, body)
+            Response(url, status, reason, _build_headers(header_items), data).raise_for_status()
+            yield from data.splitlines(keepends=True)
+            return
+
+        start = time.monotonic()
+        key, conn, resp = self._open(method, url, headers, body, timeout)
+        if resp.status >= 400:
+            data = resp.read()
+            self._finish(key, conn, resp)
+            self._count("errors")
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, data)
+
+        received = []
+        finished = False
+        try:
+            try:
+                for line in resp:
+                    if cassette is not None:
+                        received.append(line)
+                    yield line
+            except Exception:
+                self._count("errors")
+                raise
+            finished = True
+        finally:
+            if finished:
+                self._finish(key, conn, resp)
+                if cassette is not None:
+                    cassette.record(method, url, body, resp.status, resp.reason, resp.headers.items(),
+                                    b''.join(received), time.monotonic() - start)
+            else:
+                # 中途出错或调用方提前结束：连接状态未知，直接关闭
+                conn.close()
+
+    def get_stats(self):
+        """返回计数器快照"""
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+# === 进程级共享客户端 ===
+
+def get_response_cache():
+    """共享响应缓存；录制 / 回放 cassette 时关闭，保证每个请求都经过 cassette"""
+    if http_cassette.get_cassette() is not None:
+        return None
+    return response_cache.get_cache()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """获取进程内共享的 HTTPClient"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
+
+
+def request(method, url, headers=None, body=None, timeout=None, raise_for_status=True,
+            retry_policy=None, deadline=None, use_cache=True):
+    return get_client().request(method, url, headers=headers, body=body, timeout=timeout,
+                                raise_for_status=raise_for_status,
+                                retry_policy=retry_policy, deadline=deadline, use_cache=use_cache)
+
+
+def request_json(method, url, headers=None, data=None, timeout=None, retry_policy=None):
+    return get_client().request_json(method, url, headers=headers, data=data, timeout=timeout,
+                                     retry_policy=retry_policy)
+
+
+def get_json(url, headers=None, timeout=None, retry_policy=None, deadline=None, use_cache=True):
+    return get_client().get_json(url, headers=headers, timeout=timeout,
+                                 retry_policy=retry_policy, deadline=deadline, use_cache=use_cache)
+
+
+def stream_lines(method, url, headers=None, body=None, timeout=None):
+    return get_client().stream_lines(method, url, headers=headers, body=body, timeout=timeout)
+
+
+def get_stats():
+    return get_client().get_stats()
+
+
+def format_stats(stats=None):
+    """格式化连接统计（用于脚本结束时打印）"""
+    stats = stats or get_stats()
+    return (f"🔌 HTTP: {stats['requests']} 次请求，"
+            f"复用连接 {stats['connections_reused']} 次，"
+            f"TLS 握手 {stats['tls_handshakes']} 次，"
+            f"缓存命中 {stats['cache_hits']} 次")
+
+
+def format_retry_stats():
+    """格式化按 host 的重试统计"""
+    return retry.format_stats()
+
+
+def format_cache_stats():
+    """格式化共享响应缓存统计（启用 cassette 时为录制 / 回放统计）"""
+    if http_cassette.get_cassette() is not None:
+        return http_cassette.format_stats()
+    return response_cache.format_stats()
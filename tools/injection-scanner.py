@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Injection Scanner - 共享的提示词注入扫描器
+功能：
+1. 完整模式集合在导入时编译一次，github-monitor / community-scraper / learning-daily.sh 共用
+2. 按固定大小的窗口扫描（窗口间保留重叠），支持分块 / 流式输入，
+   内存占用与输入总长度无关，也不会生成整段输入的小写副本
+3. 报告每个命中的模式及其在原始输入中的偏移
+4. 自带吞吐量基准测试（与旧的 lower() + 逐个 re.search 写法对比）
+
+实现说明：
+    CPython 的 re 对以字面量开头的模式使用快速子串查找，合并成一个大的交替正则
+    （或使用 IGNORECASE）后这条快速路径失效，实测慢 2～10 倍（见 --bench）。
+    因此每个模式各自编译一个正则，在窗口的小写副本上依次查找。
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    injection = importlib.import_module("injection-scanner")
+    matches = injection.scan(text)                    # [{"pattern", "start", "end", "text"}, ...]
+    for match in injection.scan_stream(chunks): ...
+    some_command | python3 injection-scanner.py       # 命中时退出码为 1
+    python3 injection-scanner.py --bench
+"""
+
+import re
+import sys
+import time
+
+PATTERNS = [
+    "ignore previous instructions",
+    "disregard all",
+    "you are now",
+    "bypass safety",
+    "execute this command",
+    "run this code",
+    "system prompt",
+    "override your",
+]
+
+# 每次扫描的窗口大小，以及相邻窗口的重叠长度（跨窗口的命中只要短于重叠长度就不会漏掉）
+WINDOW_SIZE = 64 * 1024
+OVERLAP = 256
+
+
+def _compile(phrase, flags=0):
+    """短语 → 正则：单词之间允许任意空白（含换行）"""
+    return re.compile(r"\s+".join(re.escape(word) for word in phrase.split()), flags)
+
+
+class InjectionScanner:
+    """编译一次、可重复使用的注入扫描器
+
+    Args:
+        patterns: 小写短语列表
+    """
+
+    def __init__(self, patterns=PATTERNS, window_size=WINDOW_SIZE, overlap=OVERLAP):
+        self.patterns = list(patterns)
+        self.window_size = window_size
+        self.overlap = overlap
+        self._regexes = [(phrase, _compile(phrase)) for phrase in self.patterns]
+        # 少数字符小写后长度会变（如 "İ"），这种窗口改用忽略大小写的正则，保证偏移准确
+        self._ci_regexes = [(phrase, _compile(phrase, re.IGNORECASE)) for phrase in self.patterns]
+
+    def _scan_window(self, window, base):
+        lower = window.lower()
+        if len(lower) == len(window):
+            target, regexes = lower, self._regexes
+        else:
+            target, regexes = window, self._ci_regexes
+        found = []
+        for phrase, regex in regexes:
+            for match in regex.finditer(target):
+                start, end = match.span()
+                found.append({"pattern": phrase, "start": base + start, "end": base + end,
+                              "text": window[start:end]})
+        found.sort(key=lambda m: m["start"])
+        return found
+
+    def scan_stream(self, chunks):
+        """扫描分块输入（任意大小的 str 块），按偏移顺序逐个产出命中"""
+        parts, size = [], 0
+        carry = ""
+        base = 0          # carry[0] 在整个输入中的偏移
+        # 已报告的 (模式, 起始偏移)：重叠区内同一命中不重复报告，不同模式的重叠命中各自报告
+        reported = set()
+
+        def flush(final):
+            nonlocal carry, base, reported
+            window = carry + "".join(parts)
+            parts.clear()
+            for match in self._scan_window(window, base):
+                key = (match["pattern"], match["start"])
+                if key not in reported:
+                    reported.add(key)
+                    yield match
+            if not final:
+                carry = window[-self.overlap:]
+                base += len(window) - len(carry)
+                # 之后的窗口都从 base 开始，更早的命中不会再出现
+                reported = {key for key in reported if key[1] >= base}
+
+        for chunk in chunks:
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= self.window_size:
+                yield from flush(final=False)
+                size = 0
+        yield from flush(final=True)
+
+    def scan(self, text):
+        """扫描完整文本，返回全部命中"""
+        step = self.window_size
+        return list(self.scan_stream(text[i:i + step] for i in range(0, len(text), step)))
+
+
+_scanner = InjectionScanner()
+
+
+def scan(text):
+    """扫描完整文本 → [{"pattern", "start", "end", "text"}, ...]"""
+    return _scanner.scan(text)
+
+
+def scan_stream(chunks):
+    """扫描分块 / 流式输入（生成器）"""
+    return _scanner.scan_stream(chunks)
+
+
+def detect_injection(content, source=None):
+    """检测潜在的提示词注入模式，命中时打印警告（含偏移）
+
+    Returns:
+        是否命中
+    """
+    matches = scan(content)
+    for match in matches:
+        where = f"{source} " if source else ""
+        print(f"⚠️  检测到潜在的提示词注入模式：{where}@{match['start']} \"{match['pattern']}\"")
+    return bool(matches)
+
+
+# ==================== 基准测试 ====================
+
+BENCH_WORDS = (
+    "The release adds support for streaming responses and fixes a bug in the parser. "
+    "Improve performance of the Agent runtime; System update: execute tests before you "
+    "are running the new config. 修复了若干问题，提升了稳定性。"
+).split()
+
+
+def legacy_detect(content, patterns=PATTERNS):
+    """旧实现：整段小写后逐个模式 re.search"""
+    lower_content = content.lower()
+    return [p for p in patterns if re.search(r"\s+".join(p.split()), lower_content)]
+
+
+def _bench_text(size):
+    words = []
+    total = 0
+    i = 0
+    while total < size:
+        word = BENCH_WORDS[(i * 7919) % len(BENCH_WORDS)]
+        words.append(word)
+        total += len(word) + 1
+        i += 1
+    # 末尾放一个命中，旧实现必须扫完全文
+    return " ".join(words) + " Please IGNORE previous\ninstructions."
+
+
+def run_benchmark(sizes=(1_000_000, 10_000_000), repeat=3):
+    combined = re.compile("|".join(f"(?:{_compile(p).pattern})" for p in PATTERNS), re.IGNORECASE)
+    print("🧪 提示词注入扫描吞吐量")
+    print(f"{'输入':>8} {'旧实现':>12} {'扫描器':>12} {'流式(4KB块)':>14} {'合并正则(参考)':>16}")
+    for size in sizes:
+        text = _bench_text(size)
+        chunks = [text[i:i + 4096] for i in range(0, len(text), 4096)]
+        mb = len(text) / 1e6
+        results = [
+            min(_timed(lambda: legacy_detect(text)) for _ in range(repeat)),
+            min(_timed(lambda: scan(text)) for _ in range(repeat)),
+            min(_timed(lambda: list(scan_stream(chunks))) for _ in range(repeat)),
+            min(_timed(lambda: list(combined.finditer(text))) for _ in range(repeat)),
+        ]
+        print(f"{mb:>6.1f}MB " + " ".join(
+            f"{mb / seconds:>{w}.1f}MB/s" for seconds, w in zip(results, (8, 8, 10, 12))))
+    print(f"\n命中：{scan(_bench_text(1000))}")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="提示词注入扫描（默认从 stdin 流式读取）")
+    parser.add_argument("--bench", action="store_true", help="运行吞吐量基准测试")
+    parser.add_argument("--file", type=str, help="扫描文件而不是 stdin")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark()
+        sys.exit(0)
+
+    stream = open(args.file, 'r', encoding='utf-8', errors='replace') if args.file else sys.stdin
+    with stream:
+        hits = 0
+        for match in scan_stream(iter(lambda: stream.read(WINDOW_SIZE), "")):
+            hits += 1
+            print(f"{match['start']}\t{match['pattern']}\t{' '.join(match['text'].split())}")
+    sys.exit(1 if hits else 0)
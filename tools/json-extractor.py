@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+JSON Extractor - LLM 输出的容错 JSON 提取与 schema 校验
+功能：
+1. 定位 JSON：```json 代码块（含未闭合的代码块），或正文中第一个 { / [，忽略前后的说明文字
+2. 修复常见缺陷：尾随逗号、// 注释、Python 字面量 (True / False / None)、字符串内的原始换行
+3. 截断输出：截到最后一个完整的值并补齐括号
+4. 整体仍无法解析时逐个顶层字段抢救，数组字段（如 action_items）逐个元素抢救
+5. 按调用方声明的 schema 校验：类型可安全转换的自动转换（"7天" → 7），
+   缺少必填字段的数组元素丢弃
+6. 每一处修复 / 抢救 / 转换 / 丢弃都记录在报告中
+
+schema 写法（各调用方在提示词旁声明）：
+    str / int / float / bool       标量类型
+    [item_schema]                  数组
+    {"field": schema, "opt?": schema}   对象，字段名以 ? 结尾表示可选，未声明的字段原样保留
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    extractor = importlib.import_module("json-extractor")
+    data, report = extractor.extract(content, schema=ANALYSIS_SCHEMA)
+    print(extractor.format_report(report))
+    python3 json-extractor.py completion.txt
+"""
+
+import json
+import re
+
+FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
+OPEN_FENCE_RE = re.compile(r"```(?:json)?\s*\n?")
+CLOSERS = {"{": "}", "[": "]"}
+PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+_decoder = json.JSONDecoder()
+
+
+class ExtractionError(ValueError):
+    """completion 中没有可用的 JSON"""
+
+
+def _note(report, kind, path, detail):
+    report.append({"kind": kind, "path": path, "detail": detail})
+
+
+# ==================== 定位 ====================
+
+def locate(content, report):
+    """返回 JSON 文本（从第一个 { / [ 开始，可能带尾部内容）"""
+    blocks = [m.group(1) for m in FENCE_RE.finditer(content)]
+    blocks = [b for b in blocks if b.lstrip()[:1] in ("{", "[")]
+    if blocks:
+        if len(blocks) > 1:
+            _note(report, "repair", "$", f"发现 {len(blocks)} 个代码块，使用最长的一个")
+        return max(blocks, key=len)
+
+    fence = None
+    for fence in OPEN_FENCE_RE.finditer(content):
+        pass
+    if fence is not None and content[fence.end():].lstrip()[:1] in ("{", "["):
+        _note(report, "repair", "$", "代码块未闭合（输出可能被截断）")
+        return content[fence.end():]
+
+    starts = [i for i in (content.find("{"), content.find("[")) if i >= 0]
+    if not starts:
+        raise ExtractionError("completion 中没有 JSON")
+    return content[min(starts):]
+
+
+# ==================== 文本级修复 ====================
+
+def normalize(text):
+    """字符串感知的单遍修复
+
+    Returns:
+        (修复后的文本, 应用过的修复说明列表)
+    """
+    out = []
+    applied = set()
+    in_string = escape = False
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                out.append("\\n")
+                applied.add("字符串内的原始换行")
+                i += 1
+                continue
+            elif ch == "\t":
+                out.append("\\t")
+                applied.add("字符串内的原始制表符")
+                i += 1
+                continue
+            out.append(ch)
+            i += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            applied.add("// 注释")
+            continue
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in "}]":
+                applied.add("尾随逗号")
+                i += 1
+                continue
+        elif ch in "TFN":
+            for literal, replacement in PY_LITERALS.items():
+                if text.startswith(literal, i) and not text[i + len(literal):i + len(literal) + 1].isalnum():
+                    j = len(out) - 1
+                    while j >= 0 and out[j].isspace():
+                        j -= 1
+                    if j >= 0 and out[j] in (":", ",", "["):
+                        out.append(replacement)
+                        applied.add("Python 字面量")
+                        i += len(literal)
+                        break
+            else:
+                out.append(ch)
+                i += 1
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out), sorted(applied)
+
+
+def close_truncated(text):
+    """截断的 JSON：截到最后一个安全点（容器刚打开 / 逗号之前 / 容器刚闭合 / 完整的值之后）
+    并补齐括号；数组中被截断的元素（对象 / 数组）整个丢弃，不保留半个元素
+
+    完整的值：闭合的字符串值（不是键），或后面跟着空白的数字 / 字面量。
+    紧贴文本末尾的数字 / 字面量可能只有一半（"12" 可能是 "123"），不算安全点。
+
+    Returns:
+        (补齐后的文本, 补齐的括号数, 丢弃的字符数)；JSON 本身完整时原样返回，后两项为 0
+    """
+    stack = []          # [(括号, 起始位置)]
+    in_string = escape = in_scalar = False
+    string_is_value = False
+    last = None         # 上一个字符串外的非空白字符
+    safe = None
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                last = ch
+                if string_is_value:
+                    safe = (i + 1, list(stack))
+            continue
+        if in_scalar and (ch.isspace() or ch in ',}]'):
+            in_scalar = False
+            if ch.isspace():
+                safe = (i, list(stack))
+        if ch.isspace():
+            continue
+        if ch == '"':
+            in_string = True
+            # 对象中 ':' 之后的字符串是值，数组中的字符串都是值
+            string_is_value = last == ":" or bool(stack) and stack[-1][0] == "["
+        elif ch in "{[":
+            stack.append((ch, i))
+            safe = (i + 1, list(stack))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            safe = (i + 1, list(stack))
+            if not stack:
+                return text[:i + 1], 0, 0
+        elif ch == ",":
+            safe = (i, list(stack))
+        elif last in (":", ",", "[") or last is None:
+            in_scalar = True
+        last = ch
+    if safe is None:
+        return text, 0, 0
+    pos, open_stack = safe
+    for depth in range(1, len(open_stack)):
+        if open_stack[depth - 1][0] == "[":
+            pos = open_stack[depth][1]
+            open_stack = open_stack[:depth]
+            break
+    head = text[:pos].rstrip().rstrip(",")
+    closers = "".join(CLOSERS[ch] for ch, _ in reversed(open_stack))
+    return head + closers, len(open_stack), len(text) - len(head)
+
+
+def _loads_prefix(text):
+    """解析开头的一个 JSON 值，忽略其后的说明文字"""
+    value, _ = _decoder.raw_decode(text.lstrip())
+    return value
+
+
+# ==================== 逐字段抢救 ====================
+
+def _split_top(text):
+    """按深度 1 的逗号切分容器内容
+
+    Returns:
+        (opener, [(片段文本, 是否以分隔符 / 闭合括号结束)])
+    """
+    text = text.lstrip()
+    opener = text[:1]
+    pieces = []
+    depth = 0
+    in_string = escape = False
+    start = 1
+    for i in range(1, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            if depth == 0:
+                pieces.append((text[start:i], True))
+                return opener, pieces
+            depth -= 1
+        elif ch == "," and depth == 0:
+            pieces.append((text[start:i], True))
+            start = i + 1
+    pieces.append((text[start:], False))
+    return opener, pieces
+
+
+def _parse_fragment(fragment):
+    fixed, _ = normalize(fragment)
+    return _loads_prefix(fixed)
+
+
+def _salvage_array(raw, path, report):
+    """逐个元素解析数组，只保留完整且能解析的元素"""
+    _, pieces = _split_top(raw)
+    items = []
+    for index, (piece, terminated) in enumerate(pieces):
+        if not piece.strip():
+            continue
+        try:
+            items.append(_parse_fragment(piece))
+        except ValueError:
+            reason = "不完整" if not terminated else "无法解析"
+            _note(report, "drop", f"{path}[{index}]", f"元素{reason}，已丢弃")
+    return items
+
+
+def salvage(text, report):
+    """逐个顶层字段抢救（整体无法解析时使用）"""
+    opener, pieces = _split_top(text)
+    if opener == "[":
+        items = _salvage_array(text, "$", report)
+        _note(report, "salvage", "$", f"保留 {len(items)} 个完整元素")
+        return items
+
+    result = {}
+    for piece, terminated in pieces:
+        key_match = re.match(r'\s*"((?:[^"\\]|\\.)*)"\s*:\s*', piece, re.DOTALL)
+        if not key_match:
+            continue
+        key = json.loads(f'"{key_match.group(1)}"')
+        raw = piece[key_match.end():]
+        try:
+            result[key] = _parse_fragment(raw)
+            if not terminated:
+                _note(report, "salvage", key, "字段位于截断处，值完整，已保留")
+            continue
+        except ValueError:
+            pass
+        if raw.lstrip()[:1] == "[":
+            result[key] = _salvage_array(raw, key, report)
+            _note(report, "salvage", key, f"数组损坏，保留 {len(result[key])} 个完整元素")
+        elif raw.lstrip()[:1] == "{":
+            try:
+                result[key] = _parse_fragment(close_truncated(normalize(raw)[0])[0])
+                _note(report, "salvage", key, "对象不完整，保留已完整的字段")
+            except ValueError:
+                _note(report, "drop", key, "字段无法解析，已丢弃")
+        else:
+            _note(report, "drop", key, "字段无法解析，已丢弃")
+    if not result:
+        raise ExtractionError("没有可抢救的字段")
+    return result
+
+
+# ==================== schema 校验 ====================
+
+_INT_RE = re.compile(r"-?\d+")
+_FLOAT_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_TRUE = {"true", "yes", "是", "y", "1"}
+_FALSE = {"false", "no", "否", "n", "0"}
+
+
+def _coerce_scalar(value, kind, path, report):
+    """返回 (转换后的值, 是否有效)"""
+    if kind is bool:
+        if isinstance(value, bool):
+            return value, True
+        text = str(value).strip().lower()
+        if text in _TRUE or text in _FALSE:
+            _note(report, "coerce", path, f"{value!r} → {text in _TRUE}")
+            return text in _TRUE, True
+        return value, False
+    if kind in (int, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (int(value) if kind is int else value), True
+        match = (_INT_RE if kind is int else _FLOAT_RE).search(str(value))
+        if match:
+            converted = kind(match.group(0))
+            _note(report, "coerce", path, f"{value!r} → {converted}")
+            return converted, True
+        return value, False
+    if kind is str:
+        if isinstance(value, str):
+            return value, True
+        if isinstance(value, (int, float, bool)):
+            _note(report, "coerce", path, f"{value!r} → {str(value)!r}")
+            return str(value), True
+        return value, False
+    return value, True
+
+
+def validate(value, schema, path, report):
+    """按 schema 校验并转换，返回 (值, 是否有效)"""
+    if isinstance(schema, list):
+        item_schema = schema[0]
+        if not isinstance(value, list):
+            if value is None:
+                return [], True
+            if not isinstance(item_schema, (list, dict)):
+                _note(report, "coerce", path, "单个值 → 数组")
+                value = [value]
+            else:
+                return value, False
+        items = []
+        for index, item in enumerate(value):
+            checked, ok = validate(item, item_schema, f"{path}[{index}]", report)
+            if ok:
+                items.append(checked)
+            else:
+                _note(report, "drop", f"{path}[{index}]", "元素不符合 schema，已丢弃")
+        return items, True
+
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return value, False
+        result = dict(value)
+        for field, field_schema in schema.items():
+            optional = field.endswith("?")
+            name = field.rstrip("?")
+            field_path = f"{path}.{name}" if path != "$" else name
+            if name not in value or value[name] is None:
+                if not optional:
+                    _note(report, "missing", field_path, "缺少必填字段")
+                    return value, False
+                result.pop(name, None)
+                continue
+            checked, ok = validate(value[name], field_schema, field_path, report)
+            if ok:
+                result[name] = checked
+            elif optional:
+                _note(report, "drop", field_path, f"类型不符（{type(value[name]).__name__}），已移除")
+                result.pop(name)
+            else:
+                _note(report, "missing", field_path, f"必填字段类型不符（{type(value[name]).__name__}）")
+                return value, False
+        return result, True
+
+    return _coerce_scalar(value, schema, path, report)
+
+
+# ==================== 入口 ====================
+
+def extract(content, schema=None):
+    """从 completion 中提取 JSON 并按 schema 校验
+
+    Returns:
+        (data, report)，report = [{"kind": repair/salvage/coerce/drop/missing, "path", "detail"}, ...]
+    Raises:
+        ExtractionError: 没有任何可用的内容
+    """
+    report = []
+    text = locate(content, report)
+    data = None
+    try:
+        data = _loads_prefix(text)
+    except ValueError:
+        fixed, applied = normalize(text)
+        for item in applied:
+            _note(report, "repair", "$", item)
+        try:
+            data = _loads_prefix(fixed)
+        except ValueError:
+            closed, added, dropped = close_truncated(fixed)
+            try:
+                data = _loads_prefix(closed)
+                if added:
+                    _note(report, "repair", "$",
+                          f"输出被截断，丢弃末尾 {dropped} 字符的不完整内容并补齐 {added} 个括号")
+            except ValueError:
+                data = salvage(fixed, report)
+
+    if schema is not None:
+        data, ok = validate(data, schema, "$", report)
+        if not ok:
+            raise ExtractionError(f"顶层结构不符合 schema：{format_report(report)}")
+    return data, report
+
+
+def format_report(report):
+    """格式化提取报告（一行）"""
+    labels = {"repair": "修复", "salvage": "抢救", "coerce": "转换", "drop": "丢弃", "missing": "缺失"}
+    return "；".join(f"{labels.get(r['kind'], r['kind'])} {r['path']}: {r['detail']}" for r in report)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="LLM 输出容错 JSON 提取")
+    parser.add_argument("file", nargs="?", help="completion 文本文件（默认 stdin）")
+    args = parser.parse_args()
+
+    content = open(args.file, encoding='utf-8').read() if args.file else sys.stdin.read()
+    try:
+        data, report = extract(content)
+    except ExtractionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(json.dumps(data, ensure_ascii=False, indent=2))
+    for entry in report:
+        print(f"  - [{entry['kind']}] {entry['path']}: {entry['detail']}", file=sys.stderr)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher - 带权重的单词边界关键词匹配
+功能：
+1. 关键词 / 短语一次性编译成一个前缀树正则，整段文本只扫描一遍
+2. 单词边界匹配："ai" 不会命中 "said"、"maintain"、"Taiwan"
+3. 每个关键词带权重，返回相关度分数和命中的关键词，而不是布尔值
+4. 自带基准测试（与 any(kw in title ...) 子串写法对比）
+
+关键词写法（小写）：
+    "llm"              精确单词
+    "agent*"           词干匹配（agent / agents / agentic）
+    ("cve-", r"\\d+")   前缀 + 后缀正则
+
+用法：
+    matcher = KeywordMatcher({"openclaw": 5, "llm*": 3, "ai": 1})
+    score, matched = matcher.score("Show HN: an LLM agent for OpenClaw")
+    python3 keyword-matcher.py --bench
+"""
+
+import re
+import time
+
+
+def compile_keywords(entries):
+    """把关键词编译成一个前缀树正则
+
+    - 共享前缀只比较一次，每个位置的回溯最少
+    - 正则以字面量开头，re 模块可以用首字符集合快速跳过不可能匹配的位置
+    - 每个关键词末尾放一个空的命名分组 k<N>，match.lastgroup 即可反查关键词
+    - 左边界由调用方检查（正则开头加 \\b 会让首字符跳过优化失效），见 is_word_start()
+
+    Args:
+        entries: [(keyword, payload), ...]，keyword 写法见模块说明
+    Returns:
+        (compiled_regex, {group_name: payload})
+    """
+    trie = {}
+    leaves = {}
+    for keyword, payload in entries:
+        if isinstance(keyword, tuple):
+            literal, suffix = keyword
+        elif keyword.endswith('*'):
+            literal, suffix = keyword[:-1], r"\w*"
+        else:
+            literal, suffix = keyword, ""
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        name = f"k{len(leaves)}"
+        leaves[name] = payload
+        node.setdefault(None, []).append(f"{suffix}(?P<{name}>)")
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(
+            (item for item in node.items() if item[0] is not None), key=lambda item: item[0])]
+        # 更长的关键词优先，叶子（当前前缀本身就是关键词）放最后
+        branches.extend(node.get(None, []))
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    if not trie:
+        return re.compile(r"(?!)"), leaves
+    return re.compile(emit(trie) + r"\b"), leaves
+
+
+def is_word_start(text, pos):
+    """pos 处是否为单词开头（左边界检查）"""
+    return pos == 0 or not (text[pos - 1].isalnum() or text[pos - 1] == '_')
+
+
+class KeywordMatcher:
+    """带权重的关键词匹配器
+
+    Args:
+        weights: {keyword: weight}，keyword 写法见模块说明
+    """
+
+    def __init__(self, weights):
+        entries = []
+        for keyword, weight in weights.items():
+            entries.append((keyword, (self._label(keyword), weight)))
+        self.weights = dict(weights)
+        self.regex, self.leaves = compile_keywords(entries)
+
+    @staticmethod
+    def _label(keyword):
+        return keyword[0] if isinstance(keyword, tuple) else keyword.rstrip('*')
+
+    def matches(self, text):
+        """返回命中的 (关键词, 权重) 列表（同一关键词只计一次，按出现顺序）"""
+        lower = text.lower()
+        seen = {}
+        for match in self.regex.finditer(lower):
+            if not is_word_start(lower, match.start()):
+                continue
+            label, weight = self.leaves[match.lastgroup]
+            seen.setdefault(label, weight)
+        return list(seen.items())
+
+    def score(self, text):
+        """相关度分数 = 命中关键词的权重之和
+
+        Returns:
+            (score, [命中的关键词])
+        """
+        matched = self.matches(text)
+        return sum(weight for _, weight in matched), [label for label, _ in matched]
+
+
+# ==================== 基准测试 ====================
+
+BENCH_WEIGHTS = {
+    "openclaw": 5, "claude": 3, "llm*": 3, "agent*": 2, "gpt*": 2, "ai": 1,
+    "openai": 2, "anthropic": 2, "language model*": 2, "mcp": 2, "rag": 1,
+}
+SAMPLE_TITLES = [
+    "Show HN: An open-source LLM agent framework",
+    "Taiwan said to maintain chip export controls",
+    "The AI bubble and what comes after",
+    "Claude can now use tools in parallel",
+    "Maintaining a 20-year-old Perl codebase",
+    "Why I left big tech",
+    "OpenClaw 2.0 released with multi-agent support",
+    "A brief history of the Paris metro",
+    "GPT-5 system card",
+    "Airbnb raises prices again",
+]
+
+
+def legacy_filter(titles, keywords=('ai', 'agent', 'openclaw', 'llm', 'gpt', 'claude')):
+    """旧实现：子串匹配"""
+    return [t for t in titles if any(kw in t.lower() for kw in keywords)]
+
+
+def run_benchmark(sizes=(1_000, 10_000, 100_000), repeat=3):
+    matcher = KeywordMatcher(BENCH_WEIGHTS)
+    print("🧪 HN 标题关键词匹配基准测试")
+    print(f"{'标题数':>10} {'子串匹配':>12} {'编译匹配器':>12} {'每标题':>10} {'命中(旧/新)':>14}")
+    for n in sizes:
+        titles = [f"{SAMPLE_TITLES[i % len(SAMPLE_TITLES)]} ({i})" for i in range(n)]
+        legacy_time = min(_timed(lambda: legacy_filter(titles)) for _ in range(repeat))
+        new_time = min(_timed(lambda: [matcher.score(t) for t in titles]) for _ in range(repeat))
+        legacy_hits = len(legacy_filter(titles))
+        new_hits = sum(1 for t in titles if matcher.score(t)[0] > 0)
+        print(f"{n:>10} {legacy_time * 1000:>10.1f}ms {new_time * 1000:>10.1f}ms "
+              f"{new_time / n * 1e6:>8.2f}µs {legacy_hits:>7}/{new_hits}")
+    print("\n误命中示例（子串匹配命中、单词边界不命中）：")
+    for title in SAMPLE_TITLES:
+        if legacy_filter([title]) and not matcher.score(title)[0]:
+            print(f"  - {title}")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="带权重的关键词匹配")
+    parser.add_argument("--bench", action="store_true", help="运行基准测试")
+    parser.add_argument("text", nargs="*", help="要打分的文本")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark()
+    elif args.text:
+        print(KeywordMatcher(BENCH_WEIGHTS).score(' '.join(args.text)))
+    else:
+        parser.print_help()
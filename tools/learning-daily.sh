@@ -7,7 +7,7 @@ set -euo pipefail
 
 # ==================== 配置 ====================
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-WORKSPACE_DIR="/home/writer/.openclaw/workspace"
+WORKSPACE_DIR="${OPENCLAW_WORKSPACE:-/home/writer/.openclaw/workspace}"
 LOG_DIR="$WORKSPACE_DIR/logs/learning-upgrade"
 DIGEST_DIR="$WORKSPACE_DIR/logs/daily-digest"
 DATE_STAMP=$(date +%Y%m%d)
@@ -59,27 +59,30 @@ verify_env() {
 
 detect_injection() {
     local content="$1"
-    local patterns=(
-        "ignore previous instructions"
-        "disregard all"
-        "you are now"
-        "bypass safety"
-        "execute this command"
-        "run this code"
-        "system prompt"
-        "override your"
-    )
-    
-    local lower_content=$(echo "$content" | tr '[:upper:]' '[:lower:]')
-    
-    for pattern in "${patterns[@]}"; do
-        if [[ "$lower_content" == *"$pattern"* ]]; then
-            log "WARN" "检测到潜在的提示词注入模式：$pattern"
+    local matches
+    local status=0
+    
+    # Python 工具自己打印的注入告警行会复述命中的短语，先去掉，避免同一处内容重复计数
+    content=$(printf '%s\n' "$content" | grep -v "检测到潜在的提示词注入模式" || true)
+    
+    # 共享扫描器（injection-scanner.py）从 stdin 分块读取，命中时退出码为 1，
+    # 每行输出一个命中：偏移<TAB>模式<TAB>原文；其他非零退出码是扫描器本身出错，不算命中
+    matches=$(printf '%s' "$content" | python3 "$SCRIPT_DIR/injection-scanner.py") || status=$?
+    case "$status" in
+        0)
+            return 0
+            ;;
+        1)
+            while IFS=$'\t' read -r offset pattern _; do
+                log "WARN" "检测到潜在的提示词注入模式：$pattern (偏移 $offset)"
+            done <<< "$matches"
             return 1
-        fi
-    done
-    
-    return 0
+            ;;
+        *)
+            log "ERROR" "注入扫描失败（退出码 $status），本次输出未经检测"
+            return 0
+            ;;
+    esac
 }
 
 safe_exec_python() {
@@ -205,4 +208,7 @@ main() {
     log "INFO" "=========================================="
 }
 
-main "$@"
+# 被 source 时（测试）只加载函数，不执行主流程
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+    main "$@"
+fi
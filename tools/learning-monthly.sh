@@ -6,7 +6,8 @@
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-LOG_DIR="/home/writer/.openclaw/workspace/logs/learning-upgrade"
+WORKSPACE_DIR="${OPENCLAW_WORKSPACE:-/home/writer/.openclaw/workspace}"
+LOG_DIR="$WORKSPACE_DIR/logs/learning-upgrade"
 DATE_STAMP=$(date +%Y%m%d)
 ISO_DATE=$(date +%Y-%m-%d)
 MONTH=$(date +%Y-%m)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+LLM Client - tech-analyzer / weekly-reviewer / monthly-reviewer 共用的 LLM 调用层
+功能：
+1. Ark chat/completions 请求（走共享 HTTP 连接池）
+2. 按内容寻址的响应缓存：
+   - key = sha256(model, messages, temperature, max_tokens)，同一提示词当天重跑直接命中
+   - 同时保存原始 completion 和解析后的分析结果
+   - 命中但解析结果为空时用当前的解析逻辑重新解析原始 completion，不必重新请求
+   - TTL 和总大小上限可配置，超出上限时按最近使用时间淘汰
+3. 从 completion 中提取 JSON 分析结果（json-extractor：容错修复 + 按调用方 schema 校验，
+   修复 / 抢救的字段写入日志和缓存条目）
+4. 流式模式（SSE，默认开启）：边接收边跟踪 JSON 结构，
+   每个顶层字段接收完整时立即报告；流中断时抢救已接收的完整字段（不写入缓存）
+5. 本地替身服务器（--stub PORT），可模拟慢速生成和中途断流
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    llm = importlib.import_module("llm-client")
+    analysis = llm.chat_json(messages, api_key=ARK_API_KEY, max_tokens=4000, schema=ANALYSIS_SCHEMA)
+    python3 llm-client.py --stats
+    python3 llm-client.py --clear
+    python3 llm-client.py --stub 8766 --delay 0.05 --break-after 40
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+json_extractor = importlib.import_module("json-extractor")
+
+ARK_BASE_URL = os.environ.get("ARK_BASE_URL", "https://ark.cn-beijing.volces.com/api/coding/v3")
+DEFAULT_MODEL = "glm-4.7"
+# LLM_STREAM=0 改用一次性请求；流式模式下的超时是两次收到数据之间的空闲超时
+LLM_STREAM = os.environ.get("LLM_STREAM", "1") != "0"
+LLM_STREAM_IDLE_TIMEOUT = float(os.environ.get("LLM_STREAM_IDLE_TIMEOUT", "60"))
+
+# === 缓存配置 ===
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+LLM_CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", WORKSPACE_DIR / "cache" / "llm"))
+# LLM_CACHE=0 关闭缓存（例如想对同一份输入重新生成分析时）
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(3 * 86400)))
+LLM_CACHE_MAX_BYTES = int(float(os.environ.get("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
+
+def cache_key(model, messages, temperature, max_tokens):
+    """请求内容的 sha256（与字典键顺序无关）"""
+    canonical = json.dumps({
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class CompletionCache:
+    """按请求内容寻址的 completion 缓存
+
+    每个请求一个 JSON 文件（文件名为 cache_key），写入时先写临时文件再原子替换；
+    文件修改时间即最近使用时间（命中时更新），用于按大小淘汰。
+    """
+
+    def __init__(self, cache_dir=LLM_CACHE_DIR, ttl=LLM_CACHE_TTL, max_bytes=LLM_CACHE_MAX_BYTES,
+                 clock=time.time):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "reparsed": 0, "evicted": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """读取未过期的条目 {"content", "analysis", "created_at", ...}，不存在时返回 None"""
+        path = self._path(key)
+        if not path.exists():
+            self._count("misses")
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._count("misses")
+            return None
+        if self.clock() - entry.get("created_ts", 0) > self.ttl:
+            self._count("expired")
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key, content, analysis, meta=None):
+        """保存原始 completion 和解析结果，写入后按总大小淘汰"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "created_at": datetime.now().isoformat(),
+            "created_ts": self.clock(),
+            **(meta or {}),
+            "content": content,
+            "analysis": analysis,
+        }
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """删除过期条目（与 get 一致按 created_ts 计算），总大小仍超过上限时从最久未使用的条目开始删除"""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    created_ts = json.load(f).get("created_ts", 0)
+            except (OSError, json.JSONDecodeError):
+                created_ts = 0  # 无法读取的条目 get 也不会命中，按过期处理
+            entries.append((stat.st_mtime, stat.st_size, created_ts, path))
+        entries.sort(key=lambda e: e[0])
+        total = sum(size for _, size, _, _ in entries)
+        now = self.clock()
+        for _, size, created_ts, path in entries:
+            if now - created_ts <= self.ttl and total <= self.max_bytes:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            self._count("evicted")
+
+    def usage(self):
+        """(条目数, 总字节数)"""
+        sizes = [p.stat().st_size for p in self.cache_dir.glob("*.json")] if self.cache_dir.exists() else []
+        return len(sizes), sum(sizes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """获取进程内共享的 CompletionCache（LLM_CACHE=0 时返回 None）"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompletionCache()
+        return _cache
+
+
+def extract_json(content, schema=None):
+    """从 completion 中提取 JSON 并按 schema 校验
+
+    Returns:
+        (analysis, report)：report 为修复 / 抢救 / 转换 / 丢弃记录（见 json-extractor）
+    Raises:
+        json_extractor.ExtractionError（ValueError）：没有可用的 JSON
+    """
+    analysis, report = json_extractor.extract(content, schema=schema)
+    if report:
+        print(f"  🩹 JSON 提取：{json_extractor.format_report(report)}")
+    return analysis, report
+
+
+class FencedJsonAssembler:
+    """增量跟踪 completion 中的 JSON（```json 代码块，或以 { / [ 开头的裸 JSON）
+
+    逐字符维护括号栈和字符串状态，每个顶层字段接收完整时回调；
+    流中断后的部分结果由 json-extractor 截断补齐 / 逐字段抢救。
+
+    Args:
+        on_key: 顶层字段接收完整时的回调 on_key(key)
+    """
+
+    FENCE = "```json"
+
+    def __init__(self, on_key=None):
+        self.on_key = on_key
+        self.text = ""
+        self.start = None       # JSON 在 text 中的起始位置
+        self.end = None         # JSON 完整时的结束位置
+        self.pos = 0            # 已扫描到的位置
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.completed_keys = []
+        self._key_start = None
+        self._current_key = None
+        self._expect_key = False
+
+    @property
+    def complete(self):
+        return self.end is not None
+
+    def feed(self, delta):
+        self.text += delta
+        if self.start is None:
+            self._find_start()
+        if self.start is not None and self.end is None:
+            self._scan()
+
+    def _find_start(self):
+        fence = self.text.find(self.FENCE)
+        if fence >= 0:
+            brace = min((i for i in (self.text.find("{", fence), self.text.find("[", fence)) if i >= 0),
+                        default=-1)
+            if brace >= 0:
+                self.start = self.pos = brace
+            return
+        stripped = self.text.lstrip()
+        if stripped[:1] in ("{", "["):
+            self.start = self.pos = len(self.text) - len(stripped)
+
+    def _scan(self):
+        text = self.text
+        for i in range(self.pos, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self._key_start is not None:
+                        self._current_key = text[self._key_start:i]
+                        self._key_start = None
+                continue
+            if ch == '"':
+                self.in_string = True
+                if self._expect_key and len(self.stack) == 1:
+                    self._key_start = i + 1
+                    self._expect_key = False
+            elif ch in "{[":
+                self.stack.append(ch)
+                if len(self.stack) == 1:
+                    self._expect_key = ch == "{"
+            elif ch in "}]":
+                if len(self.stack) == 1:
+                    self._key_done()
+                if self.stack:
+                    self.stack.pop()
+                if not self.stack:
+                    self.end = i + 1
+                    self.pos = i + 1
+                    return
+            elif ch == ",":
+                if len(self.stack) == 1:
+                    self._key_done()
+                    self._expect_key = self.stack[0] == "{"
+        self.pos = len(text)
+
+    def _key_done(self):
+        if self._current_key is not None:
+            self.completed_keys.append(self._current_key)
+            if self.on_key:
+                self.on_key(self._current_key)
+            self._current_key = None
+
+    def result(self, schema=None):
+        """(解析结果, 提取报告)；未完整时为截断补齐 / 抢救后的部分结果，没有可用内容时为 (None, [])"""
+        if self.start is None:
+            return None, []
+        try:
+            return json_extractor.extract(self.text[self.start:], schema=schema)
+        except ValueError:
+            return None, []
+
+
+def stream_chat_completion(messages, api_key, model=DEFAULT_MODEL, temperature=0.7, max_tokens=4000,
+                           idle_timeout=LLM_STREAM_IDLE_TIMEOUT, on_key=None, timeout=None):
+    """以 SSE 流式请求 chat/completions，边接收边拼装 JSON
+
+    Args:
+        idle_timeout: 两次收到数据之间的空闲超时（秒）
+        timeout: 整个响应的总耗时上限（秒），到点按流中断处理；None 表示不限制
+    Returns:
+        (content, assembler, error)：error 为流中断时的异常，完整接收时为 None
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream"
+    }
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+    body = json.dumps(payload).encode('utf-8')
+    assembler = FencedJsonAssembler(on_key=on_key)
+    parts = []
+    start = time.monotonic()
+    deadline = start + timeout if timeout else None
+    if timeout:
+        # 空闲超时不超过总超时，一次阻塞读取不会越过截止时间太多
+        idle_timeout = min(idle_timeout, timeout)
+    first_token = None
+    done = False
+    skipped = 0
+    try:
+        for line in http_client.stream_lines('POST', f"{ARK_BASE_URL}/chat/completions",
+                                             headers=headers, body=body, timeout=idle_timeout):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"SSE 流超过总超时 {timeout}s")
+            line = line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                done = True
+                break
+            try:
+                event = json.loads(data.decode('utf-8'))
+                choices = event.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content") or ""
+            except (ValueError, AttributeError, IndexError, TypeError):
+                # 个别事件格式异常（网关插入的心跳 / 错误片段等）不应中断整个流
+                skipped += 1
+                print(f"  ⚠️  跳过无法解析的 SSE 事件：{data[:80]!r}")
+                continue
+            if delta and first_token is None:
+                first_token = time.monotonic() - start
+                print(f"  ⚡ 首个 token：{first_token:.1f}s")
+            parts.append(delta)
+            assembler.feed(delta)
+    except Exception as e:
+        if not parts:
+            # 一个 token 都没收到，与一次性请求失败没有区别
+            raise
+        return "".join(parts), assembler, e
+    if skipped:
+        print(f"  ⚠️  共跳过 {skipped} 个无法解析的 SSE 事件")
+    if not done:
+        # 连接被提前关闭时 http.client 不一定报错，以是否收到 [DONE] 为准
+        error = ConnectionError("SSE 流在 [DONE] 之前结束")
+        if not parts:
+            raise error
+        return "".join(parts), assembler, error
+    return "".join(parts), assembler, None
+
+
+def chat_completion(messages, api_key, model=DEFAULT_MODEL, temperature=0.7, max_tokens=4000,
+                    timeout=None):
+    """发送 chat/completions 请求，返回 completion 文本"""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    result = http_client.request_json('POST', f"{ARK_BASE_URL}/chat/completions",
+                                      headers=headers, data=payload, timeout=timeout)
+    return result['choices'][0]['message']['content']
+
+
+def chat_json(messages, api_key, model=DEFAULT_MODEL, temperature=0.7, max_tokens=4000,
+              timeout=None, tier=None, use_cache=True, stream=None, schema=None):
+    """请求 LLM 并解析 JSON 分析结果（带内容寻址缓存）
+
+    Args:
+        messages: chat messages
+        timeout: 总超时（秒）。一次性请求直接作为请求超时；流式模式下作为整个响应的截止时间
+                 （另有 LLM_STREAM_IDLE_TIMEOUT 空闲超时），到点按流中断处理，抢救已接收的字段
+        tier: 调用方标识（daily / weekly / monthly），只记录在缓存条目中
+        stream: 是否流式请求（默认 LLM_STREAM）
+        schema: 分析结果的 schema（见 json-extractor），缺少必填字段的元素会被丢弃
+    Returns:
+        解析后的分析结果
+    Raises:
+        网络错误 / JSON 解析错误（由调用方决定如何降级）
+    """
+    cache = get_cache() if use_cache else None
+    key = cache_key(model, messages, temperature, max_tokens)
+    entry = cache.get(key) if cache else None
+    if entry is not None:
+        if entry.get("analysis") is not None:
+            cache._count("hits")
+            print(f"  ♻️  LLM 缓存命中（{entry.get('created_at', '')[:16]}），跳过请求")
+            return entry["analysis"]
+        # 上次解析失败：用当前解析逻辑重新解析原始 completion
+        try:
+            analysis, report = extract_json(entry["content"], schema)
+        except ValueError:
+            analysis = None
+        if analysis is not None:
+            cache._count("reparsed")
+            cache.put(key, entry["content"], analysis,
+                      {"tier": entry.get("tier"), "model": model, "extraction_report": report})
+            return analysis
+
+    if stream is None:
+        stream = LLM_STREAM
+    if stream:
+        content, assembler, error = stream_chat_completion(
+            messages, api_key, model, temperature, max_tokens,
+            on_key=lambda k: print(f"  📥 已接收字段：{k}"), timeout=timeout
+        )
+        if error is not None:
+            # 流中断：抢救已接收的完整字段，不写入缓存（下次重跑会重新请求）
+            analysis, report = assembler.result(schema)
+            if not analysis:
+                raise error
+            print(f"  ⚠️  LLM 流中断（{error}），保留已接收的 {len(content)} 字符，"
+                  f"完整字段：{', '.join(assembler.completed_keys) or '无'}")
+            if report:
+                print(f"  🩹 JSON 提取：{json_extractor.format_report(report)}")
+            return analysis
+    else:
+        content = chat_completion(messages, api_key, model, temperature, max_tokens, timeout)
+    analysis, report = None, []
+    try:
+        analysis, report = extract_json(content, schema)
+    finally:
+        # 解析失败也保存原始 completion，解析逻辑改进后可直接重新解析
+        if cache is not None:
+            cache.put(key, content, analysis, {"tier": tier, "model": model, "extraction_report": report})
+    return analysis
+
+
+def format_stats():
+    """格式化 LLM 缓存统计"""
+    cache = get_cache()
+    if cache is None:
+        return "🧠 LLM 缓存：已关闭"
+    s = cache.stats
+    return f"🧠 LLM 缓存：命中 {s['hits'] + s['reparsed']} 次，未命中 {s['misses'] + s['expired']} 次"
+
+
+# ==================== 本地替身服务器 ====================
+
+STUB_COMPLETION = """以下是分析结果：
+
+```json
+{
+  "architecture_highlights": [
+    {"title": "插件化数据源", "description": "每个数据源独立超时", "impact": "中", "relevance_to_us": "高"}
+  ],
+  "security_trends": [
+    {"trend": "供应链安全", "details": "依赖固定版本", "priority": "P1", "action_required": "否"}
+  ],
+  "action_items": [
+    {"title": "引入响应缓存", "priority": "high", "steps": ["设计 TTL", "接入 http-client"], "expected_days": 3, "reason": "重跑免费"},
+    {"title": "流式 LLM 调用", "priority": "medium", "steps": ["SSE 解析", "增量拼装"], "expected_days": 5, "reason": "减少超时"}
+  ]
+}
+```
+"""
+
+
+def make_stub_server(port=0, delay=0.02, break_after=None, chunk_size=12, malformed=False):
+    """创建 chat/completions 替身服务器（未启动，port=0 时自动分配端口）
+
+    流式请求按 chunk_size 个字符一段、每段间隔 delay 秒返回 SSE；
+    break_after 为 N 时发送 N 段后直接断开连接（模拟流中断）；
+    malformed 为 True 时在第一段之后插入一个无法解析的 data 事件。
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not request.get("stream"):
+                time.sleep(delay * len(STUB_COMPLETION) / chunk_size)
+                body = json.dumps({"choices": [{"message": {"content": STUB_COMPLETION}}]}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            pieces = [STUB_COMPLETION[i:i + chunk_size] for i in range(0, len(STUB_COMPLETION), chunk_size)]
+            for n, piece in enumerate(pieces):
+                if break_after is not None and n >= break_after:
+                    # 不发送结束块直接断开
+                    self.close_connection = True
+                    return
+                event = {"choices": [{"delta": {"content": piece}}]}
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+                if malformed and n == 0:
+                    self._write_chunk(b"data: {\"choices\": [\n\n")
+                time.sleep(delay)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+
+
+def run_stub_server(port, delay=0.02, break_after=None, chunk_size=12, malformed=False):
+    """启动 chat/completions 替身服务器（参数见 make_stub_server）"""
+    server = make_stub_server(port, delay, break_after, chunk_size, malformed)
+    print(f"🧪 LLM 替身服务器：ARK_BASE_URL=http://127.0.0.1:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM 调用层 / completion 缓存")
+    parser.add_argument("--stats", action="store_true", help="显示缓存占用")
+    parser.add_argument("--clear", action="store_true", help="清空缓存")
+    parser.add_argument("--stub", type=int, metavar="PORT", help="启动本地替身服务器")
+    parser.add_argument("--delay", type=float, default=0.02, help="替身服务器每段 SSE 的间隔（秒）")
+    parser.add_argument("--break-after", type=int, help="替身服务器发送 N 段后断开")
+    parser.add_argument("--malformed", action="store_true", help="替身服务器插入一个无法解析的 SSE 事件")
+    args = parser.parse_args()
+
+    if args.stub is not None:
+        run_stub_server(args.stub, args.delay, args.break_after, malformed=args.malformed)
+        sys.exit(0)
+
+    cache = CompletionCache()
+    if args.clear:
+        for path in cache.cache_dir.glob("*.json"):
+            path.unlink()
+        print("✅ 已清空 LLM 缓存")
+    else:
+        count, size = cache.usage()
+        print(f"🧠 {cache.cache_dir}：{count} 条，{size / 1024 / 1024:.2f} MB / "
+              f"{cache.max_bytes / 1024 / 1024:.0f} MB，TTL {cache.ttl // 3600}h")
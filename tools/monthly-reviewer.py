@@ -10,17 +10,21 @@
   6. Telegram 推送
 """
 
+import importlib
 import json
 import os
-import ssl
 import sys
-import urllib.request
 from datetime import datetime, timedelta
 from pathlib import Path
 import calendar
 
+# 共享 HTTP 客户端 / LLM 调用层（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+llm = importlib.import_module("llm-client")
+
 # === 路径配置 ===
-WORKSPACE_DIR = Path("/home/writer/.openclaw/workspace")
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
 LOGS_DIR = WORKSPACE_DIR / "logs"
 SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
 TRACKER_DIR = SKILL_DIR / "tracker"
@@ -28,7 +32,6 @@ OUTPUT_DIR = LOGS_DIR / "monthly-review"
 
 # === API 配置 ===
 ARK_API_KEY = os.environ.get('ARK_API_KEY', '')
-ARK_BASE_URL = "https://ark.cn-beijing.volces.com/api/coding/v3"
 MATON_API_KEY = os.environ.get('MATON_API_KEY', '')
 MATON_BASE_URL = "https://gateway.maton.ai/notion/v1"
 
@@ -183,6 +186,53 @@ def load_monthly_action_items(year_month):
     }
 
 
+def load_github_activity(start_date, end_date):
+    """从 github-monitor 的本地历史读取日期范围内的 Releases / Issues（无需重新抓取）"""
+    try:
+        history = importlib.import_module("github-history")
+        return history.activity_in_range(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    except Exception as e:
+        print(f"  ⚠️ 无法读取 GitHub 历史: {e}")
+        return {}
+
+
+def load_github_trends(start_date, end_date):
+    """从本地时间序列读取日期范围内的 Star / Fork / Issue 变化（无需扫描 logs 目录）"""
+    try:
+        timeseries = importlib.import_module("github-timeseries")
+        return timeseries.trends_in_range(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    except Exception as e:
+        print(f"  ⚠️ 无法读取 GitHub 计数趋势: {e}")
+        return {}
+
+
+# LLM 月度分析结果的 schema（见 json-extractor）：必填字段为月报渲染时直接取用的字段
+MONTHLY_SCHEMA = {
+    "tech_evolution?": [{"week": str, "focus": str, "key_learning": str}],
+    "source_quality?": [{
+        "source": str,
+        "value_count?": int,
+        "high_value_rate?": float,
+        "rating?": int,
+    }],
+    "knowledge_coverage?": {
+        "covered_areas?": [str],
+        "deep_areas?": [str],
+        "blind_spots?": [str],
+    },
+    "growth_assessment?": {
+        "overall_score?": int,
+        "strengths?": [str],
+        "weaknesses?": [str],
+    },
+    "next_month_plan?": {
+        "focus_directions?": [{"direction": str, "reason": str, "resources?": [str]}],
+        "monthly_challenge?": {"title": str},
+        "avoid_pitfalls?": [str],
+    },
+}
+
+
 def llm_monthly_analysis(weekly_reports, daily_stats, action_items, month_info):
     """调用 LLM 进行月度综合分析"""
 
@@ -192,6 +242,17 @@ def llm_monthly_analysis(weekly_reports, daily_stats, action_items, month_info):
         if wr["content"]:
             weekly_summaries += f"\n--- {wr['week_id']} ---\n{wr['content'][:3000]}\n"
 
+    # GitHub 活动（直接读本地历史，不重新抓取）
+    github_section = ""
+    activity = load_github_activity(month_info["first_day"], month_info["last_day"])
+    if activity:
+        history = importlib.import_module("github-history")
+        github_section = f"\n## 本月 GitHub 活动（本地历史）\n{history.format_activity(activity, max_issues=15)[:4000]}\n"
+    trends = load_github_trends(month_info["first_day"], month_info["last_day"])
+    if trends:
+        timeseries = importlib.import_module("github-timeseries")
+        github_section += f"\n## 本月 GitHub 计数趋势\n{timeseries.format_trends(trends)[:2000]}\n"
+
     prompt = f"""你是一位资深技术成长顾问。请基于以下一个月的学习数据进行全面复盘分析。
 
 ## 月份: {month_info['year_month_cn']}
@@ -209,7 +270,7 @@ def llm_monthly_analysis(weekly_reports, daily_stats, action_items, month_info):
 
 ## 周报汇总 ({len(weekly_reports)} 周)
 {weekly_summaries[:10000]}
-
+{github_section}
 ## 请输出以下分析 (JSON 格式):
 
 ```json
@@ -261,39 +322,15 @@ def llm_monthly_analysis(weekly_reports, daily_stats, action_items, month_info):
 ```
 """
 
-    url = f"{ARK_BASE_URL}/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {ARK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "glm-4.7",
-        "messages": [
-            {"role": "system", "content": "你是一位技术成长导师，擅长从大量学习数据中提炼成长洞察和发展建议。"},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 5000
-    }
+    messages = [
+        {"role": "system", "content": "你是一位技术成长导师，擅长从大量学习数据中提炼成长洞察和发展建议。"},
+        {"role": "user", "content": prompt}
+    ]
 
-    ctx = ssl.create_default_context()
     try:
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode('utf-8'),
-            headers=headers,
-            method='POST'
-        )
-        response = urllib.request.urlopen(req, context=ctx, timeout=300)
-        result = json.load(response)
-        content = result['choices'][0]['message']['content']
-
-        import re
-        json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(1))
-        else:
-            return json.loads(content)
+        # 同一提示词重跑时（如 Notion / 文件写入失败后）直接取 LLM 缓存
+        return llm.chat_json(messages, api_key=ARK_API_KEY, max_tokens=5000, timeout=300, tier="monthly",
+                             schema=MONTHLY_SCHEMA)
     except Exception as e:
         print(f"❌ LLM 分析失败: {e}")
         return None
@@ -434,12 +471,8 @@ def notion_request(endpoint, method='GET', data=None):
         "Content-Type": "application/json",
         "Notion-Version": "2022-06-28"
     }
-    ctx = ssl.create_default_context()
     try:
-        req_data = json.dumps(data).encode('utf-8') if data else None
-        req = urllib.request.Request(url, data=req_data, headers=headers, method=method)
-        response = urllib.request.urlopen(req, context=ctx, timeout=30)
-        return json.load(response)
+        return http_client.request_json(method, url, headers=headers, data=data)
     except Exception as e:
         print(f"❌ Notion 请求失败: {e}")
         return None
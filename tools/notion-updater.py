@@ -7,15 +7,19 @@ Notion 日记更新器 v3.0
   - 保留原有的月份页面 / 每日页面自动创建逻辑
 """
 
+import importlib
 import json
 import os
-import ssl
-import urllib.request
+import sys
 from datetime import datetime
 from pathlib import Path
 
+# 共享 HTTP 客户端（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+
 # === 配置 ===
-WORKSPACE_DIR = Path("/home/writer/.openclaw/workspace")
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
 LOGS_DIR = WORKSPACE_DIR / "logs"
 SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
 
@@ -52,12 +56,8 @@ def notion_request(endpoint, method='GET', data=None):
         "Content-Type": "application/json",
         "Notion-Version": "2025-09-03"
     }
-    ctx = ssl.create_default_context()
     try:
-        req_data = json.dumps(data).encode('utf-8') if data else None
-        req = urllib.request.Request(url, data=req_data, headers=headers, method=method)
-        response = urllib.request.urlopen(req, context=ctx, timeout=30)
-        return json.load(response)
+        return http_client.request_json(method, url, headers=headers, data=data)
     except Exception as e:
         print(f"❌ Notion 请求失败: {e}")
         return None
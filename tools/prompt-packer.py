@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Prompt Packer - 按 token 预算打包提示词中的技术内容
+功能：
+1. 估算每条内容渲染后的 token 数（中日韩字符按 1 token / 字，其余按 4 字符 / token）
+2. 按相关度打分：数据源基础权重 + 评论数 + HN / Lobsters 分数 + 关键词相关度 + 时效性
+3. 按分数从高到低贪心装入预算（装不下的跳过，继续尝试更小的条目），
+   入选条目保持原有顺序（同一数据源的内容仍然相邻）
+4. 记录被裁掉的条目和预算使用情况
+
+环境变量：
+    PROMPT_TOKEN_BUDGET  技术内容部分的 token 预算（默认 2500）
+
+用法（文件名包含连字符，需通过 importlib 导入）：
+    packer = importlib.import_module("prompt-packer")
+    selected, dropped, stats = packer.pack(items)
+    print(packer.format_stats(stats, dropped))
+    python3 prompt-packer.py tech-content.json --budget 1500
+"""
+
+import math
+import os
+import re
+from datetime import datetime
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "2500"))
+
+# 数据源基础权重：统计类条目没有评论 / 分数，靠基础权重保证在预算宽松时入选
+SOURCE_WEIGHTS = {
+    "GitHub Release": 4.0,
+    "GitHub Issue": 1.0,
+    "GitHub Stats": 1.5,
+    "awesome-openclaw 新资源": 1.5,
+    "Hacker News": 1.0,
+    "Lobsters": 1.0,
+    "ClawHub": 1.0,
+}
+DEFAULT_SOURCE_WEIGHT = 1.0
+
+COMMENT_WEIGHT = 1.0
+SCORE_WEIGHT = 0.5
+RELEVANCE_WEIGHT = 0.3
+# 时效性加分：当天满分，每过 RECENCY_HALF_LIFE 天减半；没有日期的条目不加分
+RECENCY_WEIGHT = 2.0
+RECENCY_HALF_LIFE = 3.0
+
+# 不渲染进提示词的字段：source 已作为标题；status（跨天去重标记）和 relevance（HN 关键词相关度）
+# 只用于本地筛选和打分，对 LLM 没有意义且占用预算
+INTERNAL_FIELDS = {"source", "status", "relevance"}
+
+CJK_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def estimate_tokens(text):
+    """粗略估算 token 数（不依赖分词器，偏保守）"""
+    cjk = len(CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def render_item(item):
+    """单条内容 → 提示词片段（与 tech-analyzer 原有格式一致，不含内部字段）"""
+    lines = [f"\n### {item['source']}"]
+    for key, value in item.items():
+        if key not in INTERNAL_FIELDS:
+            lines.append(f"- {key}: {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _age_days(value, now):
+    try:
+        return max((now - datetime.fromisoformat(str(value)[:10])).days, 0)
+    except ValueError:
+        return None
+
+
+def score_item(item, now=None):
+    """相关度分数（越大越重要）"""
+    now = now or datetime.now()
+    score = SOURCE_WEIGHTS.get(item.get('source'), DEFAULT_SOURCE_WEIGHT)
+    score += COMMENT_WEIGHT * math.log1p(max(item.get('comments') or 0, 0))
+    score += SCORE_WEIGHT * math.log1p(max(item.get('score') or 0, 0))
+    score += RELEVANCE_WEIGHT * (item.get('relevance') or 0)
+    if item.get('date'):
+        age = _age_days(item['date'], now)
+        if age is not None:
+            score += RECENCY_WEIGHT * 0.5 ** (age / RECENCY_HALF_LIFE)
+    return score
+
+
+def pack(items, budget=None, now=None):
+    """按预算挑选内容
+
+    Returns:
+        (selected, dropped, stats)：selected 保持输入顺序；
+        dropped = [{"item", "score", "tokens"}, ...]（按分数从高到低）；
+        stats = {"budget", "used", "total", "kept", "dropped"}
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    now = now or datetime.now()
+    scored = []
+    for index, item in enumerate(items):
+        scored.append((score_item(item, now), index, estimate_tokens(render_item(item))))
+    scored.sort(key=lambda s: (-s[0], s[1]))
+
+    used = 0
+    kept, dropped = set(), []
+    for score, index, tokens in scored:
+        if used + tokens <= budget:
+            used += tokens
+            kept.add(index)
+        else:
+            dropped.append({"item": items[index], "score": round(score, 2), "tokens": tokens})
+
+    selected = [item for index, item in enumerate(items) if index in kept]
+    stats = {
+        "budget": budget,
+        "used": used,
+        "total": sum(tokens for _, _, tokens in scored),
+        "kept": len(selected),
+        "dropped": len(dropped),
+    }
+    return selected, dropped, stats
+
+
+def render(items):
+    return "".join(render_item(item) for item in items)
+
+
+def format_stats(stats, dropped=()):
+    """格式化打包结果（含被裁掉的条目）"""
+    lines = [f"📦 提示词打包：{stats['kept']} 条入选，{stats['dropped']} 条裁掉，"
+             f"约 {stats['used']}/{stats['budget']} tokens（全部内容约 {stats['total']} tokens）"]
+    for entry in dropped:
+        item = entry["item"]
+        label = item.get('title') or f"{item.get('stars', '?')} stars"
+        lines.append(f"  ✂️  [{item.get('source')}] {str(label)[:60]}"
+                     f"（分数 {entry['score']}，约 {entry['tokens']} tokens）")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="按 token 预算打包技术内容")
+    parser.add_argument("file", help="技术内容 JSON 文件（extract_technical_content 的输出列表）")
+    parser.add_argument("--budget", type=int, default=PROMPT_TOKEN_BUDGET, help="token 预算")
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        content = json.load(f)
+    selected, dropped, stats = pack(content, args.budget)
+    print(format_stats(stats, dropped))
+    for item in selected:
+        print(f"  ✅ [{item.get('source')}] {str(item.get('title', ''))[:60]}（分数 {score_item(item):.2f}）")
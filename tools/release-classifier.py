@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Release Classifier - Release notes 单遍多模式分类器
+功能：
+1. 所有类别的关键词编译成一个带命名分组的正则（带单词边界）
+2. 对完整 release notes 只扫描一遍，按行打上类别标签
+3. 类别：security / cve (CVE、GHSA 编号) / breaking / performance / deprecation
+4. 自带基准测试（与旧的逐行 lower() + 子串匹配写法对比）
+
+用法：
+    python3 release-classifier.py --bench
+    python3 release-classifier.py --file CHANGELOG.md
+"""
+
+import importlib
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+keyword_matcher = importlib.import_module("keyword-matcher")
+
+# 类别 → 关键词（小写；"*" 结尾表示词干匹配，元组为 (前缀, 后缀正则)）
+CATEGORY_KEYWORDS = {
+    "cve": [
+        ("cve-", r"\d{4}-\d{4,7}"),
+        ("ghsa", r"(?:-[0-9a-z]{4}){3}"),
+    ],
+    "security": [
+        "security", "vulnerab*", "exploit*", "xss", "csrf", "ssrf", "rce",
+        "command injection", "code injection", "prompt injection", "sql injection",
+        "privilege escalation", "auth bypass", "authentication bypass",
+        "authorization bypass", "sandbox escape", "path traversal", "sanitiz*",
+    ],
+    "breaking": [
+        "breaking", "breaking change", "breaking changes",
+        "backward incompatible", "backwards incompatible",
+        "backward-incompatible", "backwards-incompatible",
+        "no longer supported", "removed support", "migration required",
+    ],
+    "performance": [
+        "perf", "performance", "faster", "speed up", "speeds up", "sped up",
+        "latency", "throughput", "optimiz*", "optimis*", "memory usage",
+    ],
+    "deprecation": [
+        "deprecat*", "will be removed", "scheduled for removal",
+    ],
+}
+
+CATEGORIES = list(CATEGORY_KEYWORDS)
+
+
+# 所有类别的关键词合并编译成一个前缀树正则，match.lastgroup 反查类别
+CLASSIFIER_RE, LEAF_CATEGORY = keyword_matcher.compile_keywords(
+    (keyword, category) for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords
+)
+# 少数字符小写后长度会变（如 "İ"），这种文本改用忽略大小写的正则扫描原文，保证偏移准确
+CLASSIFIER_CI_RE = re.compile(CLASSIFIER_RE.pattern, re.IGNORECASE)
+
+
+def classify_text(text):
+    """单遍扫描文本，返回带类别标签的行（只返回命中的行，按出现顺序）
+
+    Returns:
+        [{"line_no": 行号(从 1 开始), "text": 行内容, "categories": [...], "ids": [CVE/GHSA 编号]}]
+    """
+    lower = text.lower()
+    if len(lower) == len(text):
+        target, regex = lower, CLASSIFIER_RE
+    else:
+        target, regex = text, CLASSIFIER_CI_RE
+    lines = []
+    entry = None
+    line_end = -1
+    line_no = 1
+    scanned = 0
+    for match in regex.finditer(target):
+        start = match.start()
+        if not keyword_matcher.is_word_start(target, start):
+            continue  # 词中间的命中（如 "insecurity"）
+        if entry is None or start > line_end:
+            # 命中落在新的一行：只统计上一行之后到当前行首之间的换行，整体仍是一遍扫描
+            line_start = target.rfind('\n', 0, start) + 1
+            line_no += target.count('\n', scanned, line_start)
+            scanned = line_start
+            line_end = target.find('\n', start)
+            if line_end == -1:
+                line_end = len(target)
+            entry = {
+                "line_no": line_no,
+                "text": text[line_start:line_end].strip(),
+                "categories": [],
+                "ids": [],
+            }
+            lines.append(entry)
+        category = LEAF_CATEGORY[match.lastgroup]
+        if category not in entry["categories"]:
+            entry["categories"].append(category)
+        if category == "cve":
+            ident = match.group().lower()
+            entry["ids"].append(f"GHSA{ident[4:]}" if ident.startswith("ghsa") else ident.upper())
+    return lines
+
+
+def classify_notes(text, max_line=200):
+    """对一份完整 release notes 分类，返回按类别聚合的行
+
+    Returns:
+        {category: [行内容, ...]}（只包含命中的类别）
+    """
+    by_category = {}
+    for entry in classify_text(text or ''):
+        for category in entry["categories"]:
+            by_category.setdefault(category, []).append(entry["text"][:max_line])
+    return by_category
+
+
+# ==================== 基准测试 ====================
+
+def _legacy_keywords():
+    """旧实现扩展到同样的类别时需要检查的子串"""
+    keywords = {}
+    for category, items in CATEGORY_KEYWORDS.items():
+        for keyword in items:
+            literal = keyword[0] if isinstance(keyword, tuple) else keyword.rstrip('*')
+            keywords[literal] = category
+    return keywords
+
+LEGACY_KEYWORDS = _legacy_keywords()
+
+SAMPLE_LINES = [
+    "- fix: typo in README",
+    "- feat: add Telegram channel support",
+    "- security: sanitize tool arguments before shell execution (GHSA-4x5v-9q2r-abcd)",
+    "- perf: 30% faster session restore, lower memory usage",
+    "- BREAKING CHANGE: config key `agents.default` renamed to `agents.primary`",
+    "- deprecate `--legacy-auth`; it will be removed in v2.0",
+    "- Fixes CVE-2026-12345 path traversal in skill loader",
+    "- chore: bump dependencies",
+    "- docs: clarify maintenance window for Taiwan mirror",
+    "- fix(gateway): reconnect after websocket close",
+    "- feat(skills): allow per-skill environment overrides",
+    "- refactor: split channel adapters into separate modules",
+    "- test: cover cron scheduler edge cases",
+    "- ci: cache node_modules between jobs",
+    "- fix: prefix check in memory search results",
+    "- docs: perfectly insecurity-free wording",
+]
+
+
+def make_changelog(n_lines):
+    return '\n'.join(SAMPLE_LINES[i % len(SAMPLE_LINES)] + f" #{i}" for i in range(n_lines))
+
+
+def legacy_scan(text):
+    """旧实现的写法：逐行 lower()，再逐个关键词做子串匹配（无单词边界）"""
+    hits = []
+    for line in text.split('\n'):
+        lower = line.lower()
+        categories = {category for kw, category in LEGACY_KEYWORDS.items() if kw in lower}
+        if categories:
+            hits.append((line.strip(), categories))
+    return hits
+
+
+def run_benchmark(sizes=(1_000, 10_000, 100_000), repeat=3):
+    print("🧪 Release notes 分类基准测试")
+    print(f"{'行数':>10} {'大小':>10} {'旧实现':>12} {'单遍正则':>12} {'吞吐':>14} {'命中行(旧/新)':>16}")
+    for n in sizes:
+        text = make_changelog(n)
+        legacy_time = min(_timed(legacy_scan, text) for _ in range(repeat))
+        new_time = min(_timed(classify_text, text) for _ in range(repeat))
+        legacy_hits = len(legacy_scan(text))
+        new_hits = len(classify_text(text))
+        mb = len(text.encode('utf-8')) / 1e6
+        print(f"{n:>10} {mb:>8.2f}MB {legacy_time * 1000:>10.1f}ms {new_time * 1000:>10.1f}ms "
+              f"{mb / new_time:>10.1f}MB/s {legacy_hits:>8}/{new_hits}")
+
+
+def _timed(fn, arg):
+    start = time.perf_counter()
+    fn(arg)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Release notes 分类器")
+    parser.add_argument("--bench", action="store_true", help="运行基准测试")
+    parser.add_argument("--file", type=str, help="对文件内容分类并输出命中行")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark()
+    elif args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            for entry in classify_text(f.read()):
+                ids = f" {' '.join(entry['ids'])}" if entry['ids'] else ""
+                print(f"{entry['line_no']:>6} [{','.join(entry['categories'])}]{ids} {entry['text'][:120]}")
+    else:
+        parser.print_help()
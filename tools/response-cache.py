@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Response Cache - 共享 HTTP 响应缓存（单个 SQLite 文件）
+功能：
+1. 按端点类别（host / 路径前缀）配置 TTL，新鲜期内的 GET 完全不发请求
+2. 总大小上限，超出时按最近访问时间（LRU）淘汰
+3. 命中 / 未命中 / 过期 / 淘汰统计
+4. 多线程共用一个连接（加锁），WAL 模式下多个脚本进程可同时读写
+
+http-client 的 GET 请求默认经过这里：当天重跑 learning-daily.sh 时，
+GitHub / HN / awesome README 的响应都直接取自缓存。
+
+用法：
+    python3 response-cache.py --stats
+    python3 response-cache.py --purge-expired
+    python3 response-cache.py --clear
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
+CACHE_PATH = Path(os.environ.get("HTTP_CACHE_PATH", WORKSPACE_DIR / "cache" / "http-cache.sqlite"))
+# HTTP_CACHE=0 关闭缓存（例如需要强制拿最新数据时）
+CACHE_ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+CACHE_MAX_BYTES = int(float(os.environ.get("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# === TTL 策略（秒）===
+# (host, 路径前缀, TTL)，按顺序匹配，第一条命中生效；TTL 为 0 或未命中的端点不缓存
+CACHE_POLICY = [
+    ("api.github.com", "/rate_limit", 0),
+    ("api.github.com", "/repos/SamurAIGPT/awesome-openclaw/readme", 12 * 3600),
+    ("api.github.com", "", 6 * 3600),
+    ("hacker-news.firebaseio.com", "/v0/topstories", 15 * 60),
+    # HN item 不缓存：hn-fetcher 的 ItemCache 已按字段缓存，刷新请求必须拿到最新的分数 / 评论数
+    ("hacker-news.firebaseio.com", "/v0/item/", 0),
+    ("lobste.rs", "", 30 * 60),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+def cache_key(method, url):
+    return hashlib.sha256(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite 响应缓存
+
+    条目：status、响应头（[[name, value], ...]）、响应体、写入 / 过期 / 最近访问时间。
+    """
+
+    def __init__(self, path=CACHE_PATH, policy=None, max_bytes=CACHE_MAX_BYTES, clock=time.time):
+        self.path = Path(path)
+        self.policy = CACHE_POLICY if policy is None else policy
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+
+    def _db(self):
+        """延迟打开数据库（不发 GET 的脚本不会创建文件）"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def ttl_for(self, url):
+        """按策略表查找 TTL（秒）"""
+        parts = urlsplit(url)
+        for host, prefix, ttl in self.policy:
+            if parts.hostname == host and (parts.path or '/').startswith(prefix):
+                return ttl
+        return 0
+
+    def get(self, method, url):
+        """读取新鲜的缓存条目
+
+        Returns:
+            (status, headers, body)，未缓存 / 已过期时返回 None
+        """
+        if self.ttl_for(url) <= 0:
+            return None
+        key = cache_key(method, url)
+        now = self.clock()
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            status, headers, body, expires_at = row
+            if expires_at <= now:
+                self.stats["expired"] += 1
+                return None
+            self._db().execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.stats["hits"] += 1
+        return status, json.loads(headers), bytes(body)
+
+    def put(self, method, url, status, headers, body):
+        """写入响应（只缓存 2xx，且端点 TTL > 0），写入后按总大小淘汰"""
+        ttl = self.ttl_for(url)
+        if ttl <= 0 or not 200 <= status < 300:
+            return
+        now = self.clock()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, size, stored_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(method, url), url, status, json.dumps(list(headers)), body,
+                 len(body), now, now + ttl, now)
+            )
+            self.stats["stored"] += 1
+            self._evict(db)
+
+    def _evict(self, db):
+        """总大小超过上限时，从最久未访问的条目开始删除"""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed, keys = 0, []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            keys.append(key)
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in keys])
+        self.stats["evicted"] += len(keys)
+
+    def purge_expired(self):
+        """删除已过期的条目，返回删除数"""
+        with self._lock:
+            cursor = self._db().execute("DELETE FROM responses WHERE expires_at <= ?", (self.clock(),))
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+    def usage(self):
+        """(条目数, 总字节数)"""
+        with self._lock:
+            return tuple(self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """获取进程内共享的 ResponseCache（HTTP_CACHE=0 时返回 None）"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def format_stats(stats=None):
+    """格式化缓存统计"""
+    if stats is None:
+        cache = get_cache()
+        if cache is None:
+            return "🗄️  响应缓存：已关闭"
+        stats = cache.stats
+    return (f"🗄️  响应缓存：命中 {stats['hits']} 次，未命中 {stats['misses']} 次，"
+            f"过期 {stats['expired']} 次，淘汰 {stats['evicted']} 条")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="共享 HTTP 响应缓存")
+    parser.add_argument("--stats", action="store_true", help="显示缓存占用")
+    parser.add_argument("--purge-expired", action="store_true", help="删除已过期的条目")
+    parser.add_argument("--clear", action="store_true", help="清空缓存")
+    args = parser.parse_args()
+
+    cache = ResponseCache()
+    if args.clear:
+        cache.clear()
+        print("✅ 已清空响应缓存")
+    elif args.purge_expired:
+        print(f"✅ 删除 {cache.purge_expired()} 条过期条目")
+    else:
+        count, size = cache.usage()
+        print(f"🗄️  {cache.path}：{count} 条，{size / 1024 / 1024:.1f} MB / "
+              f"{cache.max_bytes / 1024 / 1024:.0f} MB")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Retry Policy - 统一重试引擎
+功能：
+1. 指数退避 + 全抖动（full jitter），支持服务端 Retry-After
+2. 只对可重试的状态码 / 网络错误重试；非幂等请求（POST / PATCH）只在请求确定未被处理时重试
+3. 整次运行共享的重试预算：单个不稳定的 host 不会拖住整条流水线
+4. 按 host 统计请求次数、重试次数、退避等待时间、放弃次数
+
+http-client 的所有请求默认经过 DEFAULT_POLICY；调用方可传入其他策略或 NO_RETRY。
+"""
+
+import email.utils
+import http.client
+import os
+import random
+import threading
+import time
+from datetime import timezone
+
+# 幂等请求可重试的状态码
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# 非幂等请求只在服务端明确表示未处理时重试
+UNSAFE_RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# 整次运行最多重试次数（所有 host 共享）
+RETRY_BUDGET = int(os.environ.get("RETRY_BUDGET", "30"))
+
+
+class RetryBudget:
+    """整次运行共享的重试预算（线程安全）"""
+
+    def __init__(self, max_retries=RETRY_BUDGET):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self):
+        """消耗一次重试额度，额度用完返回 False"""
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+
+class RetryStats:
+    """按 host 统计重试情况"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts = {}
+
+    def record(self, host, key, n=1):
+        with self._lock:
+            stats = self.hosts.setdefault(host, {
+                "calls": 0, "retries": 0, "wait_seconds": 0.0, "gave_up": 0, "budget_exhausted": 0
+            })
+            stats[key] += n
+
+    def snapshot(self):
+        with self._lock:
+            return {host: dict(stats) for host, stats in self.hosts.items()}
+
+
+class RetryPolicy:
+    """重试策略
+
+    Args:
+        max_attempts: 最多尝试次数（含第一次）
+        base_delay / max_delay: 第 n 次重试的退避上限为 min(max_delay, base_delay * 2^n)，
+            实际等待在 [0, 上限] 内随机（full jitter，避免多个线程同时重试）
+        retry_statuses: 幂等请求可重试的状态码
+        unsafe_retry_statuses: 非幂等请求可重试的状态码
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30,
+                 retry_statuses=RETRY_STATUSES, unsafe_retry_statuses=UNSAFE_RETRY_STATUSES):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.unsafe_retry_statuses = frozenset(unsafe_retry_statuses) & self.retry_statuses
+
+    def should_retry(self, method, status=None, error=None):
+        """判断这次失败是否值得重试"""
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            if not isinstance(error, (OSError, http.client.HTTPException)):
+                return False
+            if idempotent:
+                return True
+            # 非幂等请求：只有连接被拒绝（请求肯定没发出去）才重试，超时 / 断连可能已被处理
+            return isinstance(error, ConnectionRefusedError)
+        if status is None:
+            return False
+        return status in (self.retry_statuses if idempotent else self.unsafe_retry_statuses)
+
+    def backoff(self, attempt, retry_after=None):
+        """第 attempt 次重试前的等待秒数（优先使用 Retry-After）"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+DEFAULT_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+_budget = RetryBudget()
+_stats = RetryStats()
+
+
+def get_budget():
+    return _budget
+
+
+def get_stats():
+    """按 host 的重试统计快照"""
+    return _stats.snapshot()
+
+
+def parse_retry_after(headers, now=None):
+    """解析 Retry-After：秒数或 HTTP-date（RFC 9110），返回距现在的秒数；缺失 / 无法解析时返回 None"""
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(when.timestamp() - (time.time() if now is None else now), 0)
+
+
+def call(fn, host, method="GET", policy=None, deadline=None, budget=None, stats=None):
+    """按策略执行 fn，失败时退避重试
+
+    Args:
+        fn: 无参函数，返回带 status / headers 属性的响应，或抛出异常
+        host: 用于统计的 host
+        deadline: time.monotonic() 截止时刻，退避等待不会越过它
+    Returns:
+        最后一次的响应（状态码由调用方处理）；最后一次抛异常时原样抛出
+    """
+    policy = policy or DEFAULT_POLICY
+    budget = budget or _budget
+    stats = stats or _stats
+    stats.record(host, "calls")
+
+    for attempt in range(policy.max_attempts):
+        response, error = None, None
+        try:
+            response = fn()
+        except Exception as e:
+            error = e
+
+        status = getattr(response, "status", None)
+        if not policy.should_retry(method, status, error):
+            break
+        if attempt == policy.max_attempts - 1:
+            stats.record(host, "gave_up")
+            break
+
+        delay = policy.backoff(attempt, parse_retry_after(getattr(response, "headers", None)))
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            stats.record(host, "gave_up")
+            break
+        if not budget.spend():
+            stats.record(host, "budget_exhausted")
+            break
+        stats.record(host, "retries")
+        stats.record(host, "wait_seconds", delay)
+        time.sleep(delay)
+
+    if error is not None:
+        raise error
+    return response
+
+
+def format_stats(stats=None):
+    """格式化重试统计（只列出发生过重试或放弃的 host）"""
+    stats = stats if stats is not None else get_stats()
+    parts = [
+        f"{host} 重试 {s['retries']} 次 / 等待 {s['wait_seconds']:.1f}s"
+        + (f" / 放弃 {s['gave_up'] + s['budget_exhausted']} 次" if s['gave_up'] + s['budget_exhausted'] else "")
+        for host, s in stats.items() if s['retries'] or s['gave_up'] or s['budget_exhausted']
+    ]
+    used = _budget.used
+    return f"🔁 重试：{'；'.join(parts) if parts else '无'}（预算 {used}/{_budget.max_retries}）"
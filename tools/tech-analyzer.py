@@ -5,23 +5,27 @@
      行动项自动写入 tracker/action-items.json
 """
 
+import importlib
 import json
 import os
-import ssl
 import sys
-import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+# 共享 LLM 调用层（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+llm = importlib.import_module("llm-client")
+packer = importlib.import_module("prompt-packer")
+fingerprint = importlib.import_module("content-fingerprint")
+
 # === 路径配置 ===
-WORKSPACE_DIR = Path("/home/writer/.openclaw/workspace")
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
 LOGS_DIR = WORKSPACE_DIR / "logs"
 OUTPUT_DIR = LOGS_DIR / "tech-analyzer"
 SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
 
 # === API 配置 ===
 ARK_API_KEY = os.environ.get('ARK_API_KEY', '')
-ARK_BASE_URL = "https://ark.cn-beijing.volces.com/api/coding/v3"
 
 def load_env():
     """加载环境变量"""
@@ -87,20 +91,21 @@ def extract_technical_content(reports):
         gh = reports['github_json']
         repos = gh.get('repos', {})
 
-        # 主仓库数据
-        main_repo = repos.get('main', {})
-        for rel in main_repo.get('releases', []):
+        # 主仓库数据（仓库清单来自配置，主仓库 key 记录在报告的 primary 字段）
+        main_repo = repos.get(gh.get('primary', 'main')) or {}
+        for rel in main_repo.get('releases') or []:
             content.append({
                 "source": "GitHub Release",
                 "title": f"{rel['tag']} - {rel['name']}",
                 "date": rel.get('published_at', ''),
-                "details": rel.get('body', '')[:500]
+                "details": (rel.get('body') or '')[:500]
             })
 
-        for topic in main_repo.get('trending_topics', []):
+        for topic in main_repo.get('trending_topics') or []:
             content.append({
                 "source": "GitHub Issue",
                 "title": topic.get('title', ''),
+                "date": topic.get('created_at', ''),
                 "comments": topic.get('comments', 0),
                 "labels": ', '.join(topic.get('labels', []))
             })
@@ -118,12 +123,14 @@ def extract_technical_content(reports):
         comm = reports['community_json']
         sources = comm.get('sources', {})
 
+        # 只传首次出现的资源（跨天资源索引去重），不再每天发送汇总数量
         awesome = sources.get('awesome-openclaw', {})
-        if awesome:
+        for resource in awesome.get('new_resources', [])[:5]:
             content.append({
-                "source": "awesome-openclaw",
-                "total_resources": awesome.get('total_resources', 0),
-                "categories": awesome.get('category_count', 0)
+                "source": "awesome-openclaw 新资源",
+                "title": resource.get('title', ''),
+                "category": resource.get('category', ''),
+                "url": resource.get('url', '')
             })
 
         hn = sources.get('hacker-news', {})
@@ -132,6 +139,16 @@ def extract_technical_content(reports):
                 "source": "Hacker News",
                 "title": story.get('title', ''),
                 "score": story.get('score', 0),
+                "comments": story.get('comments', 0),
+                "relevance": story.get('relevance', 0)
+            })
+
+        lobsters = sources.get('lobsters', {})
+        for story in lobsters.get('stories', [])[:3]:
+            content.append({
+                "source": "Lobsters",
+                "title": story.get('title', ''),
+                "score": story.get('score', 0),
                 "comments": story.get('comments', 0)
             })
 
@@ -146,19 +163,41 @@ def extract_technical_content(reports):
     return content
 
 
+# LLM 分析结果的 schema（见 json-extractor）：必填字段为报告渲染时直接取用的字段，
+# 缺少必填字段的元素丢弃，其余字段原样保留
+ANALYSIS_SCHEMA = {
+    "architecture_highlights?": [{"title": str, "description": str}],
+    "security_trends?": [{"trend": str, "priority": str, "details": str}],
+    "performance_optimizations?": [{"area": str, "technique": str}],
+    "community_patterns?": [{"pattern": str}],
+    "technical_debt_risks?": [{"risk": str, "severity": str}],
+    "innovation_opportunities?": [{"opportunity": str}],
+    "action_items?": [{
+        "title": str,
+        "priority?": str,
+        "steps?": [str],
+        "expected_days?": int,
+        "reason?": str,
+    }],
+}
+
+
 def analyze_with_llm(technical_content):
-    """使用 LLM 进行技术深度分析 (v3.0: 增加 action_items)"""
+    """使用 LLM 进行技术深度分析 (v3.0: 增加 action_items)
+
+    Returns:
+        (analysis, selected)：selected 为按 token 预算实际写入提示词的条目；分析失败时 analysis 为 None
+    """
 
     prompt = """你是一位资深的 AI 架构师和技术分析师。请分析以下 OpenClaw 技术动态，并输出深度洞察：
 
 ## 技术内容
 """
 
-    for item in technical_content[:10]:
-        prompt += f"\n### {item['source']}\n"
-        for key, value in item.items():
-            if key != 'source':
-                prompt += f"- {key}: {value}\n"
+    # 按相关度在 token 预算内挑选内容（PROMPT_TOKEN_BUDGET），裁掉的条目记入日志
+    selected, dropped, stats = packer.pack(technical_content)
+    print(packer.format_stats(stats, dropped))
+    prompt += packer.render(selected)
 
     prompt += """
 
@@ -231,53 +270,25 @@ def analyze_with_llm(technical_content):
 3. 每个 action_item 必须有具体的执行步骤
 """
 
-    url = f"{ARK_BASE_URL}/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {ARK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "glm-4.7",
-        "messages": [
-            {
-                "role": "system",
-                "content": "你是一位资深的 AI 架构师和技术分析师，擅长从技术动态中提取深度洞察和架构优化建议。"
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "temperature": 0.7,
-        "max_tokens": 4000
-    }
-
-    ctx = ssl.create_default_context()
+    messages = [
+        {
+            "role": "system",
+            "content": "你是一位资深的 AI 架构师和技术分析师，擅长从技术动态中提取深度洞察和架构优化建议。"
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
 
     try:
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode('utf-8'),
-            headers=headers,
-            method='POST'
-        )
-
-        response = urllib.request.urlopen(req, context=ctx, timeout=180)
-        result = json.load(response)
-        content = result['choices'][0]['message']['content']
-
-        import re
-        json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-        if json_match:
-            analysis = json.loads(json_match.group(1))
-        else:
-            analysis = json.loads(content)
-
-        return analysis
+        # 同一提示词当天重跑时直接取 LLM 缓存
+        return llm.chat_json(messages, api_key=ARK_API_KEY, max_tokens=4000, tier="daily",
+                             schema=ANALYSIS_SCHEMA), selected
 
     except Exception as e:
         print(f"❌ LLM 分析失败：{e}")
-        return None
+        return None, selected
 
 
 def save_action_items(analysis):
@@ -434,6 +445,34 @@ def generate_tech_insight_report(analysis):
     return '\n'.join(report)
 
 
+def generate_no_new_content_report(labeled):
+    """没有新内容时的简短报告（日报汇总 / 月度统计按当天是否有 tech-analysis 文件判断）"""
+    repeats = [item for item in labeled if item.get("status") == "repeat"]
+    report = [
+        "# 技术深度洞察报告",
+        f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        "",
+        "⏭️ 今日没有新的或有实质变化的技术内容，跳过 LLM 分析。",
+        "",
+        fingerprint.format_counts(labeled),
+    ]
+    if repeats:
+        report.append("")
+        report.append("## 🔁 与前几天重复的内容")
+        report.append("")
+        for item in repeats[:10]:
+            report.append(f"- [{item['source']}] {item['title']}")
+    return '\n'.join(report)
+
+
+def save_report(report):
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = OUTPUT_DIR / f"tech-analysis-{datetime.now().strftime('%Y%m%d')}.md"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(f"✅ 报告已保存：{output_file}")
+
+
 def main():
     print("🔍 加载每日报告...")
     load_env()
@@ -447,13 +486,31 @@ def main():
     tech_content = extract_technical_content(reports)
     print(f"  提取 {len(tech_content)} 条技术内容")
 
+    # 跨天近似去重：前几天已分析过且没有实质变化的条目不再送入 LLM
+    index = fingerprint.FingerprintIndex()
+    labeled = index.classify(tech_content)
+    print(f"  {fingerprint.format_counts(labeled)}")
+    fresh = [item for item in labeled if item.get("status") != "repeat"]
+    repeats = [item for item in labeled if item.get("status") == "repeat"]
+    if not any(item.get("status") for item in fresh):
+        print("⏭️  没有新的或有实质变化的内容，跳过 LLM 分析")
+        index.touch(repeats)
+        index.save()
+        save_report(generate_no_new_content_report(labeled))
+        return
+
     print("\n🤖 调用 LLM 进行深度分析...")
-    analysis = analyze_with_llm(tech_content)
+    analysis, selected = analyze_with_llm(fresh)
 
     if not analysis:
         print("❌ LLM 分析失败")
         return
 
+    # 分析成功后才写入指纹索引，且只记录实际写入提示词的条目：
+    # 分析失败、或因 token 预算被裁掉的条目，明天仍按新内容处理
+    index.touch(repeats)
+    index.record(selected)
+
     print(f"  ✅ 分析完成")
     print(f"  - 架构亮点：{len(analysis.get('architecture_highlights', []))} 个")
     print(f"  - 安全趋势：{len(analysis.get('security_trends', []))} 个")
@@ -469,15 +526,10 @@ def main():
     report = generate_tech_insight_report(analysis)
 
     # 保存报告
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    today = datetime.now().strftime('%Y%m%d')
-    output_file = OUTPUT_DIR / f"tech-analysis-{today}.md"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(report)
-    print(f"✅ 报告已保存：{output_file}")
+    save_report(report)
 
     # 保存 JSON 分析结果
-    json_file = OUTPUT_DIR / f"tech-analysis-{today}.json"
+    json_file = OUTPUT_DIR / f"tech-analysis-{datetime.now().strftime('%Y%m%d')}.json"
     with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(analysis, f, ensure_ascii=False, indent=2)
     print(f"✅ JSON 已保存：{json_file}")
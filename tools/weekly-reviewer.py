@@ -10,16 +10,20 @@
   6. Telegram 推送
 """
 
+import importlib
 import json
 import os
-import ssl
 import sys
-import urllib.request
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# 共享 HTTP 客户端 / LLM 调用层（文件名包含连字符，动态导入）
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+http_client = importlib.import_module("http-client")
+llm = importlib.import_module("llm-client")
+
 # === 路径配置 ===
-WORKSPACE_DIR = Path("/home/writer/.openclaw/workspace")
+WORKSPACE_DIR = Path(os.environ.get("OPENCLAW_WORKSPACE", "/home/writer/.openclaw/workspace"))
 LOGS_DIR = WORKSPACE_DIR / "logs"
 SKILL_DIR = WORKSPACE_DIR / "skills" / "learning-upgrade"
 TRACKER_DIR = SKILL_DIR / "tracker"
@@ -27,7 +31,6 @@ OUTPUT_DIR = LOGS_DIR / "weekly-review"
 
 # === API 配置 ===
 ARK_API_KEY = os.environ.get('ARK_API_KEY', '')
-ARK_BASE_URL = "https://ark.cn-beijing.volces.com/api/coding/v3"
 MATON_API_KEY = os.environ.get('MATON_API_KEY', '')
 MATON_BASE_URL = "https://gateway.maton.ai/notion/v1"
 
@@ -178,9 +181,54 @@ def aggregate_analysis(reports):
     }
 
 
+def load_github_activity(start_date, end_date):
+    """从 github-monitor 的本地历史读取日期范围内的 Releases / Issues（无需重新抓取）"""
+    try:
+        history = importlib.import_module("github-history")
+        return history.activity_in_range(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    except Exception as e:
+        print(f"  ⚠️ 无法读取 GitHub 历史: {e}")
+        return {}
+
+
+def load_github_trends(start_date, end_date):
+    """从本地时间序列读取日期范围内的 Star / Fork / Issue 变化（无需扫描 logs 目录）"""
+    try:
+        timeseries = importlib.import_module("github-timeseries")
+        return timeseries.trends_in_range(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    except Exception as e:
+        print(f"  ⚠️ 无法读取 GitHub 计数趋势: {e}")
+        return {}
+
+
+# LLM 周度分析结果的 schema（见 json-extractor）：必填字段为周报渲染时直接取用的字段
+WEEKLY_SCHEMA = {
+    "tech_top5?": [{"topic": str, "importance": str, "frequency?": int}],
+    "key_events?": [{"event": str}],
+    "knowledge_gained?": [{"knowledge": str, "depth": str, "applicable?": bool}],
+    "trends?": [{"trend": str, "direction": str}],
+    "improvement_actions?": [{
+        "title": str,
+        "priority?": str,
+        "steps?": [str],
+        "expected_days?": int,
+        "expected_benefit?": str,
+        "why_makes_stronger?": str,
+    }],
+}
+
+
 def llm_weekly_analysis(aggregated_data, action_items_result):
     """调用 LLM 进行周度综合分析"""
 
+    github_section = ""
+    if aggregated_data.get("github_activity"):
+        history = importlib.import_module("github-history")
+        github_section = f"\n## 本周 GitHub 活动（本地历史）\n\n{history.format_activity(aggregated_data['github_activity'])[:3000]}\n"
+    if aggregated_data.get("github_trends"):
+        timeseries = importlib.import_module("github-timeseries")
+        github_section += f"\n## 本周 GitHub 计数趋势\n\n{timeseries.format_trends(aggregated_data['github_trends'])[:2000]}\n"
+
     prompt = f"""你是一位资深技术学习顾问。请基于以下一周的技术学习内容进行综合分析。
 
 ## 本周学习数据
@@ -198,7 +246,7 @@ def llm_weekly_analysis(aggregated_data, action_items_result):
 ## 本周学习内容摘要
 
 {aggregated_data['combined_text'][:8000]}
-
+{github_section}
 ## 请输出以下分析 (JSON 格式):
 
 ```json
@@ -235,40 +283,15 @@ def llm_weekly_analysis(aggregated_data, action_items_result):
 4. 不要泛泛而谈，要针对本周具体内容
 """
 
-    url = f"{ARK_BASE_URL}/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {ARK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "glm-4.7",
-        "messages": [
-            {"role": "system", "content": "你是一位技术学习顾问，擅长从学习内容中提炼高价值洞察和改进建议。"},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 4000
-    }
+    messages = [
+        {"role": "system", "content": "你是一位技术学习顾问，擅长从学习内容中提炼高价值洞察和改进建议。"},
+        {"role": "user", "content": prompt}
+    ]
 
-    ctx = ssl.create_default_context()
     try:
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode('utf-8'),
-            headers=headers,
-            method='POST'
-        )
-        response = urllib.request.urlopen(req, context=ctx, timeout=180)
-        result = json.load(response)
-        content = result['choices'][0]['message']['content']
-
-        # 解析 JSON
-        import re
-        json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(1))
-        else:
-            return json.loads(content)
+        # 同一提示词重跑时（如 Notion / 文件写入失败后）直接取 LLM 缓存
+        return llm.chat_json(messages, api_key=ARK_API_KEY, max_tokens=4000, tier="weekly",
+                             schema=WEEKLY_SCHEMA)
     except Exception as e:
         print(f"❌ LLM 分析失败: {e}")
         return None
@@ -379,12 +402,8 @@ def notion_request(endpoint, method='GET', data=None):
         "Notion-Version": "2022-06-28"
     }
 
-    ctx = ssl.create_default_context()
     try:
-        req_data = json.dumps(data).encode('utf-8') if data else None
-        req = urllib.request.Request(url, data=req_data, headers=headers, method=method)
-        response = urllib.request.urlopen(req, context=ctx, timeout=30)
-        return json.load(response)
+        return http_client.request_json(method, url, headers=headers, data=data)
     except Exception as e:
         print(f"❌ Notion 请求失败: {e}")
         return None
@@ -586,6 +605,8 @@ def main():
     # Step 2: 聚合分析
     print(f"\n📊 步骤 2/6: 聚合分析...")
     aggregated = aggregate_analysis(reports)
+    aggregated["github_activity"] = load_github_activity(last_monday, last_sunday)
+    aggregated["github_trends"] = load_github_trends(last_monday, last_sunday)
     print(f"  ✅ 聚合完成（{aggregated['daily_count']} 天，缺失 {aggregated['missing_days']} 天）")
 
     # Step 3: 行动项检查